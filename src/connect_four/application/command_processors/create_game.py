@@ -23,6 +23,7 @@ from connect_four.application.common import (
     Serializable,
     CentrifugoClient,
     centrifugo_lobby_channel_factory,
+    centrifugo_players_factory,
     TransactionManager,
     GameAlreadyExistsError,
 )
@@ -86,6 +87,7 @@ class CreateGameProcessor:
 
         event = GameCreatedEvent(
             game_id=new_game.id,
+            game_state_version=new_game.state_version,
             lobby_id=command.lobby_id,
             board=new_game.board,
             players=new_game.players,
@@ -115,17 +117,10 @@ class CreateGameProcessor:
         lobby_id: LobbyId,
         new_game: Game,
     ) -> None:
-        players: Serializable = {
-            player_id.hex: {
-                "chip_type": player_state.chip_type,
-                "time_left": player_state.time_left.total_seconds(),
-            }
-            for player_id, player_state in new_game.players.items()
-        }
         centrifugo_publication: Serializable = {
             "type": "game_created",
             "game_id": new_game.id.hex,
-            "players": players,
+            "players": centrifugo_players_factory(new_game.players),
             "current_turn": new_game.current_turn.hex,
         }
         await self._centrifugo_client.publish(
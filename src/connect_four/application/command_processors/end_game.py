@@ -50,9 +50,9 @@ class EndGameProcessor:
             raise GameDoesNotExistError()
 
         task_id = try_to_lose_by_time_task_id_factory(game.state_id)
-        await self._task_scheduler.unschedule(task_id)
 
         self._end_game(game)
         await self._game_gateway.update(game)
 
         await self._transaction_manager.commit()
+        await self._task_scheduler.unschedule(task_id)
@@ -5,7 +5,6 @@
 __all__ = ("MakeMoveCommand", "MakeMoveProcessor")
 
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Final
 
 from connect_four.domain import (
@@ -19,6 +18,7 @@ from connect_four.domain import (
     Win,
     Draw,
     LossByTime,
+    Clock,
     MakeMove,
 )
 from connect_four.application import (
@@ -34,6 +34,7 @@ from connect_four.application import (
     Serializable,
     CentrifugoClient,
     centrifugo_game_channel_factory,
+    centrifugo_players_factory,
     TransactionManager,
     IdentityProvider,
     GameDoesNotExistError,
@@ -62,6 +63,7 @@ class MakeMoveProcessor:
         "_centrifugo_client",
         "_transaction_manager",
         "_identity_provider",
+        "_clock",
     )
 
     def __init__(
@@ -73,6 +75,7 @@ class MakeMoveProcessor:
         centrifugo_client: CentrifugoClient,
         transaction_manager: TransactionManager,
         identity_provider: IdentityProvider,
+        clock: Clock,
     ):
         self._make_move = make_move
         self._game_gateway = game_gateway
@@ -81,6 +84,7 @@ class MakeMoveProcessor:
         self._centrifugo_client = centrifugo_client
         self._transaction_manager = transaction_manager
         self._identity_provider = identity_provider
+        self._clock = clock
 
     async def process(self, command: MakeMoveCommand) -> None:
         current_user_id = await self._identity_provider.user_id()
@@ -102,22 +106,28 @@ class MakeMoveProcessor:
         await self._game_gateway.update(game)
 
         if isinstance(move_result, MoveAccepted):
-            await self._unschedule_loss_by_time_task(old_game_state_id)
             await self._publish_move_accepted_event(game, move_result)
             await self._maybe_notify_on_move_accepted(game, move_result)
-            await self._schedule_loss_by_time_task(game, current_user_id)
 
         elif isinstance(move_result, MoveRejected):
             await self._publish_move_rejected_event(game, move_result)
             await self._maybe_notify_on_move_rejected(game, move_result)
 
         elif isinstance(move_result, (Win, Draw, LossByTime)):
-            await self._unschedule_loss_by_time_task(old_game_state_id)
             await self._publish_game_ended_event(game, move_result)
             await self._maybe_notify_on_game_ended(game, move_result)
 
         await self._transaction_manager.commit()
 
+        # Tasks are keyed by state ids, which are reused by changes
+        # that are never committed, so they are changed only after
+        # the commit.
+        if isinstance(move_result, (MoveAccepted, Win, Draw, LossByTime)):
+            await self._unschedule_loss_by_time_task(old_game_state_id)
+
+        if isinstance(move_result, MoveAccepted):
+            await self._schedule_loss_by_time_task(game, current_user_id)
+
     async def _unschedule_loss_by_time_task(
         self,
         old_game_state_id: GameStateId,
@@ -133,7 +143,7 @@ class MakeMoveProcessor:
         current_player_state = game.players[current_user_id]
         time_left_for_current_player = current_player_state.time_left
 
-        current_timestamp = datetime.now(timezone.utc)
+        current_timestamp = self._clock.now()
         execute_task_at = current_timestamp + time_left_for_current_player
 
         task_id = try_to_lose_by_time_task_id_factory(game.state_id)
@@ -153,6 +163,7 @@ class MakeMoveProcessor:
     ) -> None:
         event = MoveAcceptedEvent(
             game_id=game.id,
+            game_state_version=game.state_version,
             chip_location=move_result.chip_location,
             players=game.players,
             current_turn=game.current_turn,
@@ -166,6 +177,7 @@ class MakeMoveProcessor:
     ) -> None:
         event = MoveRejectedEvent(
             game_id=game.id,
+            game_state_version=game.state_version,
             reason=move_result.reason,
             players=game.players,
             current_turn=game.current_turn,
@@ -181,6 +193,7 @@ class MakeMoveProcessor:
 
         event = GameEndedEvent(
             game_id=game.id,
+            game_state_version=game.state_version,
             chip_location=move_result.chip_location,
             players=game.players,
             reason=reason,
@@ -200,17 +213,10 @@ class MakeMoveProcessor:
             "row": move_result.chip_location.row,
             "column": move_result.chip_location.column,
         }
-        raw_players: Serializable = {
-            player_id.hex: {
-                "chip_type": player_state.chip_type.value,
-                "time_left": player_state.time_left.total_seconds(),
-            }
-            for player_id, player_state in game.players.items()
-        }
         centrifugo_publication: Serializable = {
             "type": "move_accepted",
             "chip_location": raw_chip_location,
-            "players": raw_players,
+            "players": centrifugo_players_factory(game.players),
             "current_turn": game.current_turn.hex,
         }
 
@@ -227,16 +233,9 @@ class MakeMoveProcessor:
         if not self._game_has_any_centrifugo_client(game):
             return
 
-        raw_players: Serializable = {
-            player_id.hex: {
-                "chip_type": player_state.chip_type.value,
-                "time_left": player_state.time_left.total_seconds(),
-            }
-            for player_id, player_state in game.players.items()
-        }
         centrifugo_publication: Serializable = {
             "type": "move_rejected",
-            "players": raw_players,
+            "players": centrifugo_players_factory(game.players),
             "reason": move_result.reason,
             "current_turn": game.current_turn.hex,
         }
@@ -260,17 +259,10 @@ class MakeMoveProcessor:
             "row": move_result.chip_location.row,
             "column": move_result.chip_location.column,
         }
-        raw_players: Serializable = {
-            player_id.hex: {
-                "chip_type": player_state.chip_type.value,
-                "time_left": player_state.time_left.total_seconds(),
-            }
-            for player_id, player_state in game.players.items()
-        }
         centrifugo_publication: Serializable = {
             "type": "game_ended",
             "chip_location": raw_chip_location,
-            "players": raw_players,
+            "players": centrifugo_players_factory(game.players),
             "reason": reason,
             "last_turn": game.current_turn.hex,
         }
@@ -21,6 +21,7 @@ from connect_four.application.common import (
     Serializable,
     CentrifugoClient,
     centrifugo_game_channel_factory,
+    centrifugo_players_factory,
     TransactionManager,
     GameDoesNotExistError,
 )
@@ -74,6 +75,7 @@ class TryToLoseByTimeProcessor:
 
         event = GameEndedEvent(
             game_id=game.id,
+            game_state_version=game.state_version,
             chip_location=None,
             players=game.players,
             reason=GameEndReason.LOSS_BY_TIME,
@@ -95,17 +97,10 @@ class TryToLoseByTimeProcessor:
         await self._transaction_manager.commit()
 
     async def _make_requests_to_centrifugo(self, game: Game) -> None:
-        players: Serializable = {
-            player_id.hex: {
-                "chip_type": player_state.chip_type.value,
-                "time_left": player_state.time_left.total_seconds(),
-            }
-            for player_id, player_state in game.players.items()
-        }
         centrifugo_publication: Serializable = {
             "type": "game_ended",
             "chip_location": None,
-            "players": players,
+            "players": centrifugo_players_factory(game.players),
             "reason": GameEndReason.LOSS_BY_TIME,
             "last_turn": game.current_turn.hex,
         }
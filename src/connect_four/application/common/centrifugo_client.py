@@ -6,12 +6,13 @@ __all__ = (
     "Serializable",
     "centrifugo_lobby_channel_factory",
     "centrifugo_game_channel_factory",
+    "centrifugo_players_factory",
     "CentrifugoClient",
 )
 
 from typing import Protocol
 
-from connect_four.domain import GameId, LobbyId
+from connect_four.domain import GameId, LobbyId, UserId, PlayerState
 
 
 type Serializable = (
@@ -33,6 +34,22 @@ def centrifugo_game_channel_factory(game_id: GameId) -> str:
     return f"games:{game_id.hex}"
 
 
+def centrifugo_players_factory(
+    players: dict[UserId, PlayerState],
+) -> Serializable:
+    """
+    Returns players as they are sent in every centrifugo
+    publication about a game.
+    """
+    return {
+        player_id.hex: {
+            "chip_type": player_state.chip_type.value,
+            "time_left": player_state.time_left.total_seconds(),
+        }
+        for player_id, player_state in players.items()
+    }
+
+
 class CentrifugoClient(Protocol):
     async def publish(
         self,
@@ -36,6 +36,7 @@ class GameEndReason(StrEnum):
 @dataclass(frozen=True, slots=True, kw_only=True)
 class GameCreatedEvent:
     game_id: GameId
+    game_state_version: int
     lobby_id: LobbyId
     board: list[list[ChipType | None]]
     players: dict[UserId, PlayerState]
@@ -45,6 +46,7 @@ class GameCreatedEvent:
 @dataclass(frozen=True, slots=True, kw_only=True)
 class MoveAcceptedEvent:
     game_id: GameId
+    game_state_version: int
     chip_location: ChipLocation
     players: dict[UserId, PlayerState]
     current_turn: UserId
@@ -53,6 +55,7 @@ class MoveAcceptedEvent:
 @dataclass(frozen=True, slots=True, kw_only=True)
 class MoveRejectedEvent:
     game_id: GameId
+    game_state_version: int
     reason: MoveRejectionReason
     players: dict[UserId, PlayerState]
     current_turn: UserId
@@ -61,6 +64,7 @@ class MoveRejectedEvent:
 @dataclass(frozen=True, slots=True, kw_only=True)
 class GameEndedEvent:
     game_id: GameId
+    game_state_version: int
     chip_location: ChipLocation | None
     players: dict[UserId, PlayerState]
     reason: GameEndReason
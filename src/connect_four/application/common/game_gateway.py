@@ -4,7 +4,7 @@
 
 __all__ = ("SortGamesBy", "GameGateway")
 
-from typing import Protocol
+from typing import Iterable, Protocol
 from enum import IntEnum, auto
 
 from connect_four.domain import UserId, GameId, Game
@@ -32,6 +32,14 @@ class GameGateway(Protocol):
         """
         raise NotImplementedError
 
+    async def by_ids(self, game_ids: Iterable[GameId]) -> list[Game]:
+        """
+        Returns games by specified `game_ids` in the same order,
+        skipping ids of games that don't exist. Games are fetched
+        in batches rather than one by one.
+        """
+        raise NotImplementedError
+
     async def list_by_player_ids(
         self,
         player_ids: tuple[UserId, UserId],
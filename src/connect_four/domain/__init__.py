@@ -5,4 +5,5 @@
 from .identitifiers import *
 from .constants import *
 from .models import *
+from .clock import *
 from .services import *
@@ -0,0 +1,16 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("Clock",)
+
+from datetime import datetime
+from typing import Protocol
+
+
+class Clock(Protocol):
+    def now(self) -> datetime:
+        """
+        Returns current time as a timezone-aware datetime in UTC.
+        """
+        raise NotImplementedError
@@ -5,5 +5,6 @@
 from .chip_type import *
 from .game_status import *
 from .move_rejection_reason import *
+from .move_result_code import *
 from .board import *
 from .communication_type import *
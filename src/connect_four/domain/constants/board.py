@@ -2,10 +2,11 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
-__all__ = ("BOARD_COLUMNS", "BOARD_ROWS")
+__all__ = ("BOARD_COLUMNS", "BOARD_ROWS", "CHIPS_TO_WIN")
 
 from typing import Final
 
 
 BOARD_COLUMNS: Final = 6
 BOARD_ROWS: Final = 7
+CHIPS_TO_WIN: Final = 4
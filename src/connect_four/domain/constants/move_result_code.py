@@ -0,0 +1,14 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("MoveResultCode",)
+
+from enum import IntEnum
+
+
+class MoveResultCode(IntEnum):
+    ACCEPTED = 0
+    REJECTED = 1
+    WIN = 2
+    DRAW = 3
@@ -3,6 +3,13 @@
 # Licensed under the Personal Use License (see LICENSE).
 
 from .player_state import *
+from .board_geometry import *
+from .bitboard import *
+from .bitboard_batch import *
+from .position_hash import *
+from .move_log import *
+from .position_evaluation import *
 from .game import *
+from .compact_game import *
 from .chip_location import *
 from .move_result import *
@@ -0,0 +1,136 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("Bitboard",)
+
+from dataclasses import dataclass
+
+from connect_four.domain.constants import ChipType
+from .board_geometry import BoardGeometry, DEFAULT_BOARD_GEOMETRY
+
+
+@dataclass(slots=True, kw_only=True)
+class Bitboard:
+    """
+    Position of chips on the board, stored as one bit mask per
+    chip type and the number of chips in each column. Bits are
+    laid out as described in `BoardGeometry`.
+    """
+
+    masks: dict[ChipType, int]
+    heights: list[int]
+    geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY
+
+    @classmethod
+    def empty(
+        cls,
+        geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY,
+    ) -> "Bitboard":
+        return cls(
+            masks=dict.fromkeys(ChipType, 0),
+            heights=[0] * geometry.columns,
+            geometry=geometry,
+        )
+
+    @classmethod
+    def from_board(
+        cls,
+        board: list[list[ChipType | None]],
+        geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY,
+    ) -> "Bitboard":
+        bitboard = cls.empty(geometry)
+
+        for height in range(geometry.rows):
+            row = board[geometry.rows - 1 - height]
+
+            for column in range(geometry.columns):
+                chip_type = row[column]
+                if chip_type is None:
+                    continue
+
+                bitboard.masks[chip_type] |= 1 << geometry.cell(
+                    column=column,
+                    height=height,
+                )
+                if bitboard.heights[column] == height:
+                    bitboard.heights[column] += 1
+
+        return bitboard
+
+    def drop_row(self, column: int) -> int | None:
+        """
+        Returns row on the board a chip dropped into the specified
+        column lands on or `None` if the column is full.
+        """
+        height = self.heights[column]
+        if height == self.geometry.rows:
+            return None
+
+        return self.geometry.rows - 1 - height
+
+    def drop_chip(self, *, column: int, chip_type: ChipType) -> int:
+        """
+        Drops a chip into the specified column and returns bit
+        of the cell the chip landed on.
+        """
+        cell = self.geometry.cell(
+            column=column,
+            height=self.heights[column],
+        )
+        self.masks[chip_type] |= 1 << cell
+        self.heights[column] += 1
+
+        return cell
+
+    def has_line_through(self, *, cell: int, chip_type: ChipType) -> bool:
+        """
+        Returns flag indicating whether chips of the specified type
+        form a winning line passing through the specified cell.
+        """
+        mask = self.masks[chip_type]
+
+        for line in self.geometry.lines_by_cell[cell]:
+            if mask & line == line:
+                return True
+
+        return False
+
+    def has_line(self, chip_type: ChipType) -> bool:
+        """
+        Returns flag indicating whether chips of the specified type
+        form a winning line anywhere on the board.
+        """
+        mask = self.masks[chip_type]
+
+        for shift in self.geometry.shifts:
+            line_starts = mask
+            for i in range(1, self.geometry.chips_to_win):
+                line_starts &= mask >> (shift * i)
+
+            if line_starts:
+                return True
+
+        return False
+
+    def is_full(self) -> bool:
+        occupied_cells = 0
+        for mask in self.masks.values():
+            occupied_cells |= mask
+
+        return occupied_cells == self.geometry.full_board_mask
+
+    def to_board(self) -> list[list[ChipType | None]]:
+        rows, columns = self.geometry.rows, self.geometry.columns
+
+        board: list[list[ChipType | None]] = [
+            [None] * columns for _ in range(rows)
+        ]
+        for chip_type, mask in self.masks.items():
+            for column in range(columns):
+                for height in range(rows):
+                    cell = self.geometry.cell(column=column, height=height)
+                    if mask >> cell & 1:
+                        board[rows - 1 - height][column] = chip_type
+
+        return board
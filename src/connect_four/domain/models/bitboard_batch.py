@@ -0,0 +1,76 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("BitboardBatch",)
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from connect_four.domain.constants import ChipType
+from .board_geometry import BoardGeometry, DEFAULT_BOARD_GEOMETRY
+from .bitboard import Bitboard
+
+
+@dataclass(slots=True, kw_only=True)
+class BitboardBatch:
+    """
+    Positions of many independent games, stored as parallel lists
+    indexed by game. Bits are laid out as described in
+    `BoardGeometry`. Chips of the first type are always placed
+    first, so whose turn it is follows from `move_counts`.
+
+    Parameters:
+
+        `ended`: Flags indicating whether a game has ended,
+            one byte per game.
+    """
+
+    first_masks: list[int]
+    second_masks: list[int]
+    move_counts: list[int]
+    ended: bytearray
+    geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY
+
+    @classmethod
+    def empty(
+        cls,
+        size: int,
+        geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY,
+    ) -> "BitboardBatch":
+        return cls(
+            first_masks=[0] * size,
+            second_masks=[0] * size,
+            move_counts=[0] * size,
+            ended=bytearray(size),
+            geometry=geometry,
+        )
+
+    @classmethod
+    def from_bitboards(
+        cls,
+        bitboards: Iterable[Bitboard],
+        geometry: BoardGeometry = DEFAULT_BOARD_GEOMETRY,
+    ) -> "BitboardBatch":
+        batch = cls.empty(0, geometry)
+
+        for bitboard in bitboards:
+            if bitboard.geometry != geometry:
+                raise Exception(
+                    "Cannot add bitboard to batch: "
+                    "bitboard has different geometry.",
+                )
+
+            batch.first_masks.append(bitboard.masks[ChipType.FIRST])
+            batch.second_masks.append(bitboard.masks[ChipType.SECOND])
+            batch.move_counts.append(sum(bitboard.heights))
+            batch.ended.append(
+                bitboard.has_line(ChipType.FIRST)
+                or bitboard.has_line(ChipType.SECOND)
+                or bitboard.is_full(),
+            )
+
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.move_counts)
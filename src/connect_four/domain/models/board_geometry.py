@@ -0,0 +1,134 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "BoardGeometry",
+    "get_board_geometry",
+    "DEFAULT_BOARD_GEOMETRY",
+)
+
+from dataclasses import dataclass
+from functools import cache
+from typing import Final
+
+from connect_four.domain.constants import (
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    CHIPS_TO_WIN,
+)
+
+
+_DIRECTIONS: Final = (
+    (1, 0),  # horizontal
+    (0, 1),  # vertical
+    (1, 1),  # diagonal ↙↗
+    (1, -1),  # diagonal ↖↘
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BoardGeometry:
+    """
+    Precomputed tables for a board of the specified size.
+
+    Cells are numbered column by column starting from the bottom
+    left corner, that is cell in column `c` that is `h` chips above
+    the bottom of the board is represented by bit
+    `c * (rows + 1) + h`. The extra bit on top of every column is
+    never set, so shifting a mask never moves chips from one column
+    into the next one.
+
+    Parameters:
+
+        `lines`: Bit masks of every line of `chips_to_win` cells
+            a player can win with.
+
+        `lines_by_cell`: Bit masks of lines passing through a cell,
+            indexed by the cell's bit.
+    """
+
+    rows: int
+    columns: int
+    chips_to_win: int
+    full_board_mask: int
+    shifts: tuple[int, ...]
+    lines: tuple[int, ...]
+    lines_by_cell: tuple[tuple[int, ...], ...]
+
+    @property
+    def column_height(self) -> int:
+        return self.rows + 1
+
+    def cell(self, *, column: int, height: int) -> int:
+        return column * (self.rows + 1) + height
+
+
+@cache
+def get_board_geometry(
+    *,
+    rows: int,
+    columns: int,
+    chips_to_win: int,
+) -> BoardGeometry:
+    """
+    Returns geometry for a board of the specified size. Geometry
+    is built once per combination of arguments and then reused.
+    """
+    column_height = rows + 1
+
+    full_board_mask = 0
+    for column in range(columns):
+        full_board_mask |= ((1 << rows) - 1) << (column * column_height)
+
+    lines = []
+    lines_by_cell: list[list[int]] = [
+        [] for _ in range(columns * column_height)
+    ]
+
+    for column_delta, height_delta in _DIRECTIONS:
+        for column in range(columns):
+            for height in range(rows):
+                last_column = column + column_delta * (chips_to_win - 1)
+                last_height = height + height_delta * (chips_to_win - 1)
+
+                if not (
+                    0 <= last_column < columns and 0 <= last_height < rows
+                ):
+                    continue
+
+                cells = [
+                    (column + column_delta * i) * column_height
+                    + height
+                    + height_delta * i
+                    for i in range(chips_to_win)
+                ]
+                line = 0
+                for cell in cells:
+                    line |= 1 << cell
+
+                lines.append(line)
+                for cell in cells:
+                    lines_by_cell[cell].append(line)
+
+    shifts = tuple(
+        column_delta * column_height + height_delta
+        for column_delta, height_delta in _DIRECTIONS
+    )
+
+    return BoardGeometry(
+        rows=rows,
+        columns=columns,
+        chips_to_win=chips_to_win,
+        full_board_mask=full_board_mask,
+        shifts=shifts,
+        lines=tuple(lines),
+        lines_by_cell=tuple(tuple(cell_lines) for cell_lines in lines_by_cell),
+    )
+
+
+DEFAULT_BOARD_GEOMETRY: Final = get_board_geometry(
+    rows=BOARD_ROWS,
+    columns=BOARD_COLUMNS,
+    chips_to_win=CHIPS_TO_WIN,
+)
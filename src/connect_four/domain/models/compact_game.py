@@ -0,0 +1,210 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("CompactGame",)
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Final
+from uuid import UUID
+
+from connect_four.domain.identitifiers import GameId, GameStateId, UserId
+from connect_four.domain.constants import (
+    ChipType,
+    GameStatus,
+    CommunicatonType,
+)
+from .player_state import PlayerState
+from .bitboard import Bitboard
+from .move_log import MoveLog
+from .game import Game
+
+
+_EPOCH: Final = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND: Final = timedelta(microseconds=1)
+
+_GAME_STATUSES: Final = tuple(GameStatus)
+_CHIP_TYPES: Final = tuple(ChipType)
+_COMMUNICATION_TYPES: Final = tuple(CommunicatonType)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CompactGame:
+    """
+    Immutable copy of a `Game` that takes a fraction of its memory,
+    meant for caches holding many games. Ids are stored as integers,
+    enum members as their indexes, the board as bit masks of
+    `Bitboard` and datetimes and durations as microseconds. Players
+    are stored in two slots in the order of `Game.players`.
+
+    Attributes of `Game` are available under the same names and
+    types, decoded on every access, and `to_game` returns a full
+    mutable game, so code reading games can take either.
+
+    Parameters:
+
+        `current_turn_slot`: Slot of the player whose turn it is.
+
+        `last_move_made_at_as_int`: Microseconds since the Unix
+            epoch.
+    """
+
+    id_as_int: int
+    state_id_as_int: int
+    state_version: int
+    status_index: int
+    player_ids_as_ints: tuple[int, int]
+    player_chip_type_indexes: tuple[int, int]
+    player_time_left_as_ints: tuple[int, int]
+    player_communication_type_indexes: tuple[int, int]
+    current_turn_slot: int
+    first_mask: int
+    second_mask: int
+    last_move_made_at_as_int: int | None
+    created_at_as_int: int
+    position_hash: int
+    move_log: MoveLog | None
+
+    @classmethod
+    def from_game(cls, game: Game) -> "CompactGame":
+        player_ids = tuple(game.players)
+        if len(player_ids) != 2:
+            raise Exception(
+                "Cannot create compact game: game must have 2 players.",
+            )
+
+        first_player = game.players[player_ids[0]]
+        second_player = game.players[player_ids[1]]
+
+        if game.last_move_made_at:
+            last_move_made_at = (
+                game.last_move_made_at - _EPOCH
+            ) // _MICROSECOND
+        else:
+            last_move_made_at = None
+
+        return cls(
+            id_as_int=game.id.int,
+            state_id_as_int=game.state_id.int,
+            state_version=game.state_version,
+            status_index=_GAME_STATUSES.index(game.status),
+            player_ids_as_ints=(player_ids[0].int, player_ids[1].int),
+            player_chip_type_indexes=(
+                _CHIP_TYPES.index(first_player.chip_type),
+                _CHIP_TYPES.index(second_player.chip_type),
+            ),
+            player_time_left_as_ints=(
+                first_player.time_left // _MICROSECOND,
+                second_player.time_left // _MICROSECOND,
+            ),
+            player_communication_type_indexes=(
+                _COMMUNICATION_TYPES.index(first_player.communication_type),
+                _COMMUNICATION_TYPES.index(second_player.communication_type),
+            ),
+            current_turn_slot=player_ids.index(game.current_turn),
+            first_mask=game.bitboard.masks[ChipType.FIRST],
+            second_mask=game.bitboard.masks[ChipType.SECOND],
+            last_move_made_at_as_int=last_move_made_at,
+            created_at_as_int=(game.created_at - _EPOCH) // _MICROSECOND,
+            position_hash=game.position_hash,
+            move_log=_copy_move_log(game.move_log),
+        )
+
+    @property
+    def id(self) -> GameId:
+        return GameId(UUID(int=self.id_as_int))
+
+    @property
+    def state_id(self) -> GameStateId:
+        return GameStateId(UUID(int=self.state_id_as_int))
+
+    @property
+    def status(self) -> GameStatus:
+        return _GAME_STATUSES[self.status_index]
+
+    @property
+    def player_ids(self) -> tuple[UserId, UserId]:
+        return (
+            UserId(UUID(int=self.player_ids_as_ints[0])),
+            UserId(UUID(int=self.player_ids_as_ints[1])),
+        )
+
+    @property
+    def players(self) -> dict[UserId, PlayerState]:
+        """
+        Returns new player states, changing them doesn't change
+        the compact game.
+        """
+        return {
+            player_id: PlayerState(
+                chip_type=_CHIP_TYPES[self.player_chip_type_indexes[slot]],
+                time_left=timedelta(
+                    microseconds=self.player_time_left_as_ints[slot],
+                ),
+                communication_type=_COMMUNICATION_TYPES[
+                    self.player_communication_type_indexes[slot]
+                ],
+            )
+            for slot, player_id in enumerate(self.player_ids)
+        }
+
+    @property
+    def current_turn(self) -> UserId:
+        return self.player_ids[self.current_turn_slot]
+
+    @property
+    def bitboard(self) -> Bitboard:
+        bitboard = Bitboard.empty()
+        bitboard.masks[ChipType.FIRST] = self.first_mask
+        bitboard.masks[ChipType.SECOND] = self.second_mask
+        return bitboard
+
+    @property
+    def board(self) -> list[list[ChipType | None]]:
+        return self.bitboard.to_board()
+
+    @property
+    def move_count(self) -> int:
+        return (self.first_mask | self.second_mask).bit_count()
+
+    @property
+    def last_move_made_at(self) -> datetime | None:
+        if self.last_move_made_at_as_int is None:
+            return None
+
+        return _EPOCH + timedelta(microseconds=self.last_move_made_at_as_int)
+
+    @property
+    def created_at(self) -> datetime:
+        return _EPOCH + timedelta(microseconds=self.created_at_as_int)
+
+    def to_game(self) -> Game:
+        """
+        Returns new mutable game equal to the one the compact game
+        was created from.
+        """
+        return Game(
+            id=self.id,
+            state_id=self.state_id,
+            state_version=self.state_version,
+            status=self.status,
+            players=self.players,
+            current_turn=self.current_turn,
+            board=self.board,
+            last_move_made_at=self.last_move_made_at,
+            created_at=self.created_at,
+            position_hash=self.position_hash,
+            move_log=_copy_move_log(self.move_log),
+        )
+
+
+def _copy_move_log(move_log: MoveLog | None) -> MoveLog | None:
+    if move_log is None:
+        return None
+
+    return MoveLog(
+        initial_time_left=move_log.initial_time_left.copy(),
+        columns=move_log.columns.copy(),
+        time_spent=move_log.time_spent.copy(),
+    )
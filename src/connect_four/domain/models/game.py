@@ -4,21 +4,90 @@
 
 __all__ = ("Game",)
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Final
+from uuid import UUID
 
 from connect_four.domain.identitifiers import GameId, GameStateId, UserId
 from connect_four.domain.constants import ChipType, GameStatus
 from .player_state import PlayerState
+from .bitboard import Bitboard
+from .move_log import MoveLog
+
+
+_UUID_MASK: Final = (1 << 128) - 1
 
 
 @dataclass(slots=True, kw_only=True)
 class Game:
+    """
+    Game with its position kept in two forms: `board` is a
+    list-of-lists view used by events and storage, `bitboard`
+    is used by the domain services to make moves. Domain services
+    keep both of them in sync, so `board` should not be mutated
+    directly.
+
+    Parameters:
+
+        `state_id`: Id of the game's state. The first one is
+            random and every next one is the previous one plus 1,
+            so ids of a game's states are derived from its random
+            first state id and `state_version` and don't collide
+            with ids of other games' states.
+
+        `state_version`: Number incremented on every change of the
+            game's state, starting from 0.
+
+        `move_count`: Number of chips on the board. Derived from
+            `board` on creation.
+
+        `column_heights`: Number of chips in each column. Derived
+            from `board` on creation; the list is shared with
+            `bitboard`, so dropping a chip via `bitboard` updates
+            it as well.
+
+        `position_hash`: 64-bit Zobrist hash of the position,
+            see `position_hash_factory`.
+
+        `move_log`: Log of moves made in the game. Games created
+            before move logs were introduced have no log.
+    """
+
     id: GameId
     state_id: GameStateId
+    state_version: int
     status: GameStatus
     players: dict[UserId, PlayerState]
     current_turn: UserId
     board: list[list[ChipType | None]]
     last_move_made_at: datetime | None
     created_at: datetime
+    position_hash: int
+    move_log: MoveLog | None
+
+    move_count: int = field(init=False)
+    column_heights: list[int] = field(init=False)
+
+    _bitboard: Bitboard = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._bitboard = Bitboard.from_board(self.board)
+        self.column_heights = self._bitboard.heights
+        self.move_count = sum(self.column_heights)
+
+    @property
+    def bitboard(self) -> Bitboard:
+        return self._bitboard
+
+    def advance_state(self) -> None:
+        """
+        Increments state version and state id. Changes that are
+        never committed reuse both, so anything keyed by the state
+        id, such as a task, should only be made once the change is
+        committed.
+        """
+        self.state_version += 1
+        self.state_id = GameStateId(
+            UUID(int=(self.state_id.int + 1) & _UUID_MASK),
+        )
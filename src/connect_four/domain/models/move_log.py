@@ -0,0 +1,70 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("MOVE_TIME_RESOLUTION", "MoveLog")
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Final, Iterator
+
+from connect_four.domain.constants import ChipType
+
+
+# Time of moves is counted in whole milliseconds, which is the
+# resolution move logs store it in.
+MOVE_TIME_RESOLUTION: Final = timedelta(milliseconds=1)
+
+
+@dataclass(slots=True, kw_only=True)
+class MoveLog:
+    """
+    Append-only log of chips placed on the board.
+
+    Parameters:
+
+        `initial_time_left`: Time each chip type's player had when
+            the game was created.
+
+        `columns`: Column of every move, one byte per move.
+
+        `time_spent`: Time every move took in milliseconds, encoded
+            as unsigned LEB128 numbers: 1 byte for moves shorter
+            than 128 ms, 2 bytes for moves shorter than 16.4 s and
+            3 bytes for moves shorter than 35 minutes. With its
+            column, a move of a few seconds takes 3 bytes. Time
+            is truncated to whole milliseconds.
+    """
+
+    initial_time_left: dict[ChipType, timedelta]
+    columns: bytearray
+    time_spent: bytearray
+
+    def __iter__(self) -> Iterator[tuple[int, timedelta]]:
+        """
+        Yields column and time spent of every move in the order
+        they were made.
+        """
+        time_spent_iterator = iter(self.time_spent)
+
+        for column in self.columns:
+            milliseconds = 0
+            shift = 0
+
+            for byte in time_spent_iterator:
+                milliseconds |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+
+            yield column, timedelta(milliseconds=milliseconds)
+
+    def append(self, *, column: int, time_spent: timedelta) -> None:
+        self.columns.append(column)
+
+        milliseconds = time_spent // MOVE_TIME_RESOLUTION
+        while milliseconds >= 0x80:
+            self.time_spent.append(milliseconds & 0x7F | 0x80)
+            milliseconds >>= 7
+
+        self.time_spent.append(milliseconds)
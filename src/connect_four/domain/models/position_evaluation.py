@@ -0,0 +1,31 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("WIN_SCORE", "PositionEvaluation")
+
+from dataclasses import dataclass
+from typing import Final
+
+
+WIN_SCORE: Final = 1_000_000
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PositionEvaluation:
+    """
+    Parameters:
+
+        `column`: Best column to drop a chip into.
+
+        `score`: Score of the position for the player whose turn
+            it is. Forced win is scored as `WIN_SCORE` minus number
+            of chips on the board after the winning move, forced
+            loss as the negated score of the win.
+
+        `depth`: Number of moves the search looked ahead.
+    """
+
+    column: int
+    score: int
+    depth: int
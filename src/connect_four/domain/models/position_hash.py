@@ -0,0 +1,66 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "EMPTY_POSITION_HASH",
+    "chip_hash_key",
+    "position_hash_factory",
+)
+
+from hashlib import blake2b
+from typing import Final
+
+from connect_four.domain.constants import ChipType
+from .board_geometry import DEFAULT_BOARD_GEOMETRY
+from .bitboard import Bitboard
+
+
+EMPTY_POSITION_HASH: Final = 0
+
+
+def _chip_hash_keys(chip_type: ChipType) -> tuple[int, ...]:
+    """
+    Returns 64-bit Zobrist keys for chips of the specified type,
+    indexed by bit of the cell. Keys are derived from the chip type
+    and the cell, so they are the same in every process.
+    """
+    cell_count = DEFAULT_BOARD_GEOMETRY.columns * (
+        DEFAULT_BOARD_GEOMETRY.column_height
+    )
+    return tuple(
+        int.from_bytes(
+            blake2b(f"{chip_type}:{cell}".encode(), digest_size=8).digest(),
+        )
+        for cell in range(cell_count)
+    )
+
+
+_CHIP_HASH_KEYS: Final = {
+    chip_type: _chip_hash_keys(chip_type) for chip_type in ChipType
+}
+
+
+def chip_hash_key(*, chip_type: ChipType, cell: int) -> int:
+    """
+    Returns value position hash should be XORed with when chip
+    of the specified type is placed on or removed from the cell.
+    """
+    return _CHIP_HASH_KEYS[chip_type][cell]
+
+
+def position_hash_factory(bitboard: Bitboard) -> int:
+    """
+    Returns 64-bit Zobrist hash of the position.
+    """
+    position_hash = EMPTY_POSITION_HASH
+
+    for chip_type, mask in bitboard.masks.items():
+        chip_hash_keys = _CHIP_HASH_KEYS[chip_type]
+
+        while mask:
+            lowest_bit = mask & -mask
+            position_hash ^= chip_hash_keys[lowest_bit.bit_length() - 1]
+            mask ^= lowest_bit
+
+    return position_hash
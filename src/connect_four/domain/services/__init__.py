@@ -6,3 +6,6 @@ from .create_game import *
 from .end_game import *
 from .make_move import *
 from .try_to_lose_by_time import *
+from .replay_move_log import *
+from .audit_games import *
+from .evaluate_position import *
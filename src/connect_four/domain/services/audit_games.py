@@ -0,0 +1,54 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("AuditGames",)
+
+from typing import Iterable
+
+from connect_four.domain.identitifiers import GameId
+from connect_four.domain.constants import ChipType, GameStatus
+from connect_four.domain.models import Game
+
+
+class AuditGames:
+    def __call__(self, games: Iterable[Game]) -> list[GameId]:
+        """
+        Returns ids of games whose status doesn't match their
+        board, that is games:
+
+            * with a winning line or a full board that are not
+              ended;
+
+            * with chips on the board that are not started;
+
+            * with winning lines of both chip types.
+
+        Boards are checked as bitboards, with every direction
+        checked by shifting the whole board at once.
+        """
+        flagged_game_ids = []
+
+        for game in games:
+            bitboard = game.bitboard
+
+            first_player_won = bitboard.has_line(ChipType.FIRST)
+            second_player_won = bitboard.has_line(ChipType.SECOND)
+
+            if first_player_won and second_player_won:
+                flagged_game_ids.append(game.id)
+                continue
+
+            board_is_decided = (
+                first_player_won or second_player_won or bitboard.is_full()
+            )
+            if board_is_decided and game.status != GameStatus.ENDED:
+                flagged_game_ids.append(game.id)
+                continue
+
+            if game.status == GameStatus.NOT_STARTED and any(
+                bitboard.heights,
+            ):
+                flagged_game_ids.append(game.id)
+
+        return flagged_game_ids
@@ -19,7 +19,12 @@ from connect_four.domain.constants import (
     BOARD_COLUMNS,
     BOARD_ROWS,
 )
-from connect_four.domain.models import Game, PlayerState
+from connect_four.domain.models import (
+    Game,
+    PlayerState,
+    EMPTY_POSITION_HASH,
+    MoveLog,
+)
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -62,6 +67,15 @@ class CreateGame:
             ),
         }
 
+        move_log = MoveLog(
+            initial_time_left={
+                first_player_chip_type: first_player.time,
+                second_player_chip_type: second_player.time,
+            },
+            columns=bytearray(),
+            time_spent=bytearray(),
+        )
+
         if first_player_chip_type == ChipType.FIRST:
             current_turn = first_player.id
         else:
@@ -70,10 +84,13 @@ class CreateGame:
         return Game(
             id=game_id,
             state_id=GameStateId(uuid4()),
+            state_version=0,
             status=GameStatus.NOT_STARTED,
             players=players,
             current_turn=current_turn,
             board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
             last_move_made_at=None,
             created_at=created_at,
+            position_hash=EMPTY_POSITION_HASH,
+            move_log=move_log,
         )
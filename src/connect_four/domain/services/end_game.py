@@ -4,14 +4,11 @@
 
 __all__ = ("EndGame",)
 
-from uuid import uuid4
-
-from connect_four.domain.identitifiers import GameStateId
 from connect_four.domain.constants import GameStatus
 from connect_four.domain.models import Game
 
 
 class EndGame:
     def __call__(self, game: Game) -> None:
-        game.state_id = GameStateId(uuid4())
+        game.advance_state()
         game.status = GameStatus.ENDED
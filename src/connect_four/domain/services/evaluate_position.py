@@ -0,0 +1,404 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("EvaluatePosition",)
+
+from datetime import timedelta
+from enum import IntEnum, auto
+from time import monotonic
+from typing import Final
+
+from connect_four.domain.constants import ChipType, GameStatus
+from connect_four.domain.models import (
+    BoardGeometry,
+    Bitboard,
+    chip_hash_key,
+    position_hash_factory,
+    WIN_SCORE,
+    PositionEvaluation,
+    Game,
+)
+
+
+_DEFAULT_TRANSPOSITION_TABLE_SIZE: Final = 1 << 16
+
+# Number of nodes searched between checks of the deadline.
+_NODES_PER_DEADLINE_CHECK: Final = 256
+
+
+class _Bound(IntEnum):
+    EXACT = auto()
+    LOWER = auto()
+    UPPER = auto()
+
+
+type _TranspositionTableEntry = tuple[int, int, _Bound, int, int | None]
+
+
+class _SearchTimeoutError(Exception): ...
+
+
+class EvaluatePosition:
+    """
+    Negamax search with alpha-beta pruning and iterative deepening.
+    Positions searched are kept in a transposition table of fixed
+    size, which is shared between calls. A new entry replaces
+    an old one unless both describe the same position and the old
+    one was searched deeper.
+    """
+
+    __slots__ = ("_transposition_table",)
+
+    def __init__(
+        self,
+        transposition_table_size: int = _DEFAULT_TRANSPOSITION_TABLE_SIZE,
+    ) -> None:
+        if transposition_table_size & (transposition_table_size - 1):
+            raise Exception(
+                "Transposition table size must be a power of two.",
+            )
+
+        self._transposition_table: list[_TranspositionTableEntry | None]
+        self._transposition_table = [None] * transposition_table_size
+
+    def __call__(
+        self,
+        *,
+        game: Game,
+        time_budget: timedelta,
+    ) -> PositionEvaluation:
+        """
+        Returns best column for the player whose turn it is.
+        The search deepens one move at a time until the position
+        is solved or `time_budget` runs out; the result of the
+        deepest completed search is returned. Search one move deep
+        is always completed.
+        """
+        if game.status == GameStatus.ENDED:
+            raise Exception("Cannot evaluate position: game has ended.")
+
+        current_player = game.players[game.current_turn]
+        search = _Search(
+            bitboard=game.bitboard,
+            chip_type=current_player.chip_type,
+            position_hash=game.position_hash,
+            transposition_table=self._transposition_table,
+            deadline=monotonic() + time_budget.total_seconds(),
+        )
+        return search.run()
+
+    def evaluate_bitboard(
+        self,
+        *,
+        bitboard: Bitboard,
+        chip_type: ChipType,
+        time_budget: timedelta,
+    ) -> PositionEvaluation:
+        """
+        Same as `__call__`, but for a position that doesn't belong
+        to any game. Player with chips of `chip_type` is to move.
+        """
+        search = _Search(
+            bitboard=bitboard,
+            chip_type=chip_type,
+            position_hash=position_hash_factory(bitboard),
+            transposition_table=self._transposition_table,
+            deadline=monotonic() + time_budget.total_seconds(),
+        )
+        return search.run()
+
+
+class _Search:
+    __slots__ = (
+        "_geometry",
+        "_heights",
+        "_chip_types",
+        "_masks",
+        "_position_hash",
+        "_move_count",
+        "_column_order",
+        "_line_weights",
+        "_transposition_table",
+        "_deadline",
+        "_nodes",
+    )
+
+    def __init__(
+        self,
+        *,
+        bitboard: Bitboard,
+        chip_type: ChipType,
+        position_hash: int,
+        transposition_table: list[_TranspositionTableEntry | None],
+        deadline: float,
+    ) -> None:
+        geometry = bitboard.geometry
+
+        opponent_chip_type = (
+            ChipType.SECOND if chip_type == ChipType.FIRST else ChipType.FIRST
+        )
+
+        self._geometry: BoardGeometry = geometry
+        self._heights = bitboard.heights.copy()
+        self._chip_types = (chip_type, opponent_chip_type)
+        self._masks = (
+            bitboard.masks[chip_type],
+            bitboard.masks[opponent_chip_type],
+        )
+        self._position_hash = position_hash
+        self._move_count = sum(self._heights)
+
+        # Chips in central columns take part in more lines, so
+        # moves there are searched first.
+        self._column_order = sorted(
+            range(geometry.columns),
+            key=lambda column: abs(2 * column - geometry.columns + 1),
+        )
+        self._line_weights = tuple(
+            4**chips - 1 for chips in range(geometry.chips_to_win)
+        )
+
+        self._transposition_table = transposition_table
+        self._deadline = deadline
+        self._nodes = 0
+
+    def run(self) -> PositionEvaluation:
+        cell_count = self._geometry.rows * self._geometry.columns
+        empty_cells = cell_count - self._move_count
+        if not empty_cells:
+            raise Exception("Cannot evaluate position: board is full.")
+
+        evaluation = None
+
+        for depth in range(1, empty_cells + 1):
+            try:
+                score, column = self._search_root(
+                    depth=depth,
+                    check_deadline=evaluation is not None,
+                )
+            except _SearchTimeoutError:
+                break
+
+            evaluation = PositionEvaluation(
+                column=column,
+                score=score,
+                depth=depth,
+            )
+            if abs(score) >= WIN_SCORE - cell_count:
+                break
+
+        assert evaluation
+        return evaluation
+
+    def _search_root(
+        self,
+        *,
+        depth: int,
+        check_deadline: bool,
+    ) -> tuple[int, int]:
+        mover_mask, opponent_mask = self._masks
+
+        best_score = -WIN_SCORE - 1
+        best_column = -1
+        alpha = -WIN_SCORE - 1
+
+        for column in self._ordered_columns(self._lookup(self._position_hash)):
+            if self._heights[column] == self._geometry.rows:
+                continue
+
+            cell = self._geometry.cell(
+                column=column,
+                height=self._heights[column],
+            )
+            score = -self._negamax(
+                mover_mask=opponent_mask,
+                opponent_mask=mover_mask | 1 << cell,
+                position_hash=self._position_hash
+                ^ chip_hash_key(chip_type=self._chip_types[0], cell=cell),
+                move_count=self._move_count + 1,
+                last_cell=cell,
+                ply=1,
+                depth=depth - 1,
+                alpha=-WIN_SCORE - 1,
+                beta=-alpha,
+                check_deadline=check_deadline,
+                column=column,
+            )
+            if score > best_score:
+                best_score = score
+                best_column = column
+                alpha = max(alpha, score)
+
+        self._store(
+            position_hash=self._position_hash,
+            depth=depth,
+            bound=_Bound.EXACT,
+            score=best_score,
+            column=best_column,
+        )
+        return best_score, best_column
+
+    def _negamax(
+        self,
+        *,
+        mover_mask: int,
+        opponent_mask: int,
+        position_hash: int,
+        move_count: int,
+        last_cell: int,
+        ply: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        check_deadline: bool,
+        column: int,
+    ) -> int:
+        """
+        Returns score of the position for the player to move.
+        The move into `column` that landed on `last_cell` is
+        already applied to `opponent_mask`, but not to heights.
+        """
+        self._nodes += 1
+        if (
+            check_deadline
+            and not self._nodes % _NODES_PER_DEADLINE_CHECK
+            and monotonic() >= self._deadline
+        ):
+            raise _SearchTimeoutError()
+
+        for line in self._geometry.lines_by_cell[last_cell]:
+            if opponent_mask & line == line:
+                return move_count - WIN_SCORE
+
+        if move_count == self._geometry.rows * self._geometry.columns:
+            return 0
+
+        if depth == 0:
+            return self._evaluate(
+                mover_mask=mover_mask,
+                opponent_mask=opponent_mask,
+            )
+
+        entry = self._lookup(position_hash)
+        if entry and entry[1] >= depth:
+            _, _, bound, entry_score, _ = entry
+            if bound == _Bound.EXACT:
+                return entry_score
+            if bound == _Bound.LOWER:
+                alpha = max(alpha, entry_score)
+            else:
+                beta = min(beta, entry_score)
+            if alpha >= beta:
+                return entry_score
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_column = None
+
+        heights = self._heights
+        heights[column] += 1
+        chip_type = self._chip_types[ply % 2]
+
+        try:
+            for next_column in self._ordered_columns(entry):
+                if heights[next_column] == self._geometry.rows:
+                    continue
+
+                cell = self._geometry.cell(
+                    column=next_column,
+                    height=heights[next_column],
+                )
+                score = -self._negamax(
+                    mover_mask=opponent_mask,
+                    opponent_mask=mover_mask | 1 << cell,
+                    position_hash=position_hash
+                    ^ chip_hash_key(chip_type=chip_type, cell=cell),
+                    move_count=move_count + 1,
+                    last_cell=cell,
+                    ply=ply + 1,
+                    depth=depth - 1,
+                    alpha=-beta,
+                    beta=-alpha,
+                    check_deadline=check_deadline,
+                    column=next_column,
+                )
+                if score > best_score:
+                    best_score = score
+                    best_column = next_column
+                    alpha = max(alpha, score)
+                    if alpha >= beta:
+                        break
+        finally:
+            heights[column] -= 1
+
+        if best_score <= original_alpha:
+            bound = _Bound.UPPER
+        elif best_score >= beta:
+            bound = _Bound.LOWER
+        else:
+            bound = _Bound.EXACT
+
+        self._store(
+            position_hash=position_hash,
+            depth=depth,
+            bound=bound,
+            score=best_score,
+            column=best_column,
+        )
+        return best_score
+
+    def _evaluate(self, *, mover_mask: int, opponent_mask: int) -> int:
+        """
+        Returns heuristic score of the position for the player
+        to move: every line not blocked by the other player is
+        worth more the more chips it already has.
+        """
+        line_weights = self._line_weights
+        score = 0
+
+        for line in self._geometry.lines:
+            if not line & opponent_mask:
+                score += line_weights[(line & mover_mask).bit_count()]
+            elif not line & mover_mask:
+                score -= line_weights[(line & opponent_mask).bit_count()]
+
+        return score
+
+    def _ordered_columns(
+        self,
+        entry: _TranspositionTableEntry | None,
+    ) -> list[int]:
+        if not entry or entry[4] is None:
+            return self._column_order
+
+        best_column = entry[4]
+        return [best_column] + [
+            column for column in self._column_order if column != best_column
+        ]
+
+    def _lookup(self, position_hash: int) -> _TranspositionTableEntry | None:
+        table = self._transposition_table
+        entry = table[position_hash & (len(table) - 1)]
+
+        if entry and entry[0] == position_hash:
+            return entry
+        return None
+
+    def _store(
+        self,
+        *,
+        position_hash: int,
+        depth: int,
+        bound: _Bound,
+        score: int,
+        column: int | None,
+    ) -> None:
+        table = self._transposition_table
+        index = position_hash & (len(table) - 1)
+
+        entry = table[index]
+        if entry and entry[0] == position_hash and entry[1] > depth:
+            return
+
+        table[index] = (position_hash, depth, bound, score, column)
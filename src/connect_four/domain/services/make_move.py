@@ -4,15 +4,16 @@
 
 __all__ = ("MakeMove",)
 
-from typing import Final
-from datetime import datetime, timezone, timedelta
-from uuid import uuid4
+from array import array
+from datetime import datetime, timedelta
+from typing import Sequence
 
-from connect_four.domain.identitifiers import UserId, GameStateId
+from connect_four.domain.identitifiers import UserId
+from connect_four.domain.clock import Clock
 from connect_four.domain.constants import (
-    ChipType,
     GameStatus,
     MoveRejectionReason,
+    MoveResultCode,
     BOARD_COLUMNS,
     BOARD_ROWS,
 )
@@ -25,18 +26,18 @@ from connect_four.domain.models import (
     Draw,
     MoveRejected,
     MoveResult,
+    chip_hash_key,
+    BitboardBatch,
+    MOVE_TIME_RESOLUTION,
 )
 
 
-_DIRECTIONS: Final = (
-    (0, 1),  # horizontal
-    (1, 0),  # vertical
-    (1, 1),  # diagonal ↖↘
-    (1, -1),  # diagonal ↗↙
-)
+class MakeMove:
+    __slots__ = ("_clock",)
 
+    def __init__(self, clock: Clock):
+        self._clock = clock
 
-class MakeMove:
     def __call__(
         self,
         *,
@@ -59,6 +60,8 @@ class MakeMove:
         if not chip_location:
             return MoveRejected(reason=MoveRejectionReason.ILLEGAL_MOVE)
 
+        last_move_made_at = game.last_move_made_at
+
         current_player_lost_by_time = self._apply_turn_time(
             game=game,
             current_player_id=current_player_id,
@@ -71,8 +74,89 @@ class MakeMove:
             chip_location=chip_location,
             current_player_id=current_player_id,
         )
+        self._log_move(
+            game=game,
+            column=column,
+            last_move_made_at=last_move_made_at,
+        )
         return move_result
 
+    def make_many(
+        self,
+        *,
+        positions: BitboardBatch,
+        columns: Sequence[int],
+    ) -> array[int]:
+        """
+        Makes a move in every game of the batch: move in game `i`
+        is made in column `columns[i]`. Unlike `__call__`, players'
+        time is not taken into account and no result objects are
+        created, so the method suits simulations and replays.
+        Returns array of `MoveResultCode`s indexed by game.
+        """
+        if len(columns) != len(positions):
+            raise Exception(
+                "Cannot make moves: "
+                "number of columns doesn't match number of games.",
+            )
+
+        geometry = positions.geometry
+        column_count = geometry.columns
+        column_height = geometry.column_height
+        column_mask = (1 << geometry.rows) - 1
+        cell_count = geometry.rows * geometry.columns
+        lines_by_cell = geometry.lines_by_cell
+
+        first_masks = positions.first_masks
+        second_masks = positions.second_masks
+        move_counts = positions.move_counts
+        ended = positions.ended
+
+        rejected = MoveResultCode.REJECTED.value
+        win = MoveResultCode.WIN.value
+        draw = MoveResultCode.DRAW.value
+
+        results = array("B", bytes(len(columns)))
+
+        for i, column in enumerate(columns):
+            if ended[i] or not 0 <= column < column_count:
+                results[i] = rejected
+                continue
+
+            first_mask = first_masks[i]
+            second_mask = second_masks[i]
+
+            shift = column * column_height
+            height = (
+                (first_mask | second_mask) >> shift & column_mask
+            ).bit_length()
+            if height == geometry.rows:
+                results[i] = rejected
+                continue
+
+            cell = shift + height
+            move_count = move_counts[i]
+
+            if move_count % 2 == 0:
+                mask = first_masks[i] = first_mask | 1 << cell
+            else:
+                mask = second_masks[i] = second_mask | 1 << cell
+
+            move_count += 1
+            move_counts[i] = move_count
+
+            for line in lines_by_cell[cell]:
+                if mask & line == line:
+                    ended[i] = 1
+                    results[i] = win
+                    break
+            else:
+                if move_count == cell_count:
+                    ended[i] = 1
+                    results[i] = draw
+
+        return results
+
     def _validate_move(
         self,
         *,
@@ -89,7 +173,7 @@ class MakeMove:
         if game.current_turn != current_player_id:
             return MoveRejectionReason.OTHER_PLAYER_TURN
 
-        if column > BOARD_COLUMNS - 1:
+        if column < 0 or column > BOARD_COLUMNS - 1:
             return MoveRejectionReason.ILLEGAL_MOVE
 
         return None
@@ -100,11 +184,11 @@ class MakeMove:
         game: Game,
         column: int,
     ) -> ChipLocation | None:
-        for row in range(BOARD_ROWS - 1, -1, -1):
-            if game.board[row][column] is None:
-                return ChipLocation(column=column, row=row)
+        column_height = game.column_heights[column]
+        if column_height == BOARD_ROWS:
+            return None
 
-        return None
+        return ChipLocation(column=column, row=BOARD_ROWS - 1 - column_height)
 
     def _apply_turn_time(
         self,
@@ -116,14 +200,18 @@ class MakeMove:
         Updates the game's state based on the time taken by the
         current player to make their move and returns flag
         indicating whether the current player lost by time.
+        Time is counted in whole milliseconds, the same as in
+        move logs, so replaying a log gives the same time left.
         """
-        current_datetime = datetime.now(timezone.utc)
+        current_datetime = self._clock.now()
 
         if game.status == GameStatus.NOT_STARTED:
             game.last_move_made_at = current_datetime
             return False
 
-        time_for_move = current_datetime - game.last_move_made_at  # type: ignore
+        time_for_move = _truncate_time(
+            current_datetime - game.last_move_made_at,  # type: ignore
+        )
         current_player_state = game.players[current_player_id]
         time_left_for_current_player = current_player_state.time_left
 
@@ -131,7 +219,7 @@ class MakeMove:
             current_player_state.time_left = timedelta(seconds=0)
             game.last_move_made_at = current_datetime
 
-            game.state_id = GameStateId(uuid4())
+            game.advance_state()
             game.status = GameStatus.ENDED
 
             return True
@@ -148,7 +236,7 @@ class MakeMove:
         chip_location: ChipLocation,
         current_player_id: UserId,
     ) -> MoveAccepted | Win | Draw:
-        game.state_id = GameStateId(uuid4())
+        game.advance_state()
 
         current_player = game.players[current_player_id]
         current_player_chip_type = current_player.chip_type
@@ -156,6 +244,17 @@ class MakeMove:
         game.board[chip_location.row][chip_location.column] = (
             current_player_chip_type
         )
+        # Also updates `game.column_heights`, they are shared
+        # with the bitboard.
+        cell = game.bitboard.drop_chip(
+            column=chip_location.column,
+            chip_type=current_player_chip_type,
+        )
+        game.move_count += 1
+        game.position_hash ^= chip_hash_key(
+            chip_type=current_player_chip_type,
+            cell=cell,
+        )
 
         if game.status == GameStatus.NOT_STARTED:
             game.status = GameStatus.IN_PROGRESS
@@ -166,17 +265,15 @@ class MakeMove:
             )
             return MoveAccepted(chip_location=chip_location)
 
-        player_won = self._check_if_player_won(
-            board=game.board,
-            chip_location=chip_location,
-            current_player_chip_type=current_player_chip_type,
+        player_won = game.bitboard.has_line_through(
+            cell=cell,
+            chip_type=current_player_chip_type,
         )
         if player_won:
             game.status = GameStatus.ENDED
             return Win(chip_location=chip_location)
 
-        board_is_full = self._check_if_board_is_full(game.board)
-        if board_is_full:
+        if game.move_count == BOARD_ROWS * BOARD_COLUMNS:
             game.status = GameStatus.ENDED
             return Draw(chip_location=chip_location)
 
@@ -186,75 +283,24 @@ class MakeMove:
         )
         return MoveAccepted(chip_location=chip_location)
 
-    def _check_if_player_won(
+    def _log_move(
         self,
         *,
-        board: list[list[ChipType | None]],
-        chip_location: ChipLocation,
-        current_player_chip_type: ChipType,
-    ) -> bool:
-        for row_delta, column_delta in _DIRECTIONS:
-            forward_count = self._count_chips_in_direction(
-                board=board,
-                row=chip_location.row,
-                column=chip_location.column,
-                row_delta=row_delta,
-                column_delta=column_delta,
-                chip_type=current_player_chip_type,
-            )
-            if forward_count == 4:
-                return True
-
-            backward_count = self._count_chips_in_direction(
-                board=board,
-                row=chip_location.row,
-                column=chip_location.column,
-                row_delta=-row_delta,
-                column_delta=-column_delta,
-                chip_type=current_player_chip_type,
-            )
-            if backward_count == 4:
-                return True
+        game: Game,
+        column: int,
+        last_move_made_at: datetime | None,
+    ) -> None:
+        if game.move_log is None:
+            return
 
-            total_count = (
-                forward_count
-                + backward_count
-                - 1  # We counted played chip twice
+        if last_move_made_at:
+            time_spent = _truncate_time(
+                game.last_move_made_at - last_move_made_at,  # type: ignore
             )
-            if total_count >= 4:
-                return True
+        else:
+            time_spent = timedelta(seconds=0)
 
-        return False
-
-    def _count_chips_in_direction(
-        self,
-        *,
-        board: list[list[ChipType | None]],
-        row: int,
-        column: int,
-        row_delta: int,
-        column_delta: int,
-        chip_type: ChipType,
-    ) -> int:
-        count = 0
-        current_row, current_column = row, column
-
-        while (
-            0 <= current_row <= BOARD_ROWS - 1
-            and 0 <= current_column <= BOARD_COLUMNS - 1
-            and board[current_row][current_column] == chip_type
-        ):
-            count += 1
-            current_row += row_delta
-            current_column += column_delta
-
-        return count
-
-    def _check_if_board_is_full(
-        self,
-        board: list[list[ChipType | None]],
-    ) -> bool:
-        return not any(cell is None for row in board for cell in row)
+        game.move_log.append(column=column, time_spent=time_spent)
 
     def _next_turn(
         self,
@@ -270,3 +316,7 @@ class MakeMove:
         raise Exception(
             "There is no other player in the game to assign the next turn to.",
         )
+
+
+def _truncate_time(time: timedelta) -> timedelta:
+    return time // MOVE_TIME_RESOLUTION * MOVE_TIME_RESOLUTION
@@ -0,0 +1,98 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("ReplayMoveLog",)
+
+from connect_four.domain.constants import (
+    ChipType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+)
+from connect_four.domain.models import (
+    Bitboard,
+    EMPTY_POSITION_HASH,
+    chip_hash_key,
+    MoveLog,
+    PlayerState,
+    Game,
+)
+
+
+class ReplayMoveLog:
+    def __call__(self, game: Game) -> Game:
+        """
+        Returns new game with board, current turn and players'
+        time left rebuilt from the move log of the provided game
+        in one pass. Other attributes are copied from the provided
+        game. Time of a move that ended the game by time is not
+        logged, so it is not taken into account.
+        """
+        if game.move_log is None:
+            raise Exception("Game has no move log to replay.")
+
+        time_left = dict(game.move_log.initial_time_left)
+
+        bitboard = Bitboard.empty()
+        position_hash = EMPTY_POSITION_HASH
+        move_count = 0
+        game_is_over = False
+        chip_type = ChipType.FIRST
+
+        for column, time_spent in game.move_log:
+            if move_count % 2 == 0:
+                chip_type = ChipType.FIRST
+            else:
+                chip_type = ChipType.SECOND
+
+            time_left[chip_type] -= time_spent
+
+            cell = bitboard.drop_chip(column=column, chip_type=chip_type)
+            position_hash ^= chip_hash_key(chip_type=chip_type, cell=cell)
+            move_count += 1
+
+            game_is_over = (
+                bitboard.has_line_through(cell=cell, chip_type=chip_type)
+                or move_count == BOARD_ROWS * BOARD_COLUMNS
+            )
+
+        if game_is_over:
+            # Turn is not passed to the other player after
+            # the last move of the game.
+            current_turn_chip_type = chip_type
+        elif move_count % 2 == 0:
+            current_turn_chip_type = ChipType.FIRST
+        else:
+            current_turn_chip_type = ChipType.SECOND
+
+        players = {}
+        current_turn = game.current_turn
+
+        for player_id, player_state in game.players.items():
+            players[player_id] = PlayerState(
+                chip_type=player_state.chip_type,
+                time_left=time_left[player_state.chip_type],
+                communication_type=player_state.communication_type,
+            )
+            if player_state.chip_type == current_turn_chip_type:
+                current_turn = player_id
+
+        move_log = MoveLog(
+            initial_time_left=dict(game.move_log.initial_time_left),
+            columns=bytearray(game.move_log.columns),
+            time_spent=bytearray(game.move_log.time_spent),
+        )
+
+        return Game(
+            id=game.id,
+            state_id=game.state_id,
+            state_version=game.state_version,
+            status=game.status,
+            players=players,
+            current_turn=current_turn,
+            board=bitboard.to_board(),
+            last_move_made_at=game.last_move_made_at,
+            created_at=game.created_at,
+            position_hash=position_hash,
+            move_log=move_log,
+        )
@@ -6,8 +6,6 @@ __all__ = ("TryToLoseByTime",)
 
 from datetime import timedelta
 
-from uuid_extensions import uuid7
-
 from connect_four.domain.identitifiers import GameStateId
 from connect_four.domain.constants import GameStatus
 from connect_four.domain.models import Game
@@ -22,16 +20,19 @@ class TryToLoseByTime:
     ) -> bool:
         """
         Ends the game with the current player's loss by time
-        if possible. The method checks if the current game state id
-        matches the provided one. If the state ids don't match,
+        if possible. The method checks if the game is in progress
+        and its current state id matches the provided one. If not,
         the action is not executed. Returns flag indicating whether
         the game was ended.
         """
-        if game.state_id != game_state_id:
+        if (
+            game.status != GameStatus.IN_PROGRESS
+            or game.state_id != game_state_id
+        ):
             return False
 
         game.status = GameStatus.ENDED
-        game.state_id = GameStateId(uuid7())
+        game.advance_state()
 
         current_player_state = game.players[game.current_turn]
         current_player_state.time_left = timedelta(seconds=0)
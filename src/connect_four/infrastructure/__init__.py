@@ -4,10 +4,14 @@
 
 from .utils import *
 from .common_retort import *
+from .codec import *
+from .json_backend import *
 from .operation_id import *
 from .log import *
 from .redis_config import *
+from .clock import *
 from .clients import *
 from .database import *
 from .scheduling import *
 from .message_broker import *
+from .opening_book import *
@@ -23,6 +23,7 @@ from tenacity import (
 )
 
 from connect_four.application import Serializable, CentrifugoClient
+from connect_four.infrastructure.json_backend import JSONBackend
 from connect_four.infrastructure.utils import get_env_var
 
 
@@ -57,14 +58,16 @@ def _log_before_retry(retry_state: RetryCallState) -> None:
 
 
 class HTTPXCentrifugoClient(CentrifugoClient):
-    __slots__ = ("_httpx_client", "_config")
+    __slots__ = ("_httpx_client", "_json_backend", "_config")
 
     def __init__(
         self,
         httpx_client: AsyncClient,
+        json_backend: JSONBackend,
         config: CentrifugoConfig,
     ):
         self._httpx_client = httpx_client
+        self._json_backend = json_backend
         self._config = config
 
     async def publish(
@@ -89,7 +92,7 @@ class HTTPXCentrifugoClient(CentrifugoClient):
         self,
         *,
         url: str,
-        json_: Serializable,
+        json_: dict[str, Serializable],
     ) -> None:
         try:
             _logger.debug({
@@ -99,8 +102,11 @@ class HTTPXCentrifugoClient(CentrifugoClient):
             })
             response = await self._httpx_client.post(
                 url=url,
-                json=json_,
-                headers={"X-API-Key": self._config.api_key},
+                content=self._json_backend.dumps(json_),
+                headers={
+                    "X-API-Key": self._config.api_key,
+                    "Content-Type": "application/json",
+                },
                 timeout=_REQUEST_TIMEOUT,
             )
         except Exception as error:
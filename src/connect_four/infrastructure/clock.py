@@ -0,0 +1,43 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "SystemClock",
+    "VirtualClock",
+)
+
+from datetime import datetime, timedelta, timezone
+
+from connect_four.domain import Clock
+
+
+class SystemClock(Clock):
+    __slots__ = ()
+
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+
+class VirtualClock(Clock):
+    """
+    Clock whose time only changes when it is advanced, so timed
+    games can be simulated without waiting in real time. Starts
+    at the current system time unless a start time is provided.
+    Meant for tests and simulations only: containers always
+    provide `SystemClock`.
+    """
+
+    __slots__ = ("_now",)
+
+    def __init__(self, start: datetime | None = None):
+        self._now = start or datetime.now(timezone.utc)
+
+    def now(self) -> datetime:
+        return self._now
+
+    def advance(self, delta: timedelta) -> None:
+        if delta < timedelta(0):
+            raise Exception("Cannot advance virtual clock backwards.")
+
+        self._now += delta
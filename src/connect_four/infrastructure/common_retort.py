@@ -4,29 +4,58 @@
 
 __all__ = ("CommonRetort", "common_retort_factory")
 
+import re
 from datetime import timedelta
-from typing import NewType
+from typing import Final, NewType
 
 from adaptix import Retort, loader, dumper
 
 
 CommonRetort = NewType("CommonRetort", Retort)  # type: ignore
 
+# Duration in the format pydantic and therefore FastStream publishers
+# serialize `timedelta` to, e.g. `PT3M` or `-P1DT2H0.5S`.
+_ISO_DURATION: Final = re.compile(
+    r"(?P<sign>-)?P(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?",
+)
+
 
 def common_retort_factory() -> CommonRetort:
     """
     Retort additionally supports:
 
         - Loading `timedelta` from a `float` or a `str` representing
-          the total number of seconds.
+          the total number of seconds, or from an ISO 8601 duration.
 
         - Dumping `timedelta` to a `float` representing
           the total number of seconds.
     """
     recipe = (
-        loader(timedelta, lambda seconds: timedelta(seconds=float(seconds))),
+        loader(timedelta, _load_timedelta),
         dumper(timedelta, timedelta.total_seconds),
     )
     retort = Retort(recipe=recipe)
 
     return CommonRetort(retort)
+
+
+def _load_timedelta(data: float | str) -> timedelta:
+    if not isinstance(data, str) or not data.lstrip("-").startswith("P"):
+        return timedelta(seconds=float(data))
+
+    match = _ISO_DURATION.fullmatch(data)
+    if not match:
+        raise ValueError(f"Invalid ISO 8601 duration: {data}.")
+
+    duration = timedelta(
+        days=int(match["days"] or 0),
+        hours=int(match["hours"] or 0),
+        minutes=int(match["minutes"] or 0),
+        seconds=float(match["seconds"] or 0),
+    )
+    if match["sign"]:
+        return -duration
+
+    return duration
@@ -0,0 +1,386 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "BINARY_FORMAT_VERSION",
+    "BINARY_STATE_VERSION_OFFSET",
+    "pack_state_version",
+    "dump_game_binary",
+    "load_game_binary",
+    "FIELDS_FORMAT_VERSION",
+    "dump_game_fields",
+    "load_game_fields",
+)
+
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Final, Mapping
+from uuid import UUID
+
+from connect_four.domain import (
+    BOARD_ROWS,
+    BOARD_COLUMNS,
+    ChipType,
+    GameStatus,
+    CommunicatonType,
+    GameId,
+    GameStateId,
+    UserId,
+    PlayerState,
+    MoveLog,
+    Game,
+)
+
+
+BINARY_FORMAT_VERSION: Final = 1
+FIELDS_FORMAT_VERSION: Final = 1
+
+_EPOCH: Final = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND: Final = timedelta(microseconds=1)
+_NO_TIME: Final = -(1 << 63)
+
+_GAME_STATUSES: Final = tuple(GameStatus)
+_CHIP_TYPES: Final = tuple(ChipType)
+_COMMUNICATION_TYPES: Final = tuple(CommunicatonType)
+
+_BITS_PER_CELL: Final = 2
+_CELL_MASK: Final = (1 << _BITS_PER_CELL) - 1
+_BOARD_SIZE: Final = (BOARD_ROWS * BOARD_COLUMNS * _BITS_PER_CELL + 7) // 8
+
+# version, id, state id, state version, status, current turn slot,
+# last move made at, created at, position hash, board, then id,
+# chip type, communication type and time left of both players and
+# flag indicating whether the game has a move log.
+_GAME: Final = struct.Struct(
+    f"<B16s16sIBBqqQ{_BOARD_SIZE}s16sBBq16sBBqB",
+)
+
+# Initial time left of both chip types and lengths of the
+# `columns` and `time_spent` byte strings following the struct.
+_MOVE_LOG: Final = struct.Struct("<qqHH")
+
+# Id, chip type, communication type and time left of a player.
+_PLAYER: Final = struct.Struct("<16sBBq")
+
+_UINT32: Final = struct.Struct("<I")
+_INT64: Final = struct.Struct("<q")
+_UINT64: Final = struct.Struct("<Q")
+
+# Offset of the state version in binary documents, which is the
+# same in every version, so the stored state version can be
+# checked without loading the document. It is encoded the same
+# way as the `state_version` field of a hash.
+BINARY_STATE_VERSION_OFFSET: Final = struct.calcsize("<B16s16s")
+
+
+def pack_state_version(state_version: int) -> bytes:
+    return _UINT32.pack(state_version)
+
+
+def dump_game_binary(game: Game) -> bytes:
+    """
+    Returns game packed into a versioned binary document. Ids are
+    stored as raw 16 bytes, every cell of the board as 2 bits and
+    datetimes and durations as microseconds.
+    """
+    player_ids = tuple(game.players)
+    if len(player_ids) != 2:
+        raise Exception(
+            "Cannot dump game as binary: game must have 2 players.",
+        )
+
+    first_player = game.players[player_ids[0]]
+    second_player = game.players[player_ids[1]]
+
+    if game.last_move_made_at:
+        last_move_made_at = (game.last_move_made_at - _EPOCH) // _MICROSECOND
+    else:
+        last_move_made_at = _NO_TIME
+
+    game_as_bytes = _GAME.pack(
+        BINARY_FORMAT_VERSION,
+        game.id.bytes,
+        game.state_id.bytes,
+        game.state_version,
+        _GAME_STATUSES.index(game.status),
+        player_ids.index(game.current_turn),
+        last_move_made_at,
+        (game.created_at - _EPOCH) // _MICROSECOND,
+        game.position_hash,
+        _pack_board(game.board),
+        player_ids[0].bytes,
+        _CHIP_TYPES.index(first_player.chip_type),
+        _COMMUNICATION_TYPES.index(first_player.communication_type),
+        first_player.time_left // _MICROSECOND,
+        player_ids[1].bytes,
+        _CHIP_TYPES.index(second_player.chip_type),
+        _COMMUNICATION_TYPES.index(second_player.communication_type),
+        second_player.time_left // _MICROSECOND,
+        game.move_log is not None,
+    )
+    if game.move_log is None:
+        return game_as_bytes
+
+    return game_as_bytes + _pack_move_log(game.move_log)
+
+
+def load_game_binary(game_as_bytes: bytes) -> Game:
+    """
+    Loads game from a binary document of any known version.
+    The version byte and `_BINARY_LOADERS` are how stored games
+    are upgraded: when the layout changes, `BINARY_FORMAT_VERSION`
+    is incremented and the loader of the previous version is kept,
+    filling fields added later, so old documents are upgraded when
+    read and stored in the current layout on their next update.
+    """
+    version = game_as_bytes[0]
+
+    load_game = _BINARY_LOADERS.get(version)
+    if not load_game:
+        raise Exception(
+            f"Cannot load game from binary: unknown version {version}.",
+        )
+
+    return load_game(game_as_bytes)
+
+
+def _load_game_v1(game_as_bytes: bytes) -> Game:
+    (
+        _,
+        game_id,
+        state_id,
+        state_version,
+        status,
+        current_turn,
+        last_move_made_at,
+        created_at,
+        position_hash,
+        packed_board,
+        first_player_id,
+        first_player_chip_type,
+        first_player_communication_type,
+        first_player_time_left,
+        second_player_id,
+        second_player_chip_type,
+        second_player_communication_type,
+        second_player_time_left,
+        has_move_log,
+    ) = _GAME.unpack_from(game_as_bytes)
+
+    player_ids = (
+        UserId(UUID(bytes=first_player_id)),
+        UserId(UUID(bytes=second_player_id)),
+    )
+    players = {
+        player_ids[0]: PlayerState(
+            chip_type=_CHIP_TYPES[first_player_chip_type],
+            time_left=timedelta(microseconds=first_player_time_left),
+            communication_type=_COMMUNICATION_TYPES[
+                first_player_communication_type
+            ],
+        ),
+        player_ids[1]: PlayerState(
+            chip_type=_CHIP_TYPES[second_player_chip_type],
+            time_left=timedelta(microseconds=second_player_time_left),
+            communication_type=_COMMUNICATION_TYPES[
+                second_player_communication_type
+            ],
+        ),
+    }
+
+    return Game(
+        id=GameId(UUID(bytes=game_id)),
+        state_id=GameStateId(UUID(bytes=state_id)),
+        state_version=state_version,
+        status=_GAME_STATUSES[status],
+        players=players,
+        current_turn=player_ids[current_turn],
+        board=_unpack_board(packed_board),
+        last_move_made_at=(
+            None
+            if last_move_made_at == _NO_TIME
+            else _EPOCH + timedelta(microseconds=last_move_made_at)
+        ),
+        created_at=_EPOCH + timedelta(microseconds=created_at),
+        position_hash=position_hash,
+        move_log=(
+            _unpack_move_log(game_as_bytes, offset=_GAME.size)
+            if has_move_log
+            else None
+        ),
+    )
+
+
+# Loaders of every known version of binary documents.
+_BINARY_LOADERS: Final[dict[int, Callable[[bytes], Game]]] = {
+    1: _load_game_v1,
+}
+
+
+def dump_game_fields(game: Game) -> dict[str, bytes]:
+    """
+    Returns game as fields of a Redis hash, encoded the same way
+    as in a binary document. Fields are split so that a move
+    changes as few of them as possible: every player has a field
+    of its own and the game's id and creation time are never
+    changed.
+    """
+    player_ids = tuple(game.players)
+    if len(player_ids) != 2:
+        raise Exception(
+            "Cannot dump game as fields: game must have 2 players.",
+        )
+
+    if game.last_move_made_at:
+        last_move_made_at = (game.last_move_made_at - _EPOCH) // _MICROSECOND
+    else:
+        last_move_made_at = _NO_TIME
+
+    fields = {
+        "version": bytes((FIELDS_FORMAT_VERSION,)),
+        "id": game.id.bytes,
+        "state_id": game.state_id.bytes,
+        "state_version": pack_state_version(game.state_version),
+        "status": bytes((_GAME_STATUSES.index(game.status),)),
+        "current_turn": bytes((player_ids.index(game.current_turn),)),
+        "board": _pack_board(game.board),
+        "last_move_made_at": _INT64.pack(last_move_made_at),
+        "created_at": _INT64.pack(
+            (game.created_at - _EPOCH) // _MICROSECOND,
+        ),
+        "position_hash": _UINT64.pack(game.position_hash),
+        "move_log": (_pack_move_log(game.move_log) if game.move_log else b""),
+    }
+    for slot, player_id in enumerate(player_ids):
+        player_state = game.players[player_id]
+        fields[f"player:{slot}"] = _PLAYER.pack(
+            player_id.bytes,
+            _CHIP_TYPES.index(player_state.chip_type),
+            _COMMUNICATION_TYPES.index(player_state.communication_type),
+            player_state.time_left // _MICROSECOND,
+        )
+
+    return fields
+
+
+def load_game_fields(fields: Mapping[str, bytes]) -> Game:
+    version = fields["version"][0]
+    if version != FIELDS_FORMAT_VERSION:
+        raise Exception(
+            f"Cannot load game from fields: unknown version {version}.",
+        )
+
+    players = {}
+    player_ids = []
+
+    for slot in range(2):
+        (
+            player_id,
+            chip_type,
+            communication_type,
+            time_left,
+        ) = _PLAYER.unpack(fields[f"player:{slot}"])
+
+        player_ids.append(UserId(UUID(bytes=player_id)))
+        players[player_ids[slot]] = PlayerState(
+            chip_type=_CHIP_TYPES[chip_type],
+            time_left=timedelta(microseconds=time_left),
+            communication_type=_COMMUNICATION_TYPES[communication_type],
+        )
+
+    (last_move_made_at,) = _INT64.unpack(fields["last_move_made_at"])
+    (created_at,) = _INT64.unpack(fields["created_at"])
+
+    return Game(
+        id=GameId(UUID(bytes=fields["id"])),
+        state_id=GameStateId(UUID(bytes=fields["state_id"])),
+        state_version=_UINT32.unpack(fields["state_version"])[0],
+        status=_GAME_STATUSES[fields["status"][0]],
+        players=players,
+        current_turn=player_ids[fields["current_turn"][0]],
+        board=_unpack_board(fields["board"]),
+        last_move_made_at=(
+            None
+            if last_move_made_at == _NO_TIME
+            else _EPOCH + timedelta(microseconds=last_move_made_at)
+        ),
+        created_at=_EPOCH + timedelta(microseconds=created_at),
+        position_hash=_UINT64.unpack(fields["position_hash"])[0],
+        move_log=(
+            _unpack_move_log(fields["move_log"], offset=0)
+            if fields["move_log"]
+            else None
+        ),
+    )
+
+
+def _pack_board(board: list[list[ChipType | None]]) -> bytes:
+    packed_board = 0
+    shift = 0
+
+    for row in board:
+        for chip_type in row:
+            if chip_type is not None:
+                packed_board |= (_CHIP_TYPES.index(chip_type) + 1) << shift
+            shift += _BITS_PER_CELL
+
+    return packed_board.to_bytes(_BOARD_SIZE, "little")
+
+
+def _unpack_board(packed_board: bytes) -> list[list[ChipType | None]]:
+    board_as_int = int.from_bytes(packed_board, "little")
+    board: list[list[ChipType | None]] = []
+
+    for _ in range(BOARD_ROWS):
+        row: list[ChipType | None] = []
+        for _ in range(BOARD_COLUMNS):
+            cell = board_as_int & _CELL_MASK
+            row.append(_CHIP_TYPES[cell - 1] if cell else None)
+            board_as_int >>= _BITS_PER_CELL
+
+        board.append(row)
+
+    return board
+
+
+def _pack_move_log(move_log: MoveLog) -> bytes:
+    return b"".join(
+        (
+            _MOVE_LOG.pack(
+                move_log.initial_time_left[ChipType.FIRST] // _MICROSECOND,
+                move_log.initial_time_left[ChipType.SECOND] // _MICROSECOND,
+                len(move_log.columns),
+                len(move_log.time_spent),
+            ),
+            move_log.columns,
+            move_log.time_spent,
+        ),
+    )
+
+
+def _unpack_move_log(game_as_bytes: bytes, *, offset: int) -> MoveLog:
+    (
+        first_initial_time_left,
+        second_initial_time_left,
+        column_count,
+        time_spent_size,
+    ) = _MOVE_LOG.unpack_from(game_as_bytes, offset)
+
+    columns_start = offset + _MOVE_LOG.size
+    time_spent_start = columns_start + column_count
+
+    return MoveLog(
+        initial_time_left={
+            ChipType.FIRST: timedelta(microseconds=first_initial_time_left),
+            ChipType.SECOND: timedelta(
+                microseconds=second_initial_time_left,
+            ),
+        },
+        columns=bytearray(game_as_bytes[columns_start:time_spent_start]),
+        time_spent=bytearray(
+            game_as_bytes[
+                time_spent_start : time_spent_start + time_spent_size
+            ],
+        ),
+    )
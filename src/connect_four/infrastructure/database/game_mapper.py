@@ -8,21 +8,70 @@ __all__ = (
     "GameMapper",
 )
 
-import json
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Iterable
+from typing import Final, Iterable, Sequence
+from uuid import UUID
 
 from redis.asyncio.client import Redis, Pipeline
 
 from connect_four.domain import GameId, UserId, Game
 from connect_four.application import SortGamesBy, GameGateway
-from connect_four.infrastructure.common_retort import CommonRetort
+from connect_four.infrastructure.codec import Codec
+from connect_four.infrastructure.json_backend import JSONBackend
 from connect_four.infrastructure.utils import (
     get_env_var,
     str_to_timedelta,
 )
 from .lock_manager import LockManager
+from .game_binary_format import (
+    BINARY_STATE_VERSION_OFFSET,
+    pack_state_version,
+    dump_game_binary,
+    load_game_binary,
+    dump_game_fields,
+    load_game_fields,
+)
+from .game_upgrades import upgrade_legacy_game_as_dict
+
+
+_MGET_BATCH_SIZE: Final = 500
+
+# Writes a game either as a binary document under KEYS[1] or as
+# fields of a hash under KEYS[2], deleting the other one. If the
+# expected state version ARGV[1] is not empty, the game is written
+# only if the stored one, if any, is the same. ARGV[2] is expiry in
+# milliseconds, ARGV[3] is the document, or an empty string if
+# fields and their values, which follow it, are written instead.
+# The script is sent with EVAL, since a script sent with EVALSHA
+# from a pipeline costs an extra round trip to check it's loaded.
+_WRITE_GAME_SCRIPT: Final = f"""
+if ARGV[1] ~= "" then
+    local stored = redis.call("HGET", KEYS[2], "state_version")
+    if not stored then
+        stored = redis.call(
+            "GETRANGE",
+            KEYS[1],
+            {BINARY_STATE_VERSION_OFFSET},
+            {BINARY_STATE_VERSION_OFFSET + 3}
+        )
+    end
+    if stored ~= "" and stored ~= ARGV[1] then
+        return redis.error_reply("game state version has changed")
+    end
+end
+if ARGV[3] ~= "" then
+    redis.call("SET", KEYS[1], ARGV[3], "PX", ARGV[2])
+    redis.call("DEL", KEYS[2])
+else
+    if #ARGV > 3 then
+        redis.call("HSET", KEYS[2], unpack(ARGV, 4))
+    end
+    redis.call("PEXPIRE", KEYS[2], ARGV[2])
+    redis.call("DEL", KEYS[1])
+end
+return 1
+"""
 
 
 def load_game_mapper_config() -> "GameMapperConfig":
@@ -32,36 +81,79 @@ def load_game_mapper_config() -> "GameMapperConfig":
             value_factory=str_to_timedelta,
             default=timedelta(hours=1),
         ),
+        read_legacy_keys=get_env_var(
+            key="GAME_MAPPER_READ_LEGACY_KEYS",
+            default="true",
+        )
+        == "true",
+        hash_layout=get_env_var(
+            key="GAME_MAPPER_HASH_LAYOUT",
+            default="false",
+        )
+        == "true",
     )
 
 
 @dataclass(frozen=True, slots=True)
 class GameMapperConfig:
+    """
+    Parameters:
+
+        `read_legacy_keys`: Also look for games stored under
+            `games:id:{id}:player_ids:{id}:{id}` keys, which were
+            used before games were stored under `games:{id}`.
+            Enabled by default, so games started before an upgrade
+            can be finished. Such keys can only be found by scanning
+            the keyspace, so this should be disabled once games
+            under old keys have been updated or expired. Games
+            listed by player ids are looked for under old keys only
+            if the index has fewer games than requested. Locks of
+            old keys are not taken, so instances that used them
+            must be stopped before new ones are started.
+
+        `hash_layout`: Store every game as a hash under
+            `games:{id}:fields` instead of a binary document under
+            `games:{id}`, so updates write only fields that were
+            changed. Hashes and documents are both read whatever
+            this flag is, and a game is moved to the layout in use
+            on its next update, so the flag can be turned on and
+            off at any time.
+    """
+
     game_expires_in: timedelta
+    read_legacy_keys: bool
+    hash_layout: bool
 
 
 class GameMapper(GameGateway):
     __slots__ = (
         "_redis",
         "_redis_pipeline",
-        "_common_retort",
+        "_codec",
+        "_json_backend",
         "_lock_manager",
         "_config",
+        "_loaded_fields",
+        "_loaded_state_versions",
     )
 
     def __init__(
         self,
         redis: Redis,
         redis_pipeline: Pipeline,
-        common_retort: CommonRetort,
+        codec: Codec,
+        json_backend: JSONBackend,
         lock_manager: LockManager,
         config: GameMapperConfig,
     ):
         self._redis = redis
         self._redis_pipeline = redis_pipeline
-        self._common_retort = common_retort
+        self._codec = codec
+        self._json_backend = json_backend
         self._lock_manager = lock_manager
         self._config = config
+        self._loaded_fields: dict[GameId, dict[str, bytes]] = {}
+        self._loaded_state_versions: dict[GameId, int] = {}
 
     async def by_id(
         self,
@@ -69,21 +161,51 @@ class GameMapper(GameGateway):
         *,
         acquire: bool = False,
     ) -> Game | None:
-        pattern = self._pattern_to_find_game_by_id(game_id)
-        keys = await self._keys_by_pattern(pattern=pattern, limit=1)
-        if not keys:
-            return None
-
         if acquire:
-            await self._lock_manager.acquire(keys[0])
+            game_key = self._game_key_factory(game_id)
+            (
+                game_as_bytes,
+                fields_as_bytes,
+            ) = await self._lock_manager.acquire_and_read(
+                game_key,
+                key=game_key,
+                hash_key=self._game_fields_key_factory(game_id),
+            )
+            game = self._load_stored_game(
+                game_id,
+                game_as_bytes=game_as_bytes,
+                fields_as_bytes=fields_as_bytes,
+            )
+        else:
+            game = (await self._games_by_ids([game_id]))[0]
+
+        if game or not self._config.read_legacy_keys:
+            return game
 
-        game_as_json = await self._redis.get(keys[0])  # type: ignore
-        if game_as_json:
-            game_as_dict = json.loads(game_as_json)
-            return self._common_retort.load(game_as_dict, Game)
+        game_as_bytes = await self._legacy_game_as_bytes(game_id)
+        if game_as_bytes:
+            return self._load_game(game_as_bytes)
 
         return None
 
+    async def by_ids(self, game_ids: Iterable[GameId]) -> list[Game]:
+        game_ids = list(game_ids)
+        games = await self._games_by_ids(game_ids)
+
+        missing_game_ids = [
+            game_id
+            for game_id, game in zip(game_ids, games, strict=True)
+            if not game
+        ]
+        if self._config.read_legacy_keys and missing_game_ids:
+            legacy_games = await self._legacy_games_by_ids(missing_game_ids)
+            games = [
+                game or legacy_games.get(game_id)
+                for game_id, game in zip(game_ids, games, strict=True)
+            ]
+
+        return [game for game in games if game]
+
     async def list_by_player_ids(
         self,
         player_ids: tuple[UserId, UserId],
@@ -97,61 +219,323 @@ class GameMapper(GameGateway):
                 "limit is not a positive number or zero.",
             )
 
-        pattern = self._pattern_to_find_game_by_player_ids(player_ids)
-        keys = await self._keys_by_pattern(pattern=pattern, limit=1)
-        if not keys:
-            return []
+        games = await self._list_indexed_by_player_ids(
+            player_ids,
+            newest_first=sort_by == SortGamesBy.DESC_CREATED_AT,
+            limit=limit,
+        )
+
+        # Legacy keys can only be found by scanning the keyspace, so
+        # they are looked for only when the index has too few games.
+        if self._config.read_legacy_keys and (not limit or len(games) < limit):
+            pattern = self._pattern_to_find_game_by_player_ids(player_ids)
+            legacy_keys = await self._keys_by_pattern(
+                pattern=pattern,
+                limit=limit - len(games) if limit else None,
+            )
+            legacy_games = await self._games_by_keys(legacy_keys)
+            games += [game for game in legacy_games if game]
+
+            if sort_by:
+                games.sort(key=lambda game: game.created_at, reverse=True)
+
+        if limit:
+            return games[:limit]
+
+        return games
+
+    async def save(self, game: Game) -> None:
+        self._write_game(game)
+        self._index_by_player_ids(game)
+
+    async def update(self, game: Game) -> None:
+        self._write_game(game)
+        self._index_by_player_ids(game)
+
+        if self._config.read_legacy_keys:
+            legacy_game_key = self._legacy_game_key_factory(
+                game_id=game.id,
+                player_ids=game.players.keys(),
+            )
+            self._redis_pipeline.delete(legacy_game_key)
+
+    def _write_game(self, game: Game) -> None:
+        """
+        Writes the game in the layout in use. Games loaded by this
+        mapper are written only if their stored state version is
+        still the one they were loaded with, otherwise the commit
+        fails, so a game can't be overwritten by a writer that
+        lost its lock.
+        """
+        loaded_state_version = self._loaded_state_versions.get(game.id)
+        if loaded_state_version is None:
+            expected_state_version = b""
+        else:
+            expected_state_version = pack_state_version(loaded_state_version)
+
+        if self._config.hash_layout:
+            game_as_bytes = b""
+            changed_fields = self._changed_game_fields(game)
+        else:
+            game_as_bytes = dump_game_binary(game)
+            changed_fields = {}
+            self._loaded_fields.pop(game.id, None)
+
+        self._redis_pipeline.eval(
+            _WRITE_GAME_SCRIPT,
+            2,
+            self._game_key_factory(game.id),
+            self._game_fields_key_factory(game.id),
+            expected_state_version,
+            self._config.game_expires_in // timedelta(milliseconds=1),
+            game_as_bytes,
+            *(item for field in changed_fields.items() for item in field),
+        )
+        self._loaded_state_versions[game.id] = game.state_version
+
+    def _changed_game_fields(self, game: Game) -> dict[str, bytes]:
+        """
+        Returns fields of the game's hash that differ from the ones
+        it was loaded with. Games that were not loaded from a hash
+        by this mapper have all their fields returned.
+        """
+        fields = dump_game_fields(game)
+        loaded_fields = self._loaded_fields.get(game.id)
+        self._loaded_fields[game.id] = fields
+
+        if loaded_fields is None:
+            return fields
+
+        return {
+            name: value
+            for name, value in fields.items()
+            if loaded_fields.get(name) != value
+        }
+
+    def _index_by_player_ids(self, game: Game) -> None:
+        """
+        Adds game to the index of games of its players, a sorted
+        set of game ids scored by the games' creation time. Index
+        expires together with the most recently saved or updated
+        game of the players.
+        """
+        index_key = self._player_ids_index_key_factory(game.players.keys())
+
+        self._redis_pipeline.zadd(
+            index_key,
+            {game.id.hex: game.created_at.timestamp()},
+        )
+        self._redis_pipeline.expire(index_key, self._config.game_expires_in)
+
+    async def _list_indexed_by_player_ids(
+        self,
+        player_ids: Iterable[UserId],
+        *,
+        newest_first: bool,
+        limit: int,
+    ) -> list[Game]:
+        """
+        Returns games from the index of games of the players, reading
+        the range of ids and then the games themselves in one
+        request each. Ids of games that expired before the index are
+        removed from it, and the next range is read instead of them.
+        """
+        index_key = self._player_ids_index_key_factory(player_ids)
+        read_range = (
+            self._redis.zrevrange if newest_first else self._redis.zrange
+        )
 
-        games_as_dicts = []
-        game_count = 0
+        games: list[Game] = []
+        expired_game_ids = []
+        start = 0
 
-        for key in keys:
-            if limit and game_count == limit:
+        while True:
+            if limit:
+                stop = start + limit - len(games) - 1
+            else:
+                stop = -1
+
+            game_ids = await read_range(index_key, start, stop)
+            if not game_ids:
                 break
 
-            game_as_json = await self._redis.get(key)  # type: ignore
-            if not game_as_json:
-                continue
+            indexed_games = await self._games_by_ids([
+                GameId(UUID(hex=game_id.decode())) for game_id in game_ids
+            ])
+            for game_id, game in zip(game_ids, indexed_games, strict=True):
+                if game:
+                    games.append(game)
+                else:
+                    expired_game_ids.append(game_id)
 
-            game_as_dict = json.loads(game_as_json)
-            games_as_dicts.append(game_as_dict)
+            if not limit or len(games) >= limit:
+                break
 
-            game_count += 1
+            start += len(game_ids)
 
-        games = self._common_retort.load(games_as_dicts, list[Game])
+        if expired_game_ids:
+            await self._redis.zrem(index_key, *expired_game_ids)
 
-        if not sort_by:
-            return games
+        return games
 
-        return sorted(games, key=lambda game: game.created_at, reverse=True)
+    async def _games_by_ids(
+        self,
+        game_ids: Sequence[GameId],
+    ) -> list[Game | None]:
+        """
+        Returns games with the ids, `None` for games that don't
+        exist. Both the hash and the binary document of every game
+        are requested in one pipeline, whatever layout is used for
+        writing, so games stay readable when the layout is switched.
+        """
+        if not game_ids:
+            return []
 
-    async def save(self, game: Game) -> None:
-        game_key = self._game_key_factory(
-            game_id=game.id,
-            player_ids=game.players.keys(),
-        )
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for game_id in game_ids:
+                pipeline.hgetall(self._game_fields_key_factory(game_id))
+                pipeline.get(self._game_key_factory(game_id))
+            results = await pipeline.execute()
+
+        return [
+            self._load_stored_game(
+                game_id,
+                game_as_bytes=results[index * 2 + 1],
+                fields_as_bytes=results[index * 2],
+            )
+            for index, game_id in enumerate(game_ids)
+        ]
 
-        game_as_dict = self._common_retort.dump(game, Game)
-        game_as_json = json.dumps(game_as_dict)
+    def _load_stored_game(
+        self,
+        game_id: GameId,
+        *,
+        game_as_bytes: bytes | None,
+        fields_as_bytes: dict[bytes, bytes],
+    ) -> Game | None:
+        """
+        Loads game from its hash or, if there is none, from its
+        binary document. Fields of loaded hashes and state versions
+        of loaded games are remembered for `update`.
+        """
+        if fields_as_bytes:
+            fields = {
+                name.decode(): value for name, value in fields_as_bytes.items()
+            }
+            self._loaded_fields[game_id] = fields
+            game = load_game_fields(fields)
+            self._loaded_state_versions[game_id] = game.state_version
+            return game
+
+        if game_as_bytes:
+            return self._load_game(game_as_bytes)
 
-        self._redis_pipeline.set(
-            name=game_key,
-            value=game_as_json,
-            ex=self._config.game_expires_in,
-        )
+        return None
 
-    async def update(self, game: Game) -> None:
-        game_key = self._game_key_factory(
-            game_id=game.id,
-            player_ids=game.players.keys(),
-        )
+    async def _games_by_keys(self, keys: Sequence[str]) -> list[Game | None]:
+        """
+        Returns games stored under the keys, `None` for keys that
+        don't exist. Keys are read with MGET; if there are more of
+        them than fit in one batch, batches are sent in a single
+        pipeline, so the whole read takes one round trip.
+        """
+        if not keys:
+            return []
 
-        game_as_dict = self._common_retort.dump(game, Game)
-        game_as_json = json.dumps(game_as_dict)
+        if len(keys) <= _MGET_BATCH_SIZE:
+            games_as_bytes = await self._redis.mget(keys)
+        else:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for start in range(0, len(keys), _MGET_BATCH_SIZE):
+                    pipeline.mget(keys[start : start + _MGET_BATCH_SIZE])
+                batches = await pipeline.execute()
+
+            games_as_bytes = [
+                game_as_bytes for batch in batches for game_as_bytes in batch
+            ]
+
+        load_game = self._load_game
+        return [
+            load_game(game_as_bytes) if game_as_bytes else None
+            for game_as_bytes in games_as_bytes
+        ]
+
+    async def _legacy_game_as_bytes(self, game_id: GameId) -> bytes | None:
+        pattern = self._pattern_to_find_game_by_id(game_id)
+        legacy_keys = await self._keys_by_pattern(pattern=pattern, limit=1)
+        if not legacy_keys:
+            return None
+
+        return await self._redis.get(legacy_keys[0])  # type: ignore
+
+    async def _legacy_games_by_ids(
+        self,
+        game_ids: Iterable[GameId],
+    ) -> dict[GameId, Game]:
+        """
+        Returns games stored under old keys by their ids. Keys of
+        all the games are collected in one pass over the keyspace,
+        which stops once every game is found, and then read with
+        a single MGET.
+        """
+        game_ids_by_hex = {game_id.hex: game_id for game_id in game_ids}
+        legacy_keys: dict[GameId, str] = {}
+
+        async for key in self._redis.scan_iter(
+            match=self._pattern_to_find_any_game(),
+            count=100,
+        ):
+            legacy_key = key.decode()
+            game_id = game_ids_by_hex.get(legacy_key.split(":")[2])
+            if not game_id:
+                continue
+
+            legacy_keys[game_id] = legacy_key
+            if len(legacy_keys) == len(game_ids_by_hex):
+                break
 
-        self._redis_pipeline.set(game_key, game_as_json)
+        legacy_games = await self._games_by_keys(list(legacy_keys.values()))
+        return {
+            game_id: game
+            for game_id, game in zip(legacy_keys, legacy_games, strict=True)
+            if game
+        }
+
+    def _load_game(self, game_as_bytes: bytes) -> Game:
+        """
+        Loads game saved either as a JSON document by earlier
+        versions or as a binary document, which starts with
+        a version byte instead of `{`, and remembers its state
+        version for `update`.
+        """
+        if game_as_bytes[:1] == b"{":
+            game_as_dict = self._json_backend.loads(game_as_bytes)
+            game_as_dict = upgrade_legacy_game_as_dict(game_as_dict)
+            game = self._codec.load_game(game_as_dict)
+        else:
+            game = load_game_binary(game_as_bytes)
+
+        self._loaded_state_versions[game.id] = game.state_version
+        return game
+
+    def _game_key_factory(self, game_id: GameId) -> str:
+        return f"games:{game_id.hex}"
+
+    def _game_fields_key_factory(self, game_id: GameId) -> str:
+        return f"games:{game_id.hex}:fields"
+
+    def _player_ids_index_key_factory(
+        self,
+        player_ids: Iterable[UserId],
+    ) -> str:
+        sorted_player_ids = sorted(player_ids)
+        return (
+            "games:player_ids:"
+            f"{sorted_player_ids[0].hex}:{sorted_player_ids[1].hex}"
+            ":created_at"
+        )
 
-    def _game_key_factory(
+    def _legacy_game_key_factory(
         self,
         *,
         game_id: GameId,
@@ -166,6 +550,9 @@ class GameMapper(GameGateway):
     def _pattern_to_find_game_by_id(self, game_id: GameId) -> str:
         return f"games:id:{game_id.hex}:player_ids:*"
 
+    def _pattern_to_find_any_game(self) -> str:
+        return "games:id:*:player_ids:*"
+
     def _pattern_to_find_game_by_player_ids(
         self,
         player_ids: Iterable[UserId],
@@ -192,7 +579,7 @@ class GameMapper(GameGateway):
             match=pattern,
             count=batch_size,
         ):
-            keys.append(key)
+            keys.append(key.decode())
 
             if limit and len(keys) >= limit:
                 return keys
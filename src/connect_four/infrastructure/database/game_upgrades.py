@@ -0,0 +1,30 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("upgrade_legacy_game_as_dict",)
+
+from connect_four.domain import (
+    Bitboard,
+    position_hash_factory,
+)
+
+
+def upgrade_legacy_game_as_dict(game_as_dict: dict) -> dict:
+    """
+    Upgrades a game saved as a JSON document by versions that
+    stored games under `games:id:{id}:player_ids:{id}:{id}` keys
+    to the current `Game`. Such a game gets a position hash
+    calculated from its board, no move log, since its moves are
+    unknown, and initial state version; its state id is kept, so
+    tasks scheduled for its current state still match it.
+
+    Games stored since then are binary documents, which are
+    upgraded by loaders of their versions, see `load_game_binary`.
+    """
+    bitboard = Bitboard.from_board(game_as_dict["board"])
+    game_as_dict["position_hash"] = position_hash_factory(bitboard)
+    game_as_dict["move_log"] = None
+    game_as_dict["state_version"] = 0
+
+    return game_as_dict
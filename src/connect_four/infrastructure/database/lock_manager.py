@@ -5,6 +5,8 @@
 __all__ = (
     "LockManagerConfig",
     "load_lock_manager_config",
+    "AcquireAndReadScript",
+    "acquire_and_read_script_factory",
     "LockManager",
     "lock_manager_factory",
 )
@@ -12,9 +14,10 @@ __all__ = (
 import asyncio
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Final, NewType
 
 from redis.asyncio.client import Redis
+from redis.commands.core import AsyncScript
 
 from connect_four.infrastructure.utils import (
     get_env_var,
@@ -22,6 +25,26 @@ from connect_four.infrastructure.utils import (
 )
 
 
+# Sets the lock and, if it was set, returns the string and the hash
+# stored under the other two keys, so the lock is acquired and the
+# locked data is read in one round trip.
+_ACQUIRE_AND_READ_SCRIPT: Final = """
+if not redis.call("SET", KEYS[1], "", "PX", ARGV[1], "NX") then
+    return {0}
+end
+return {1, redis.call("GET", KEYS[2]), redis.call("HGETALL", KEYS[3])}
+"""
+
+
+AcquireAndReadScript = NewType("AcquireAndReadScript", AsyncScript)
+
+
+def acquire_and_read_script_factory(redis: Redis) -> AcquireAndReadScript:
+    return AcquireAndReadScript(
+        redis.register_script(_ACQUIRE_AND_READ_SCRIPT),
+    )
+
+
 def load_lock_manager_config() -> "LockManagerConfig":
     return LockManagerConfig(
         lock_expires_in=get_env_var(
@@ -40,8 +63,13 @@ class LockManagerConfig:
 async def lock_manager_factory(
     redis: Redis,
     config: LockManagerConfig,
+    acquire_and_read_script: AcquireAndReadScript,
 ) -> AsyncGenerator["LockManager", None]:
-    lock_manager = LockManager(redis=redis, config=config)
+    lock_manager = LockManager(
+        redis=redis,
+        config=config,
+        acquire_and_read_script=acquire_and_read_script,
+    )
     try:
         yield lock_manager
     finally:
@@ -53,12 +81,19 @@ class LockManager:
         "_redis",
         "_acquired_lock_names",
         "_config",
+        "_acquire_and_read_script",
     )
 
-    def __init__(self, redis: Redis, config: LockManagerConfig):
+    def __init__(
+        self,
+        redis: Redis,
+        config: LockManagerConfig,
+        acquire_and_read_script: AcquireAndReadScript,
+    ):
         self._redis = redis
         self._acquired_lock_names: list[str] = []
         self._config = config
+        self._acquire_and_read_script = acquire_and_read_script
 
     async def acquire(self, lock_id: str) -> None:
         """
@@ -82,6 +117,52 @@ class LockManager:
 
         self._acquired_lock_names.append(lock_name)
 
+    async def acquire_and_read(
+        self,
+        lock_id: str,
+        *,
+        key: str,
+        hash_key: str,
+    ) -> tuple[bytes | None, dict[bytes, bytes]]:
+        """
+        Acquires a lock with the provided id the same way as
+        `acquire` and returns the string stored under `key` and
+        the hash stored under `hash_key`.
+
+        The lock is set and the data is read by a script called
+        with EVALSHA, so when the lock is free, both take one
+        round trip and the data can't be changed in between.
+        """
+        lock_name = self._lock_name_factory(lock_id)
+        if lock_name in self._acquired_lock_names:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.get(key)
+                pipeline.hgetall(hash_key)
+                value, hash_ = await pipeline.execute()
+
+            return value, hash_
+
+        lock_expires_in = self._config.lock_expires_in // timedelta(
+            milliseconds=1,
+        )
+        while True:
+            result = await self._acquire_and_read_script(
+                keys=[lock_name, key, hash_key],
+                args=[lock_expires_in],
+            )
+            if result[0]:
+                break
+
+            await asyncio.sleep(0.1)
+
+        self._acquired_lock_names.append(lock_name)
+
+        _, value, hash_as_list = result
+        hash_ = dict(
+            zip(hash_as_list[::2], hash_as_list[1::2], strict=True),
+        )
+        return value, hash_
+
     async def release_all(self) -> None:
         if not self._acquired_lock_names:
             return
@@ -17,7 +17,7 @@ from connect_four.infrastructure.redis_config import RedisConfig
 async def redis_factory(
     config: RedisConfig,
 ) -> AsyncGenerator[Redis, None]:
-    redis = Redis.from_url(url=config.url, decode_responses=True)
+    redis = Redis.from_url(url=config.url)
     yield redis
     await redis.aclose()
 
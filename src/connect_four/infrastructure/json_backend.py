@@ -0,0 +1,63 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "JSONBackend",
+    "json_backend_factory",
+    "StdlibJSONBackend",
+    "OrjsonJSONBackend",
+)
+
+import json
+from importlib.util import find_spec
+from typing import Protocol
+
+
+def json_backend_factory() -> "JSONBackend":
+    """
+    Returns orjson backend if orjson is installed, otherwise
+    returns backend using stdlib `json` module.
+    """
+    if find_spec("orjson"):
+        return OrjsonJSONBackend()
+    return StdlibJSONBackend()
+
+
+class JSONBackend(Protocol):
+    """
+    Serializer of JSON objects. Every document the service stores
+    or sends is an object, so backends work with dicts only.
+    """
+
+    def dumps(self, data: dict) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes | str) -> dict:
+        raise NotImplementedError
+
+
+class StdlibJSONBackend(JSONBackend):
+    __slots__ = ()
+
+    def dumps(self, data: dict) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes | str) -> dict:
+        return json.loads(data)
+
+
+class OrjsonJSONBackend(JSONBackend):
+    __slots__ = ("_dumps", "_loads")
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, data: dict) -> bytes:
+        return self._dumps(data)
+
+    def loads(self, data: bytes | str) -> dict:
+        return self._loads(data)
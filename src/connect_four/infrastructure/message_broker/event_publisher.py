@@ -2,14 +2,19 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
-__all__ = ("NATSEventPublisher",)
+__all__ = (
+    "EventPublisherConfig",
+    "load_event_publisher_config",
+    "NATSEventPublisher",
+)
 
-import json
 import logging
+from dataclasses import dataclass
 from typing import Final
 
 from nats.js.client import JetStreamContext
 
+from connect_four.domain import ChipType
 from connect_four.application import (
     GameCreatedEvent,
     GameEndedEvent,
@@ -17,8 +22,10 @@ from connect_four.application import (
     MoveRejectedEvent,
     Event,
 )
-from connect_four.infrastructure.common_retort import CommonRetort
+from connect_four.infrastructure.codec import Codec
+from connect_four.infrastructure.json_backend import JSONBackend
 from connect_four.infrastructure.operation_id import OperationId
+from connect_four.infrastructure.utils import get_env_var
 
 
 _STREAM: Final = "games"
@@ -30,28 +37,116 @@ _EVENT_TO_SUBJECT_MAP: Final = {
     MoveRejectedEvent: "gaems12.connect_four.game.move_rejected",
 }
 
+# Subjects of events with `compact_board` string instead of `board`
+# array of arrays, which consumers subscribe to instead of the
+# subjects of the same events above once they read compact boards.
+_EVENT_TO_COMPACT_BOARD_SUBJECT_MAP: Final = {
+    GameCreatedEvent: "gaems12.connect_four.game.created.v2",
+}
+
+_BOARD_ENCODING_HEADER: Final = "Board-Encoding"
+_COMPACT_BOARD_ENCODING: Final = "compact"
+
+_CHIP_TYPE_TO_CELL_MAP: Final = {
+    None: "0",
+    ChipType.FIRST: "1",
+    ChipType.SECOND: "2",
+}
+
 _logger: Final = logging.getLogger(__name__)
 
 
+def load_event_publisher_config() -> "EventPublisherConfig":
+    return EventPublisherConfig(
+        compact_board=get_env_var(
+            key="NATS_COMPACT_BOARD",
+            default="false",
+        )
+        == "true",
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class EventPublisherConfig:
+    """
+    Parameters:
+
+        `compact_board`: Also publish events that have a board to
+            versioned subjects, such as
+            `gaems12.connect_four.game.created.v2`, with the board
+            sent as `compact_board` string instead of `board` array
+            of arrays and marked with `Board-Encoding: compact`
+            header. Events are still published to their original
+            subjects unchanged, so consumers switch to versioned
+            subjects one by one.
+    """
+
+    compact_board: bool
+
+
+def _compact_board_factory(board: list[list[ChipType | None]]) -> str:
+    """
+    Returns board as a string of one character per cell, rows
+    from top to bottom and cells of a row from left to right:
+    `0` is an empty cell, `1` and `2` are cells with chips of
+    the first and the second type.
+    """
+    return "".join(
+        _CHIP_TYPE_TO_CELL_MAP[chip_type] for row in board for chip_type in row
+    )
+
+
 class NATSEventPublisher:
-    __slots__ = ("_jetstream", "_common_retort", "_operation_id")
+    __slots__ = (
+        "_jetstream",
+        "_codec",
+        "_json_backend",
+        "_operation_id",
+        "_config",
+    )
 
     def __init__(
         self,
         jetstream: JetStreamContext,
-        common_retort: CommonRetort,
+        codec: Codec,
+        json_backend: JSONBackend,
         operation_id: OperationId,
+        config: EventPublisherConfig,
     ):
         self._jetstream = jetstream
-        self._common_retort = common_retort
+        self._codec = codec
+        self._json_backend = json_backend
         self._operation_id = operation_id
+        self._config = config
 
     async def publish(self, event: Event) -> None:
-        subject = _EVENT_TO_SUBJECT_MAP[type(event)]
-
-        event_as_dict = self._common_retort.dump(event)
+        event_as_dict = self._codec.dump_event(event)
         event_as_dict["operation_id"] = str(self._operation_id)
-        payload = json.dumps(event_as_dict).encode()
+
+        await self._publish(
+            subject=_EVENT_TO_SUBJECT_MAP[type(event)],
+            event_as_dict=event_as_dict,
+        )
+
+        if self._config.compact_board and isinstance(event, GameCreatedEvent):
+            del event_as_dict["board"]
+            event_as_dict["compact_board"] = _compact_board_factory(
+                event.board,
+            )
+            await self._publish(
+                subject=_EVENT_TO_COMPACT_BOARD_SUBJECT_MAP[type(event)],
+                event_as_dict=event_as_dict,
+                headers={_BOARD_ENCODING_HEADER: _COMPACT_BOARD_ENCODING},
+            )
+
+    async def _publish(
+        self,
+        *,
+        subject: str,
+        event_as_dict: dict,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        payload = self._json_backend.dumps(event_as_dict)
 
         _logger.debug({
             "message": "About to send a message to nats.",
@@ -63,6 +158,7 @@ class NATSEventPublisher:
                 subject=subject,
                 payload=payload,
                 stream=_STREAM,
+                headers=headers,
             )
         except Exception as error:
             error_message = "Error occured during sending a message to nats."
@@ -19,6 +19,7 @@ class NATSStreamCreator:
             name="games",
             subjects=[
                 "gaems12.connect_four.game.created",
+                "gaems12.connect_four.game.created.v2",
                 "gaems12.connect_four.game.ended",
                 "gaems12.connect_four.game.move_accepted",
                 "gaems12.connect_four.game.move_rejected",
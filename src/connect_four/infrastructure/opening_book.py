@@ -0,0 +1,230 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("OpeningBook", "generate_opening_book")
+
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import cache
+from pathlib import Path
+from struct import Struct
+from typing import Final
+
+from connect_four.domain import (
+    ChipType,
+    Bitboard,
+    position_hash_factory,
+    PositionEvaluation,
+    EvaluatePosition,
+)
+
+
+_MAGIC: Final = b"C4OB"
+_VERSION: Final = 1
+
+# Magic, version, number of plies.
+_HEADER: Final = Struct("<4sHH")
+
+# Position hash, column, score, depth. Records are sorted by
+# position hash.
+_RECORD: Final = Struct("<QBiB")
+
+
+type _Position = tuple[int, int, tuple[int, ...]]
+
+
+class OpeningBook:
+    """
+    Read-only table of evaluations of opening positions. The file
+    is memory-mapped, so every process that opens it shares
+    the same pages.
+    """
+
+    __slots__ = ("_file", "_mmap", "_record_count", "plies")
+
+    def __init__(self, path: Path) -> None:
+        self._file = path.open("rb")
+        self._mmap = mmap.mmap(
+            self._file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        )
+
+        magic, version, plies = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise Exception(
+                f"Cannot open opening book: {path} is not an opening "
+                f"book of version {_VERSION}.",
+            )
+
+        self._record_count = (len(self._mmap) - _HEADER.size) // _RECORD.size
+        self.plies = plies
+
+    def lookup(self, position_hash: int) -> PositionEvaluation | None:
+        """
+        Returns evaluation of the position by binary search or
+        `None` if the position is not in the book.
+        """
+        low, high = 0, self._record_count
+
+        while low < high:
+            middle = (low + high) // 2
+            record_hash, column, score, depth = _RECORD.unpack_from(
+                self._mmap,
+                _HEADER.size + middle * _RECORD.size,
+            )
+
+            if record_hash < position_hash:
+                low = middle + 1
+            elif record_hash > position_hash:
+                high = middle
+            else:
+                return PositionEvaluation(
+                    column=column,
+                    score=score,
+                    depth=depth,
+                )
+
+        return None
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+
+def generate_opening_book(
+    *,
+    path: Path,
+    plies: int,
+    time_budget: timedelta,
+    workers: int | None = None,
+) -> int:
+    """
+    Evaluates every position reachable in fewer than `plies` moves
+    without the game ending, spreading positions across `workers`
+    processes, and writes the evaluations to `path`. The file
+    is replaced atomically, so processes that have the old file
+    open keep reading it. Returns number of positions written.
+    """
+    positions = _opening_positions(plies)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        evaluations = executor.map(
+            _evaluate_position,
+            positions.values(),
+            [time_budget] * len(positions),
+            chunksize=64,
+        )
+        records = sorted(zip(positions, evaluations, strict=True))
+
+    temporary_path = path.with_name(f"{path.name}.tmp")
+    with temporary_path.open("wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, plies))
+
+        for position_hash, evaluation in records:
+            file.write(
+                _RECORD.pack(
+                    position_hash,
+                    evaluation.column,
+                    evaluation.score,
+                    evaluation.depth,
+                ),
+            )
+
+    os.replace(temporary_path, path)
+
+    return len(records)
+
+
+def _opening_positions(plies: int) -> dict[int, _Position]:
+    """
+    Returns positions reachable in fewer than `plies` moves
+    without the game ending, by position hash.
+    """
+    empty_bitboard = Bitboard.empty()
+    positions = {
+        position_hash_factory(empty_bitboard): _position(empty_bitboard),
+    }
+    frontier = [empty_bitboard]
+
+    for ply in range(1, plies):
+        chip_type = ChipType.SECOND if ply % 2 == 0 else ChipType.FIRST
+        next_frontier = []
+
+        for bitboard in frontier:
+            for column in range(bitboard.geometry.columns):
+                if bitboard.drop_row(column) is None:
+                    continue
+
+                next_bitboard = Bitboard(
+                    masks=bitboard.masks.copy(),
+                    heights=bitboard.heights.copy(),
+                    geometry=bitboard.geometry,
+                )
+                cell = next_bitboard.drop_chip(
+                    column=column,
+                    chip_type=chip_type,
+                )
+                if (
+                    next_bitboard.has_line_through(
+                        cell=cell,
+                        chip_type=chip_type,
+                    )
+                    or next_bitboard.is_full()
+                ):
+                    continue
+
+                position_hash = position_hash_factory(next_bitboard)
+                if position_hash in positions:
+                    continue
+
+                positions[position_hash] = _position(next_bitboard)
+                next_frontier.append(next_bitboard)
+
+        frontier = next_frontier
+
+    return positions
+
+
+def _position(bitboard: Bitboard) -> _Position:
+    return (
+        bitboard.masks[ChipType.FIRST],
+        bitboard.masks[ChipType.SECOND],
+        tuple(bitboard.heights),
+    )
+
+
+@cache
+def _evaluate_position_service() -> EvaluatePosition:
+    """
+    Returns service created once per worker process, so its
+    transposition table is shared by all positions the process
+    evaluates.
+    """
+    return EvaluatePosition()
+
+
+def _evaluate_position(
+    position: _Position,
+    time_budget: timedelta,
+) -> PositionEvaluation:
+    first_mask, second_mask, heights = position
+
+    if sum(heights) % 2 == 0:
+        chip_type = ChipType.FIRST
+    else:
+        chip_type = ChipType.SECOND
+
+    bitboard = Bitboard(
+        masks={ChipType.FIRST: first_mask, ChipType.SECOND: second_mask},
+        heights=list(heights),
+    )
+    return _evaluate_position_service().evaluate_bitboard(
+        bitboard=bitboard,
+        chip_type=chip_type,
+        time_budget=time_budget,
+    )
@@ -2,12 +2,16 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
+import os
 import sys
+from datetime import timedelta
 from importlib.metadata import version
+from pathlib import Path
 from typing import Annotated
 
 from cyclopts import App, Parameter
 from dishka_cyclopts import setup_dishka
+import rich
 from faststream.cli import cli as faststream_cli
 from taskiq.cli.scheduler.run import SchedulerLoop
 from taskiq.cli.worker.args import WorkerArgs
@@ -19,6 +23,7 @@ from connect_four.infrastructure import (
     nats_client_factory,
     nats_jetstream_factory,
     NATSStreamCreator,
+    generate_opening_book,
 )
 from connect_four.presentation.cli import (
     ioc_container_factory,
@@ -46,6 +51,7 @@ def create_cli_app() -> App:
     setup_dishka(ioc_container, app)
 
     app.command(create_nats_streams)
+    app.command(create_opening_book)
 
     app.command(create_game)
     app.command(end_game)
@@ -68,6 +74,34 @@ async def create_nats_streams(nats_url: str) -> None:
         await stream_creator.create()
 
 
+def create_opening_book(
+    path: Path,
+    plies: Annotated[
+        int,
+        Parameter("--plies", show_default=True),
+    ] = 6,
+    position_time: Annotated[
+        int,
+        Parameter("--position-time-ms", show_default=True),
+    ] = 100,
+    workers: Annotated[
+        int,
+        Parameter("--workers", show_default=True),
+    ] = os.cpu_count() or 1,
+) -> None:
+    """
+    Create opening book with evaluations of positions reachable
+    in fewer than the specified number of moves.
+    """
+    position_count = generate_opening_book(
+        path=path,
+        plies=plies,
+        time_budget=timedelta(milliseconds=position_time),
+        workers=workers,
+    )
+    rich.print(f"{position_count} positions written to {path}.")
+
+
 def run_message_consumer(
     workers: Annotated[
         str,
@@ -30,16 +30,20 @@ from connect_four.infrastructure import (
     load_game_mapper_config,
     GameMapper,
     load_lock_manager_config,
+    acquire_and_read_script_factory,
     lock_manager_factory,
     RedisTransactionManager,
     load_nats_config,
     nats_client_factory,
     nats_jetstream_factory,
+    load_event_publisher_config,
     NATSEventPublisher,
     taskiq_redis_schedule_source_factory,
     TaskiqTaskScheduler,
     load_redis_config,
     common_retort_factory,
+    codec_factory,
+    json_backend_factory,
     get_operation_id,
 )
 
@@ -52,9 +56,12 @@ def ioc_container_factory() -> AsyncContainer:
     provider.provide(load_game_mapper_config)
     provider.provide(load_lock_manager_config)
     provider.provide(load_nats_config)
+    provider.provide(load_event_publisher_config)
 
     provider.provide(get_operation_id)
     provider.provide(common_retort_factory)
+    provider.provide(codec_factory)
+    provider.provide(json_backend_factory)
 
     provider.provide(httpx_client_factory)
     provider.provide(redis_factory)
@@ -63,6 +70,7 @@ def ioc_container_factory() -> AsyncContainer:
     provider.provide(nats_jetstream_factory)
     provider.provide(taskiq_redis_schedule_source_factory)
 
+    provider.provide(acquire_and_read_script_factory)
     provider.provide(lock_manager_factory)
     provider.provide(GameMapper, provides=GameGateway)
     provider.provide(RedisTransactionManager, provides=TransactionManager)
@@ -15,6 +15,7 @@ from dishka.integrations.faststream import FastStreamProvider
 from connect_four.domain import (
     CreateGame,
     EndGame,
+    Clock,
     MakeMove,
 )
 from connect_four.application import (
@@ -40,18 +41,24 @@ from connect_four.infrastructure import (
     GameMapper,
     LockManagerConfig,
     load_lock_manager_config,
+    acquire_and_read_script_factory,
     lock_manager_factory,
     RedisTransactionManager,
     NATSConfig,
     load_nats_config,
     nats_client_factory,
     nats_jetstream_factory,
+    EventPublisherConfig,
+    load_event_publisher_config,
     NATSEventPublisher,
     taskiq_redis_schedule_source_factory,
     TaskiqTaskScheduler,
     RedisConfig,
     load_redis_config,
+    SystemClock,
     common_retort_factory,
+    codec_factory,
+    json_backend_factory,
     get_operation_id,
 )
 from .identity_provider import MessageBrokerIdentityProvider
@@ -66,6 +73,7 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
         GameMapperConfig: load_game_mapper_config(),
         LockManagerConfig: load_lock_manager_config(),
         NATSConfig: load_nats_config(),
+        EventPublisherConfig: load_event_publisher_config(),
     }
 
     provider.from_context(CentrifugoConfig, scope=Scope.APP)
@@ -73,6 +81,7 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
     provider.from_context(GameMapperConfig, scope=Scope.APP)
     provider.from_context(LockManagerConfig, scope=Scope.APP)
     provider.from_context(NATSConfig, scope=Scope.APP)
+    provider.from_context(EventPublisherConfig, scope=Scope.APP)
 
     provider.provide(httpx_client_factory, scope=Scope.APP)
     provider.provide(redis_factory, scope=Scope.APP)
@@ -83,7 +92,11 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
 
     provider.provide(get_operation_id, scope=Scope.REQUEST)
     provider.provide(common_retort_factory, scope=Scope.APP)
+    provider.provide(codec_factory, scope=Scope.APP)
+    provider.provide(json_backend_factory, scope=Scope.APP)
+    provider.provide(SystemClock, scope=Scope.APP, provides=Clock)
 
+    provider.provide(acquire_and_read_script_factory, scope=Scope.APP)
     provider.provide(lock_manager_factory, scope=Scope.REQUEST)
     provider.provide(GameMapper, scope=Scope.REQUEST, provides=GameGateway)
     provider.provide(
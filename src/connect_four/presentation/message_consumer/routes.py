@@ -21,6 +21,7 @@ from connect_four.application import (
     MakeMoveCommand,
     MakeMoveProcessor,
 )
+from connect_four.infrastructure import Codec
 
 
 _STREAM: Final = JStream(name="games", declare=False)
@@ -37,9 +38,11 @@ router: Final = NatsRouter()
 @inject
 async def create_game(
     *,
-    command: CreateGameCommand,
+    command_as_dict: dict,
+    codec: FromDishka[Codec],
     command_processor: FromDishka[CreateGameProcessor],
 ) -> None:
+    command = codec.load_command(command_as_dict, CreateGameCommand)
     await command_processor.process(command)
 
 
@@ -52,9 +55,11 @@ async def create_game(
 @inject
 async def end_game(
     *,
-    command: EndGameCommand,
+    command_as_dict: dict,
+    codec: FromDishka[Codec],
     command_processor: FromDishka[EndGameProcessor],
 ) -> None:
+    command = codec.load_command(command_as_dict, EndGameCommand)
     await command_processor.process(command)
 
 
@@ -67,7 +72,9 @@ async def end_game(
 @inject
 async def make_move(
     *,
-    command: MakeMoveCommand,
+    command_as_dict: dict,
+    codec: FromDishka[Codec],
     command_processor: FromDishka[MakeMoveProcessor],
 ) -> None:
+    command = codec.load_command(command_as_dict, MakeMoveCommand)
     await command_processor.process(command)
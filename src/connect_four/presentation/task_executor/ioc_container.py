@@ -32,16 +32,21 @@ from connect_four.infrastructure import (
     GameMapper,
     LockManagerConfig,
     load_lock_manager_config,
+    acquire_and_read_script_factory,
     lock_manager_factory,
     RedisTransactionManager,
     NATSConfig,
     load_nats_config,
     nats_client_factory,
     nats_jetstream_factory,
+    EventPublisherConfig,
+    load_event_publisher_config,
     NATSEventPublisher,
     RedisConfig,
     load_redis_config,
     common_retort_factory,
+    codec_factory,
+    json_backend_factory,
     get_operation_id,
 )
 
@@ -55,6 +60,7 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
         GameMapperConfig: load_game_mapper_config(),
         LockManagerConfig: load_lock_manager_config(),
         NATSConfig: load_nats_config(),
+        EventPublisherConfig: load_event_publisher_config(),
     }
 
     provider.from_context(CentrifugoConfig, scope=Scope.APP)
@@ -62,9 +68,12 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
     provider.from_context(GameMapperConfig, scope=Scope.APP)
     provider.from_context(LockManagerConfig, scope=Scope.APP)
     provider.from_context(NATSConfig, scope=Scope.APP)
+    provider.from_context(EventPublisherConfig, scope=Scope.APP)
 
     provider.provide(get_operation_id, scope=Scope.REQUEST)
     provider.provide(common_retort_factory, scope=Scope.APP)
+    provider.provide(codec_factory, scope=Scope.APP)
+    provider.provide(json_backend_factory, scope=Scope.APP)
 
     provider.provide(httpx_client_factory, scope=Scope.APP)
     provider.provide(redis_factory, scope=Scope.APP)
@@ -72,6 +81,7 @@ def ioc_container_factory(context: dict | None = None) -> AsyncContainer:
     provider.provide(nats_client_factory, scope=Scope.APP)
     provider.provide(nats_jetstream_factory, scope=Scope.APP)
 
+    provider.provide(acquire_and_read_script_factory, scope=Scope.APP)
     provider.provide(lock_manager_factory, scope=Scope.REQUEST)
     provider.provide(GameMapper, scope=Scope.REQUEST, provides=GameGateway)
     provider.provide(
@@ -2,7 +2,7 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
-from typing import Any, cast, overload
+from typing import Any, Iterable, cast, overload
 from uuid import UUID
 
 from connect_four.domain import GameId, GameStateId, UserId, Game
@@ -36,6 +36,13 @@ class FakeGameGateway(GameGateway):
     ) -> Game | None:
         return self._games.get(game_id)
 
+    async def by_ids(self, game_ids: Iterable[GameId]) -> list[Game]:
+        return [
+            self._games[game_id]
+            for game_id in game_ids
+            if game_id in self._games
+        ]
+
     async def list_by_player_ids(
         self,
         player_ids: tuple[UserId, UserId],
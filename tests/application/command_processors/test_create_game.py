@@ -20,6 +20,8 @@ from connect_four.domain import (
     UserId,
     LobbyId,
     PlayerState,
+    EMPTY_POSITION_HASH,
+    MoveLog,
     Game,
     Player,
     CreateGame,
@@ -103,17 +105,28 @@ async def test_create_game_processor():
     expected_game = Game(
         id=_GAME_ID,
         state_id=ANY_GAME_STATE_ID,
+        state_version=0,
         status=GameStatus.NOT_STARTED,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
         board=board,
         last_move_made_at=None,
         created_at=_CREATED_AT,
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=MoveLog(
+            initial_time_left={
+                ChipType.FIRST: _FIRST_PLAYER_TIME,
+                ChipType.SECOND: _SECOND_PLAYER_TIME,
+            },
+            columns=bytearray(),
+            time_spent=bytearray(),
+        ),
     )
     assert expected_game in game_gateway.games
 
     expected_event = GameCreatedEvent(
         game_id=_GAME_ID,
+        game_state_version=0,
         lobby_id=_LOBBY_ID,
         board=board,
         players=players,
@@ -159,12 +172,15 @@ async def test_create_game_processor_errors():
     game = Game(
         id=_GAME_ID,
         state_id=_GAME_STATE_ID,
+        state_version=0,
         status=GameStatus.NOT_STARTED,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
         board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
         last_move_made_at=None,
         created_at=_CREATED_AT,
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=None,
     )
 
     game_gateway = FakeGameGateway([game])
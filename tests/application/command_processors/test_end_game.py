@@ -17,6 +17,8 @@ from connect_four.domain import (
     UserId,
     Game,
     PlayerState,
+    Bitboard,
+    position_hash_factory,
     EndGame,
 )
 from connect_four.application import (
@@ -65,6 +67,7 @@ async def test_end_game_processor():
     game = Game(
         id=_GAME_ID,
         state_id=_GAME_STATE_ID,
+        state_version=0,
         status=GameStatus.IN_PROGRESS,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
@@ -75,6 +78,8 @@ async def test_end_game_processor():
         created_at=(
             datetime.now(timezone.utc) - timedelta(minutes=1, seconds=20)
         ),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
     )
 
     game_gateway = FakeGameGateway([game])
@@ -16,6 +16,8 @@ from connect_four.domain import (
     GameStateId,
     UserId,
     PlayerState,
+    Bitboard,
+    position_hash_factory,
     Game,
     TryToLoseByTime,
 )
@@ -70,6 +72,7 @@ async def test_lose_by_time_processor():
     game = Game(
         id=_GAME_ID,
         state_id=_GAME_STATE_ID,
+        state_version=0,
         status=GameStatus.IN_PROGRESS,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
@@ -80,6 +83,8 @@ async def test_lose_by_time_processor():
         created_at=(
             datetime.now(timezone.utc) - timedelta(minutes=1, seconds=20)
         ),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
     )
 
     game_gateway = FakeGameGateway([game])
@@ -114,6 +119,7 @@ async def test_lose_by_time_processor():
     }
     expected_event = GameEndedEvent(
         game_id=_GAME_ID,
+        game_state_version=1,
         chip_location=None,
         players=updated_players,
         reason=GameEndReason.LOSS_BY_TIME,
@@ -142,3 +148,68 @@ async def test_lose_by_time_processor():
         centrifugo_client.publications[f"games:{_GAME_ID.hex}"]
         == expected_centrifugo_publication
     )
+
+
+async def test_lose_by_time_processor_ignores_ended_game():
+    players = {
+        _FIRST_PLAYER_ID: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=_TIME_LEFT_FOR_FIRST_PLAYER,
+            communication_type=_FIRST_PLAYER_COMMUNICATION_TYPE,
+        ),
+        _SECOND_PLAYER_ID: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=_TIME_LEFT_FOR_SECOND_PLAYER,
+            communication_type=_SECOND_PLAYER_COMMUNICATION_TYPE,
+        ),
+    }
+    board: list[list[ChipType | None]] = [
+        [None] * 6,
+        [None] * 6,
+        [None] * 6,
+        [ChipType.SECOND] + [None] * 5,
+        [ChipType.SECOND] + [None] * 5,
+        [ChipType.SECOND] + [None] * 5,
+        [ChipType.FIRST] * 4 + [None] * 2,
+    ]
+
+    game = Game(
+        id=_GAME_ID,
+        state_id=_GAME_STATE_ID,
+        state_version=7,
+        status=GameStatus.ENDED,
+        players=players,
+        current_turn=_FIRST_PLAYER_ID,
+        board=board,
+        last_move_made_at=datetime.now(timezone.utc),
+        created_at=(
+            datetime.now(timezone.utc) - timedelta(minutes=1, seconds=20)
+        ),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
+    )
+
+    game_gateway = FakeGameGateway([game])
+    event_publisher = FakeEventPublisher()
+    centrifugo_client = FakeCentrifugoClient()
+
+    command = TryToLoseByTimeCommand(
+        game_id=_GAME_ID,
+        game_state_id=_GAME_STATE_ID,
+    )
+    command_processor = TryToLoseByTimeProcessor(
+        try_to_lose_by_time=TryToLoseByTime(),
+        game_gateway=game_gateway,
+        event_publisher=event_publisher,
+        centrifugo_client=centrifugo_client,
+        transaction_manager=AsyncMock(),
+    )
+
+    await command_processor.process(command)
+
+    assert not event_publisher.events
+    assert not centrifugo_client.publications
+    assert game.state_version == 7
+    assert game.players[_FIRST_PLAYER_ID].time_left == (
+        _TIME_LEFT_FOR_FIRST_PLAYER
+    )
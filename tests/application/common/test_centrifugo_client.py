@@ -0,0 +1,59 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import timedelta
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    ChipType,
+    CommunicatonType,
+    GameId,
+    LobbyId,
+    UserId,
+    PlayerState,
+)
+from connect_four.application import (
+    centrifugo_lobby_channel_factory,
+    centrifugo_game_channel_factory,
+    centrifugo_players_factory,
+)
+
+
+def test_centrifugo_channels():
+    game_id = GameId(uuid7())
+    lobby_id = LobbyId(uuid7())
+
+    assert centrifugo_game_channel_factory(game_id) == f"games:{game_id.hex}"
+    assert centrifugo_lobby_channel_factory(lobby_id) == (
+        f"lobbies:{lobby_id.hex}"
+    )
+
+
+def test_centrifugo_players():
+    first_player_id = UserId(uuid7())
+    second_player_id = UserId(uuid7())
+    players = {
+        first_player_id: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=timedelta(seconds=42, milliseconds=500),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player_id: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.OTHER,
+        ),
+    }
+
+    assert centrifugo_players_factory(players) == {
+        first_player_id.hex: {
+            "chip_type": "first",
+            "time_left": 42.5,
+        },
+        second_player_id.hex: {
+            "chip_type": "second",
+            "time_left": 60.0,
+        },
+    }
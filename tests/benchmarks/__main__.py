@@ -0,0 +1,97 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+"""
+Runs benchmarks and compares them with baselines stored in
+`baselines.json`. Exits with non-zero code if any benchmark
+is slower than its baseline by more than the threshold.
+
+    python -m tests.benchmarks [--filter PREFIX] [--threshold 0.5]
+    python -m tests.benchmarks --update
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .runner import (
+    run_benchmarks,
+    load_baselines,
+    save_baselines,
+    find_regressions,
+)
+from .domain import DOMAIN_BENCHMARKS
+from .serialization import SERIALIZATION_BENCHMARKS
+from .json_backends import JSON_BACKEND_BENCHMARKS
+
+
+_BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+_BENCHMARKS = (
+    *DOMAIN_BENCHMARKS,
+    *SERIALIZATION_BENCHMARKS,
+    *JSON_BACKEND_BENCHMARKS,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Run only benchmarks whose names start with the prefix.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Allowed slowdown relative to baseline, 0.5 is 50%%.",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Store results as new baselines instead of comparing.",
+    )
+    args = parser.parse_args()
+
+    benchmarks = [
+        benchmark
+        for benchmark in _BENCHMARKS
+        if benchmark.name.startswith(args.filter)
+    ]
+    results = run_benchmarks(benchmarks)
+    baselines = load_baselines(_BASELINES_PATH)
+
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline:
+            change = f"{result.relative_time / baseline - 1:+.0%}"
+        else:
+            change = "no baseline"
+
+        sys.stdout.write(
+            f"{result.name:<40} {result.nanoseconds / 1000:>9.2f} us"
+            f"  {change}\n",
+        )
+
+    if args.update:
+        save_baselines(_BASELINES_PATH, results)
+        return 0
+
+    regressions = find_regressions(
+        results=results,
+        baselines=baselines,
+        threshold=args.threshold,
+    )
+    for result, baseline in regressions:
+        sys.stdout.write(
+            f"Regression: {result.name} takes "
+            f"{result.relative_time / baseline:.2f}x of its baseline.\n",
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("DOMAIN_BENCHMARKS", "mid_game")
+
+import random
+from datetime import timedelta
+from functools import cache
+from typing import Callable
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    GameStatus,
+    CommunicatonType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    GameId,
+    GameStateId,
+    UserId,
+    Game,
+    CompactGame,
+    Draw,
+    CreateGame,
+    EndGame,
+    MakeMove,
+    Player,
+    TryToLoseByTime,
+)
+from connect_four.infrastructure import VirtualClock
+from .runner import Benchmark
+
+
+_CLOCK = VirtualClock()
+
+_FIRST_PLAYER = Player(
+    id=UserId(uuid7()),
+    time=timedelta(minutes=1),
+    communication_type=CommunicatonType.CENTRIFUGO,
+)
+_SECOND_PLAYER = Player(
+    id=UserId(uuid7()),
+    time=timedelta(minutes=1),
+    communication_type=CommunicatonType.CENTRIFUGO,
+)
+
+
+def _game_after(columns: list[int]) -> Game:
+    game = CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=_FIRST_PLAYER,
+        second_player=_SECOND_PLAYER,
+        created_at=_CLOCK.now(),
+    )
+    make_move = MakeMove(_CLOCK)
+
+    for column in columns:
+        make_move(
+            game=game,
+            current_player_id=game.current_turn,
+            column=column,
+        )
+
+    return game
+
+
+def _copies(game: Game, count: int) -> list[Game]:
+    compact_game = CompactGame.from_game(game)
+    return [compact_game.to_game() for _ in range(count)]
+
+
+@cache
+def _drawn_game_columns() -> list[int]:
+    """
+    Returns columns of a game that ends in a draw, found by
+    playing random games with a fixed seed.
+    """
+    random_ = random.Random(0)
+
+    while True:
+        game = _game_after([])
+        make_move = MakeMove(_CLOCK)
+        columns = []
+
+        while game.status != GameStatus.ENDED:
+            column = random_.choice(
+                [
+                    column
+                    for column, height in enumerate(game.column_heights)
+                    if height < BOARD_ROWS
+                ],
+            )
+            columns.append(column)
+            move_result = make_move(
+                game=game,
+                current_player_id=game.current_turn,
+                column=column,
+            )
+
+        if isinstance(move_result, Draw):
+            return columns
+
+
+def mid_game() -> Game:
+    """
+    Returns new game with 20 chips on the board.
+    """
+    return _game_after(_drawn_game_columns()[:20])
+
+
+def _make_move(
+    *,
+    columns: Callable[[], list[int]],
+    column: Callable[[], int],
+    by_current_player: bool = True,
+) -> Callable[[int], Callable[[], object]]:
+    """
+    Returns `prepare` of a benchmark making a move into `column`
+    in games after moves into `columns`.
+    """
+
+    def prepare(operations: int) -> Callable[[], object]:
+        template = _game_after(columns())
+        games = _copies(template, operations)
+        move_column = column()
+        make_move = MakeMove(_CLOCK)
+
+        if by_current_player:
+            player_id = template.current_turn
+        else:
+            player_id = next(
+                player_id
+                for player_id in template.players
+                if player_id != template.current_turn
+            )
+
+        def run() -> None:
+            for game in games:
+                make_move(
+                    game=game,
+                    current_player_id=player_id,
+                    column=move_column,
+                )
+
+        return run
+
+    return prepare
+
+
+def _create_game(operations: int) -> Callable[[], object]:
+    game_ids = [GameId(uuid7()) for _ in range(operations)]
+    create_game = CreateGame()
+
+    def run() -> None:
+        for game_id in game_ids:
+            create_game(
+                game_id=game_id,
+                first_player=_FIRST_PLAYER,
+                second_player=_SECOND_PLAYER,
+                created_at=_CLOCK.now(),
+            )
+
+    return run
+
+
+def _try_to_lose_by_time(
+    *,
+    stale_state: bool,
+) -> Callable[[int], Callable[[], object]]:
+    def prepare(operations: int) -> Callable[[], object]:
+        template = mid_game()
+        games = _copies(template, operations)
+        try_to_lose_by_time = TryToLoseByTime()
+
+        if stale_state:
+            game_state_id = GameStateId(uuid7())
+        else:
+            game_state_id = template.state_id
+
+        def run() -> None:
+            for game in games:
+                try_to_lose_by_time(game=game, game_state_id=game_state_id)
+
+        return run
+
+    return prepare
+
+
+def _end_game(operations: int) -> Callable[[], object]:
+    template = mid_game()
+    games = _copies(template, operations)
+    end_game = EndGame()
+
+    def run() -> None:
+        for game in games:
+            end_game(game)
+
+    return run
+
+
+DOMAIN_BENCHMARKS = (
+    Benchmark(
+        name="make_move/empty_board",
+        prepare=_make_move(columns=lambda: [], column=lambda: 2),
+    ),
+    Benchmark(
+        name="make_move/mid_game",
+        prepare=_make_move(
+            columns=lambda: _drawn_game_columns()[:20],
+            column=lambda: _drawn_game_columns()[20],
+        ),
+    ),
+    Benchmark(
+        name="make_move/near_full_board",
+        prepare=_make_move(
+            columns=lambda: _drawn_game_columns()[:-2],
+            column=lambda: _drawn_game_columns()[-2],
+        ),
+    ),
+    Benchmark(
+        name="make_move/win",
+        prepare=_make_move(
+            columns=lambda: [0, 1, 0, 1, 0, 1],
+            column=lambda: 0,
+        ),
+    ),
+    Benchmark(
+        name="make_move/draw",
+        prepare=_make_move(
+            columns=lambda: _drawn_game_columns()[:-1],
+            column=lambda: _drawn_game_columns()[-1],
+        ),
+    ),
+    Benchmark(
+        name="make_move/rejected/full_column",
+        prepare=_make_move(
+            columns=lambda: [0] * BOARD_ROWS,
+            column=lambda: 0,
+        ),
+    ),
+    Benchmark(
+        name="make_move/rejected/illegal_column",
+        prepare=_make_move(
+            columns=lambda: [],
+            column=lambda: BOARD_COLUMNS,
+        ),
+    ),
+    Benchmark(
+        name="make_move/rejected/other_player_turn",
+        prepare=_make_move(
+            columns=lambda: [2],
+            column=lambda: 3,
+            by_current_player=False,
+        ),
+    ),
+    Benchmark(name="create_game", prepare=_create_game),
+    Benchmark(
+        name="try_to_lose_by_time",
+        prepare=_try_to_lose_by_time(stale_state=False),
+    ),
+    Benchmark(
+        name="try_to_lose_by_time/stale_state",
+        prepare=_try_to_lose_by_time(stale_state=True),
+    ),
+    Benchmark(name="end_game", prepare=_end_game),
+)
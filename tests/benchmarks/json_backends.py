@@ -0,0 +1,116 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("JSON_BACKEND_BENCHMARKS",)
+
+from importlib.util import find_spec
+from typing import Any, Callable
+
+from connect_four.domain import ChipLocation, Game
+from connect_four.application import MoveAcceptedEvent
+from connect_four.infrastructure import (
+    JSONBackend,
+    StdlibJSONBackend,
+    OrjsonJSONBackend,
+    common_retort_factory,
+    codec_factory,
+)
+from .domain import mid_game
+from .runner import Benchmark
+
+
+_COMMON_RETORT = common_retort_factory()
+_CODEC = codec_factory(_COMMON_RETORT)
+
+
+def _json_backends() -> dict[str, Callable[[], JSONBackend]]:
+    json_backends: dict[str, Callable[[], JSONBackend]] = {
+        "stdlib": StdlibJSONBackend,
+    }
+    if find_spec("orjson"):
+        json_backends["orjson"] = OrjsonJSONBackend
+
+    return json_backends
+
+
+def _game_as_dict() -> dict[str, Any]:
+    return _COMMON_RETORT.dump(mid_game(), Game)
+
+
+def _event_as_dict() -> dict[str, Any]:
+    game = mid_game()
+    return _CODEC.dump_event(
+        MoveAcceptedEvent(
+            game_id=game.id,
+            game_state_version=game.state_version,
+            chip_location=ChipLocation(column=0, row=0),
+            players=game.players,
+            current_turn=game.current_turn,
+        ),
+    )
+
+
+def _dumps(
+    *,
+    json_backend_factory: Callable[[], JSONBackend],
+    data_factory: Callable[[], dict[str, Any]],
+) -> Callable[[int], Callable[[], object]]:
+    def prepare(operations: int) -> Callable[[], object]:
+        json_backend = json_backend_factory()
+        data = data_factory()
+
+        def run() -> None:
+            for _ in range(operations):
+                json_backend.dumps(data)
+
+        return run
+
+    return prepare
+
+
+def _loads(
+    *,
+    json_backend_factory: Callable[[], JSONBackend],
+    data_factory: Callable[[], dict[str, Any]],
+) -> Callable[[int], Callable[[], object]]:
+    def prepare(operations: int) -> Callable[[], object]:
+        json_backend = json_backend_factory()
+        data = json_backend.dumps(data_factory())
+
+        def run() -> None:
+            for _ in range(operations):
+                json_backend.loads(data)
+
+        return run
+
+    return prepare
+
+
+JSON_BACKEND_BENCHMARKS = tuple(
+    benchmark
+    for name, json_backend_factory in _json_backends().items()
+    for benchmark in (
+        Benchmark(
+            name=f"json/{name}/dumps_game",
+            prepare=_dumps(
+                json_backend_factory=json_backend_factory,
+                data_factory=_game_as_dict,
+            ),
+        ),
+        Benchmark(
+            name=f"json/{name}/loads_game",
+            prepare=_loads(
+                json_backend_factory=json_backend_factory,
+                data_factory=_game_as_dict,
+            ),
+        ),
+        Benchmark(
+            name=f"json/{name}/dumps_event",
+            prepare=_dumps(
+                json_backend_factory=json_backend_factory,
+                data_factory=_event_as_dict,
+            ),
+        ),
+    )
+)
@@ -0,0 +1,190 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = (
+    "Benchmark",
+    "BenchmarkResult",
+    "run_benchmarks",
+    "load_baselines",
+    "save_baselines",
+    "find_regressions",
+)
+
+import gc
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+from time import perf_counter_ns
+from typing import Callable, Iterable
+
+
+# Every benchmark is run this many times after a few warmup runs,
+# each run followed by a run of the calibration loop, and the
+# median ratio of the two is taken. Machine slowing down or
+# speeding up during a run affects both of them, and the median
+# doesn't depend on a single lucky or unlucky run.
+_WARMUP = 2
+_REPEAT = 11
+
+# Runs shorter than this are mostly timer and scheduler noise, so
+# operations of short benchmarks are multiplied until a run takes
+# at least this long.
+_MIN_RUN_NANOSECONDS = 5_000_000
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Benchmark:
+    """
+    Parameters:
+
+        `prepare`: Returns function performing the benchmarked
+            operation the specified number of times. State the
+            operation needs, e.g. games to make moves in, is
+            created by `prepare`, so it is not measured.
+
+        `operations`: Minimum number of operations of a run,
+            multiplied if a run is shorter than
+            `_MIN_RUN_NANOSECONDS`.
+    """
+
+    name: str
+    prepare: Callable[[int], Callable[[], object]]
+    operations: int = 500
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BenchmarkResult:
+    """
+    Parameters:
+
+        `nanoseconds`: Time of one operation.
+
+        `relative_time`: Time of one operation divided by time
+            of the calibration loop, which makes results comparable
+            across machines of different speed.
+    """
+
+    name: str
+    nanoseconds: float
+    relative_time: float
+
+
+def _calibration(operations: int) -> Callable[[], object]:
+    def run() -> int:
+        total = 0
+        for i in range(operations * 100):
+            total += i * i
+        return total
+
+    return run
+
+
+_CALIBRATION = Benchmark(name="calibration", prepare=_calibration)
+
+
+def _time_run(benchmark: Benchmark, operations: int) -> int:
+    run = benchmark.prepare(operations)
+
+    # Like `timeit`, collection is disabled while measuring,
+    # so garbage of previous runs doesn't add to the time.
+    gc.disable()
+    try:
+        started_at = perf_counter_ns()
+        run()
+        return perf_counter_ns() - started_at
+    finally:
+        gc.enable()
+
+
+def _operations(benchmark: Benchmark) -> int:
+    """
+    Returns number of operations a run of the benchmark should
+    perform to take at least `_MIN_RUN_NANOSECONDS`.
+    """
+    operations = benchmark.operations
+    while _time_run(benchmark, operations) < _MIN_RUN_NANOSECONDS:
+        operations *= 2
+
+    return operations
+
+
+def _measure(
+    benchmark: Benchmark,
+    calibration_operations: int,
+) -> BenchmarkResult:
+    operations = _operations(benchmark)
+
+    timings = []
+    relative_timings = []
+    for _ in range(_WARMUP + _REPEAT):
+        nanoseconds = _time_run(benchmark, operations) / operations
+        calibration_nanoseconds = (
+            _time_run(_CALIBRATION, calibration_operations)
+            / calibration_operations
+        )
+        timings.append(nanoseconds)
+        relative_timings.append(nanoseconds / calibration_nanoseconds)
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        nanoseconds=median(timings[_WARMUP:]),
+        relative_time=median(relative_timings[_WARMUP:]),
+    )
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark],
+) -> list[BenchmarkResult]:
+    calibration_operations = _operations(_CALIBRATION)
+    return [
+        _measure(benchmark, calibration_operations) for benchmark in benchmarks
+    ]
+
+
+def load_baselines(path: Path) -> dict[str, float]:
+    """
+    Returns relative times of benchmarks by name.
+    """
+    if not path.exists():
+        return {}
+
+    with path.open() as file:
+        return json.load(file)
+
+
+def save_baselines(
+    path: Path,
+    results: Iterable[BenchmarkResult],
+) -> None:
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.name] = round(result.relative_time, 4)
+
+    with path.open("w") as file:
+        json.dump(dict(sorted(baselines.items())), file, indent=4)
+        file.write("\n")
+
+
+def find_regressions(
+    *,
+    results: Iterable[BenchmarkResult],
+    baselines: dict[str, float],
+    threshold: float,
+) -> list[tuple[BenchmarkResult, float]]:
+    """
+    Returns results whose relative time exceeds their baseline
+    by more than `threshold`, e.g. 0.5 for 50 percent, along
+    with the baselines. Benchmarks without baselines are skipped.
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.name)
+        if baseline is None:
+            continue
+
+        if result.relative_time > baseline * (1 + threshold):
+            regressions.append((result, baseline))
+
+    return regressions
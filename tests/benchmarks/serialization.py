@@ -0,0 +1,148 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+__all__ = ("SERIALIZATION_BENCHMARKS",)
+
+import json
+from typing import Callable
+
+from connect_four.domain import ChipLocation, Game
+from connect_four.application import MoveAcceptedEvent, CreateGameCommand
+from connect_four.infrastructure import common_retort_factory, codec_factory
+from connect_four.infrastructure.database.game_binary_format import (
+    dump_game_binary,
+    load_game_binary,
+)
+from .domain import mid_game
+from .runner import Benchmark
+
+
+_COMMON_RETORT = common_retort_factory()
+_CODEC = codec_factory(_COMMON_RETORT)
+
+
+def _calls(
+    call_factory: Callable[[], Callable[[], object]],
+) -> Callable[[int], Callable[[], object]]:
+    def prepare(operations: int) -> Callable[[], object]:
+        call = call_factory()
+
+        def run() -> None:
+            for _ in range(operations):
+                call()
+
+        return run
+
+    return prepare
+
+
+def _load_game(*, with_codec: bool) -> Callable[[], object]:
+    game_as_dict = _COMMON_RETORT.dump(mid_game(), Game)
+
+    if with_codec:
+        return lambda: _CODEC.load_game(game_as_dict)
+    return lambda: _COMMON_RETORT.load(game_as_dict, Game)
+
+
+def _load_command(*, with_codec: bool) -> Callable[[], object]:
+    game = mid_game()
+    first_player_id, second_player_id = game.players
+    command_as_dict = {
+        "game_id": game.id.hex,
+        "lobby_id": game.id.hex,
+        "first_player": {
+            "id": first_player_id.hex,
+            "time": "PT3M",
+            "communication_type": "centrifugo",
+        },
+        "second_player": {
+            "id": second_player_id.hex,
+            "time": "PT3M",
+            "communication_type": "other",
+        },
+        "created_at": game.created_at.isoformat(),
+        "operation_id": game.id.hex,
+    }
+
+    if with_codec:
+        return lambda: _CODEC.load_command(command_as_dict, CreateGameCommand)
+    return lambda: _COMMON_RETORT.load(command_as_dict, CreateGameCommand)
+
+
+def _dump_event(*, with_codec: bool) -> Callable[[], object]:
+    game = mid_game()
+    event = MoveAcceptedEvent(
+        game_id=game.id,
+        game_state_version=game.state_version,
+        chip_location=ChipLocation(column=0, row=0),
+        players=game.players,
+        current_turn=game.current_turn,
+    )
+
+    if with_codec:
+        return lambda: _CODEC.dump_event(event)
+    return lambda: _COMMON_RETORT.dump(event)
+
+
+def _load_stored_game(*, binary: bool) -> Callable[[], object]:
+    game = mid_game()
+
+    if binary:
+        game_as_bytes = dump_game_binary(game)
+        return lambda: load_game_binary(game_as_bytes)
+
+    game_as_json = json.dumps(_COMMON_RETORT.dump(game, Game))
+    return lambda: _CODEC.load_game(json.loads(game_as_json))
+
+
+def _dump_stored_game(*, binary: bool) -> Callable[[], object]:
+    game = mid_game()
+
+    if binary:
+        return lambda: dump_game_binary(game)
+    return lambda: json.dumps(_COMMON_RETORT.dump(game, Game))
+
+
+SERIALIZATION_BENCHMARKS = (
+    Benchmark(
+        name="serialization/load_game/retort",
+        prepare=_calls(lambda: _load_game(with_codec=False)),
+    ),
+    Benchmark(
+        name="serialization/load_game/codec",
+        prepare=_calls(lambda: _load_game(with_codec=True)),
+    ),
+    Benchmark(
+        name="serialization/load_command/retort",
+        prepare=_calls(lambda: _load_command(with_codec=False)),
+    ),
+    Benchmark(
+        name="serialization/load_command/codec",
+        prepare=_calls(lambda: _load_command(with_codec=True)),
+    ),
+    Benchmark(
+        name="serialization/dump_event/retort",
+        prepare=_calls(lambda: _dump_event(with_codec=False)),
+    ),
+    Benchmark(
+        name="serialization/dump_event/codec",
+        prepare=_calls(lambda: _dump_event(with_codec=True)),
+    ),
+    Benchmark(
+        name="serialization/load_stored_game/json",
+        prepare=_calls(lambda: _load_stored_game(binary=False)),
+    ),
+    Benchmark(
+        name="serialization/load_stored_game/binary",
+        prepare=_calls(lambda: _load_stored_game(binary=True)),
+    ),
+    Benchmark(
+        name="serialization/dump_stored_game/json",
+        prepare=_calls(lambda: _dump_stored_game(binary=False)),
+    ),
+    Benchmark(
+        name="serialization/dump_stored_game/binary",
+        prepare=_calls(lambda: _dump_stored_game(binary=True)),
+    ),
+)
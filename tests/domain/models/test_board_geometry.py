@@ -0,0 +1,82 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+import pytest
+
+from connect_four.domain import (
+    ChipType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    CHIPS_TO_WIN,
+    Bitboard,
+    get_board_geometry,
+    DEFAULT_BOARD_GEOMETRY,
+)
+
+
+@pytest.mark.parametrize(
+    ["rows", "columns", "chips_to_win", "expected_line_count"],
+    [
+        [BOARD_ROWS, BOARD_COLUMNS, CHIPS_TO_WIN, 69],
+        [6, 7, 4, 69],
+        [8, 9, 5, 116],
+        [4, 4, 4, 10],
+    ],
+)
+def test_lines(
+    rows: int,
+    columns: int,
+    chips_to_win: int,
+    expected_line_count: int,
+):
+    geometry = get_board_geometry(
+        rows=rows,
+        columns=columns,
+        chips_to_win=chips_to_win,
+    )
+
+    assert len(geometry.lines) == expected_line_count
+    assert len(set(geometry.lines)) == expected_line_count
+
+    for line in geometry.lines:
+        assert line.bit_count() == chips_to_win
+        assert not line & ~geometry.full_board_mask
+
+    for cell, cell_lines in enumerate(geometry.lines_by_cell):
+        for line in cell_lines:
+            assert line >> cell & 1
+
+
+def test_geometry_is_cached():
+    geometry = get_board_geometry(
+        rows=BOARD_ROWS,
+        columns=BOARD_COLUMNS,
+        chips_to_win=CHIPS_TO_WIN,
+    )
+    assert geometry is DEFAULT_BOARD_GEOMETRY
+
+
+def test_line_through_placed_chip():
+    geometry = get_board_geometry(rows=8, columns=9, chips_to_win=5)
+    bitboard = Bitboard.empty(geometry)
+
+    #  Diagonal ↙↗ from column 2 to column 6
+    for column in range(2, 7):
+        for _ in range(column - 2):
+            bitboard.drop_chip(column=column, chip_type=ChipType.SECOND)
+
+    for column in (2, 3, 5, 6):
+        cell = bitboard.drop_chip(column=column, chip_type=ChipType.FIRST)
+        assert not bitboard.has_line_through(
+            cell=cell,
+            chip_type=ChipType.FIRST,
+        )
+
+    assert not bitboard.has_line(ChipType.FIRST)
+
+    cell = bitboard.drop_chip(column=4, chip_type=ChipType.FIRST)
+
+    assert bitboard.has_line_through(cell=cell, chip_type=ChipType.FIRST)
+    assert bitboard.has_line(ChipType.FIRST)
+    assert not bitboard.has_line(ChipType.SECOND)
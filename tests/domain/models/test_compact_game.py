@@ -0,0 +1,67 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import timedelta
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    CommunicatonType,
+    GameId,
+    UserId,
+    CompactGame,
+    CreateGame,
+    MakeMove,
+    Player,
+)
+from connect_four.infrastructure import VirtualClock
+
+
+def test_compact_game_round_trip():
+    clock = VirtualClock()
+    first_player = Player(
+        id=UserId(uuid7()),
+        time=timedelta(minutes=1),
+        communication_type=CommunicatonType.CENTRIFUGO,
+    )
+    second_player = Player(
+        id=UserId(uuid7()),
+        time=timedelta(minutes=2),
+        communication_type=CommunicatonType.OTHER,
+    )
+    game = CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=first_player,
+        second_player=second_player,
+        created_at=clock.now(),
+    )
+    assert CompactGame.from_game(game).to_game() == game
+
+    make_move = MakeMove(clock)
+    for column in (2, 3, 3, 0, 5, 3):
+        clock.advance(timedelta(seconds=1, microseconds=1))
+        make_move(
+            game=game,
+            current_player_id=game.current_turn,
+            column=column,
+        )
+
+    compact_game = CompactGame.from_game(game)
+    restored_game = compact_game.to_game()
+
+    assert restored_game == game
+    assert restored_game.bitboard == game.bitboard
+
+    assert compact_game.id == game.id
+    assert compact_game.state_id == game.state_id
+    assert compact_game.status == game.status
+    assert compact_game.players == game.players
+    assert compact_game.current_turn == game.current_turn
+    assert compact_game.board == game.board
+    assert compact_game.move_count == game.move_count
+    assert compact_game.last_move_made_at == game.last_move_made_at
+    assert compact_game.created_at == game.created_at
+
+    restored_game.move_log.columns.append(0)  # type: ignore
+    assert compact_game.to_game() == game
@@ -0,0 +1,36 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import timedelta
+
+from connect_four.domain import ChipType, MoveLog
+
+
+def test_move_log():
+    moves = [
+        (3, timedelta(seconds=0)),
+        (2, timedelta(milliseconds=127)),
+        (3, timedelta(milliseconds=128)),
+        (5, timedelta(seconds=5, milliseconds=1)),
+        (1, timedelta(minutes=1, milliseconds=1)),
+        (0, timedelta(hours=10)),
+    ]
+    move_log = MoveLog(
+        initial_time_left={
+            ChipType.FIRST: timedelta(hours=12),
+            ChipType.SECOND: timedelta(hours=12),
+        },
+        columns=bytearray(),
+        time_spent=bytearray(),
+    )
+
+    for column, time_spent in moves:
+        move_log.append(column=column, time_spent=time_spent)
+
+    assert list(move_log) == moves
+    assert len(move_log.columns) == len(moves)
+    assert len(move_log.time_spent) == 1 + 1 + 2 + 2 + 3 + 4
+
+    move_log.append(column=4, time_spent=timedelta(microseconds=1999))
+    assert list(move_log)[-1] == (4, timedelta(milliseconds=1))
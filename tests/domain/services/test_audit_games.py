@@ -0,0 +1,111 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    GameStatus,
+    ChipType,
+    CommunicatonType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    GameId,
+    GameStateId,
+    UserId,
+    PlayerState,
+    Bitboard,
+    position_hash_factory,
+    Game,
+    AuditGames,
+)
+
+
+_FIRST_PLAYER_ID: Final = UserId(uuid7())
+_SECOND_PLAYER_ID: Final = UserId(uuid7())
+
+
+def _game_factory(
+    *,
+    status: GameStatus,
+    chips: list[tuple[int, ChipType]],
+) -> Game:
+    board: list[list[ChipType | None]] = [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)
+    ]
+    column_heights = [0] * BOARD_COLUMNS
+
+    for column, chip_type in chips:
+        board[BOARD_ROWS - 1 - column_heights[column]][column] = chip_type
+        column_heights[column] += 1
+
+    return Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=status,
+        players={
+            _FIRST_PLAYER_ID: PlayerState(
+                chip_type=ChipType.FIRST,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+            _SECOND_PLAYER_ID: PlayerState(
+                chip_type=ChipType.SECOND,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+        },
+        current_turn=_FIRST_PLAYER_ID,
+        board=board,
+        last_move_made_at=None,
+        created_at=datetime.now(timezone.utc),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
+    )
+
+
+def test_audit_games():
+    vertical_line = [(0, ChipType.FIRST), (1, ChipType.SECOND)] * 3 + [
+        (0, ChipType.FIRST),
+    ]
+    diagonal_line = [
+        (0, ChipType.SECOND),
+        (1, ChipType.FIRST),
+        (1, ChipType.SECOND),
+        (2, ChipType.FIRST),
+        (2, ChipType.FIRST),
+        (2, ChipType.SECOND),
+        (3, ChipType.FIRST),
+        (3, ChipType.FIRST),
+        (3, ChipType.FIRST),
+        (3, ChipType.SECOND),
+    ]
+    both_lines = [
+        (0, ChipType.FIRST),
+        (1, ChipType.SECOND),
+    ] * 4
+
+    consistent_games = [
+        _game_factory(status=GameStatus.NOT_STARTED, chips=[]),
+        _game_factory(
+            status=GameStatus.IN_PROGRESS,
+            chips=vertical_line[:-1],
+        ),
+        _game_factory(status=GameStatus.ENDED, chips=vertical_line),
+        _game_factory(status=GameStatus.ENDED, chips=diagonal_line),
+        _game_factory(status=GameStatus.ENDED, chips=vertical_line[:3]),
+    ]
+    inconsistent_games = [
+        _game_factory(status=GameStatus.IN_PROGRESS, chips=vertical_line),
+        _game_factory(status=GameStatus.IN_PROGRESS, chips=diagonal_line),
+        _game_factory(status=GameStatus.NOT_STARTED, chips=vertical_line[:1]),
+        _game_factory(status=GameStatus.ENDED, chips=both_lines),
+    ]
+
+    flagged_game_ids = AuditGames()(consistent_games + inconsistent_games)
+
+    assert flagged_game_ids == [game.id for game in inconsistent_games]
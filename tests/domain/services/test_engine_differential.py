@@ -0,0 +1,332 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+"""
+Differential harness for the move engine. Random sequences of legal
+and illegal moves are run through a straightforward reference engine,
+`MakeMove` and `MakeMove.make_many`, which must agree on the result
+of every move and on the final state of every game.
+
+The test runs a few hundred games, set `ENGINE_FUZZ_GAMES` to run
+more. To compare throughput of the engines, run the module:
+
+    python -m tests.domain.services.test_engine_differential 100000
+"""
+
+import os
+import random
+import sys
+from dataclasses import dataclass
+from datetime import timedelta
+from time import perf_counter
+from typing import Final
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    GameStatus,
+    ChipType,
+    MoveRejectionReason,
+    MoveResultCode,
+    CommunicatonType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    GameId,
+    UserId,
+    BitboardBatch,
+    position_hash_factory,
+    Game,
+    MoveAccepted,
+    MoveRejected,
+    Win,
+    Draw,
+    MoveResult,
+    CreateGame,
+    MakeMove,
+    Player,
+)
+from connect_four.infrastructure import VirtualClock
+
+
+_DEFAULT_GAME_COUNT: Final = 300
+
+# Every game gets more moves than there are cells, so most games
+# are played until they end and then receive rejected moves.
+_MOVES_PER_GAME: Final = BOARD_ROWS * BOARD_COLUMNS + 8
+
+_DIRECTIONS: Final = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _Move:
+    column: int
+    by_current_player: bool
+
+
+@dataclass(slots=True, kw_only=True)
+class _ReferenceGame:
+    board: list[list[ChipType | None]]
+    status: GameStatus
+    current_chip_type: ChipType
+
+
+def _reference_make_move(
+    game: _ReferenceGame,
+    move: _Move,
+) -> tuple[type[MoveResult], object]:
+    """
+    Makes the move by scanning the board from the placed chip,
+    the way the engine did before bitboards were introduced.
+    Returns type of the result and either the chip location
+    as (row, column) or the rejection reason.
+    """
+    if game.status == GameStatus.ENDED:
+        return MoveRejected, MoveRejectionReason.GAME_IS_ENDED
+
+    if not move.by_current_player:
+        return MoveRejected, MoveRejectionReason.OTHER_PLAYER_TURN
+
+    if not 0 <= move.column < BOARD_COLUMNS:
+        return MoveRejected, MoveRejectionReason.ILLEGAL_MOVE
+
+    for row in range(BOARD_ROWS - 1, -1, -1):
+        if game.board[row][move.column] is None:
+            break
+    else:
+        return MoveRejected, MoveRejectionReason.ILLEGAL_MOVE
+
+    chip_type = game.current_chip_type
+    game.board[row][move.column] = chip_type
+    chip_location = (row, move.column)
+
+    if game.status == GameStatus.NOT_STARTED:
+        game.status = GameStatus.IN_PROGRESS
+        game.current_chip_type = _other_chip_type(chip_type)
+        return MoveAccepted, chip_location
+
+    for row_delta, column_delta in _DIRECTIONS:
+        count = -1
+        for sign in (1, -1):
+            current_row, current_column = row, move.column
+            while (
+                0 <= current_row < BOARD_ROWS
+                and 0 <= current_column < BOARD_COLUMNS
+                and game.board[current_row][current_column] == chip_type
+            ):
+                count += 1
+                current_row += row_delta * sign
+                current_column += column_delta * sign
+
+        if count >= 4:
+            game.status = GameStatus.ENDED
+            return Win, chip_location
+
+    if all(cell is not None for board_row in game.board for cell in board_row):
+        game.status = GameStatus.ENDED
+        return Draw, chip_location
+
+    game.current_chip_type = _other_chip_type(chip_type)
+    return MoveAccepted, chip_location
+
+
+def _other_chip_type(chip_type: ChipType) -> ChipType:
+    if chip_type == ChipType.FIRST:
+        return ChipType.SECOND
+    return ChipType.FIRST
+
+
+def _random_moves(random_: random.Random) -> list[_Move]:
+    moves = []
+    for _ in range(_MOVES_PER_GAME):
+        if random_.random() < 0.05:
+            column = random_.choice((-1, BOARD_COLUMNS))
+        else:
+            column = random_.randrange(BOARD_COLUMNS)
+
+        moves.append(
+            _Move(
+                column=column,
+                by_current_player=random_.random() >= 0.05,
+            ),
+        )
+
+    return moves
+
+
+def _new_game(clock: VirtualClock) -> Game:
+    return CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        created_at=clock.now(),
+    )
+
+
+def _result_code(result_type: type[MoveResult]) -> MoveResultCode:
+    if result_type is Win:
+        return MoveResultCode.WIN
+    if result_type is Draw:
+        return MoveResultCode.DRAW
+    if result_type is MoveRejected:
+        return MoveResultCode.REJECTED
+    return MoveResultCode.ACCEPTED
+
+
+def run_differential(*, game_count: int, seed: int) -> dict[str, float]:
+    """
+    Runs `game_count` random games through every engine, asserts
+    that the engines agree and returns moves per second of each
+    engine.
+    """
+    random_ = random.Random(seed)
+    move_sequences = [_random_moves(random_) for _ in range(game_count)]
+    move_count = game_count * _MOVES_PER_GAME
+
+    reference_games = [
+        _ReferenceGame(
+            board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+            status=GameStatus.NOT_STARTED,
+            current_chip_type=ChipType.FIRST,
+        )
+        for _ in range(game_count)
+    ]
+    reference_results = []
+
+    started_at = perf_counter()
+    for reference_game, moves in zip(
+        reference_games,
+        move_sequences,
+        strict=True,
+    ):
+        reference_results.append(
+            [_reference_make_move(reference_game, move) for move in moves],
+        )
+    reference_time = perf_counter() - started_at
+
+    clock = VirtualClock()
+    make_move = MakeMove(clock)
+    games = [_new_game(clock) for _ in range(game_count)]
+    results = []
+
+    started_at = perf_counter()
+    for game, moves in zip(games, move_sequences, strict=True):
+        game_results = []
+        for move in moves:
+            if move.by_current_player:
+                player_id = game.current_turn
+            else:
+                player_id = next(
+                    player_id
+                    for player_id in game.players
+                    if player_id != game.current_turn
+                )
+
+            game_results.append(
+                make_move(
+                    game=game,
+                    current_player_id=player_id,
+                    column=move.column,
+                ),
+            )
+        results.append(game_results)
+    make_move_time = perf_counter() - started_at
+
+    for game_results, expected_game_results in zip(
+        results,
+        reference_results,
+        strict=True,
+    ):
+        for result, (expected_type, expected_detail) in zip(
+            game_results,
+            expected_game_results,
+            strict=True,
+        ):
+            assert type(result) is expected_type
+            if isinstance(result, MoveRejected):
+                assert result.reason == expected_detail
+            else:
+                chip_location = result.chip_location  # type: ignore
+                assert (
+                    chip_location.row,
+                    chip_location.column,
+                ) == expected_detail
+
+    for game, reference_game in zip(games, reference_games, strict=True):
+        assert game.board == reference_game.board
+        assert game.board == game.bitboard.to_board()
+        assert game.status == reference_game.status
+        assert game.move_count == sum(
+            cell is not None for row in game.board for cell in row
+        )
+        assert game.position_hash == position_hash_factory(game.bitboard)
+
+    # Moves made by the wrong player are rejected without changing
+    # the game, and the batch engine has no notion of players, so
+    # they are left out.
+    positions = BitboardBatch.empty(game_count)
+    columns_by_step: list[list[int]] = [[] for _ in range(_MOVES_PER_GAME)]
+    expected_codes_by_step: list[list[MoveResultCode]] = [
+        [] for _ in range(_MOVES_PER_GAME)
+    ]
+    for moves, expected_game_results in zip(
+        move_sequences,
+        reference_results,
+        strict=True,
+    ):
+        own_moves = [
+            (move.column, _result_code(expected_type))
+            for move, (expected_type, _) in zip(
+                moves,
+                expected_game_results,
+                strict=True,
+            )
+            if move.by_current_player
+        ]
+        own_moves += [(-1, MoveResultCode.REJECTED)] * (
+            _MOVES_PER_GAME - len(own_moves)
+        )
+        for step, (column, expected_code) in enumerate(own_moves):
+            columns_by_step[step].append(column)
+            expected_codes_by_step[step].append(expected_code)
+
+    started_at = perf_counter()
+    codes_by_step = [
+        make_move.make_many(positions=positions, columns=columns)
+        for columns in columns_by_step
+    ]
+    make_many_time = perf_counter() - started_at
+
+    assert [list(codes) for codes in codes_by_step] == expected_codes_by_step
+    assert positions == BitboardBatch.from_bitboards(
+        game.bitboard for game in games
+    )
+
+    return {
+        "reference": move_count / reference_time,
+        "MakeMove": move_count / make_move_time,
+        "MakeMove.make_many": move_count / make_many_time,
+    }
+
+
+def test_engines_agree():
+    game_count = int(
+        os.getenv("ENGINE_FUZZ_GAMES") or _DEFAULT_GAME_COUNT,
+    )
+    run_differential(game_count=game_count, seed=0)
+
+
+if __name__ == "__main__":
+    game_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    moves_per_second = run_differential(game_count=game_count, seed=0)
+
+    for engine, value in moves_per_second.items():
+        print(f"{engine:>20}: {value:,.0f} moves/s")  # noqa: T201
@@ -0,0 +1,145 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    GameStatus,
+    ChipType,
+    CommunicatonType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
+    GameId,
+    GameStateId,
+    UserId,
+    PlayerState,
+    Bitboard,
+    position_hash_factory,
+    Game,
+    WIN_SCORE,
+    EvaluatePosition,
+)
+
+
+_FIRST_PLAYER_ID: Final = UserId(uuid7())
+_SECOND_PLAYER_ID: Final = UserId(uuid7())
+
+
+def _game_factory(
+    *,
+    chips: list[tuple[int, ChipType]],
+    current_turn: UserId = _FIRST_PLAYER_ID,
+) -> Game:
+    board: list[list[ChipType | None]] = [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)
+    ]
+    column_heights = [0] * BOARD_COLUMNS
+
+    for column, chip_type in chips:
+        board[BOARD_ROWS - 1 - column_heights[column]][column] = chip_type
+        column_heights[column] += 1
+
+    return Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=GameStatus.IN_PROGRESS,
+        players={
+            _FIRST_PLAYER_ID: PlayerState(
+                chip_type=ChipType.FIRST,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+            _SECOND_PLAYER_ID: PlayerState(
+                chip_type=ChipType.SECOND,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+        },
+        current_turn=current_turn,
+        board=board,
+        last_move_made_at=None,
+        created_at=datetime.now(timezone.utc),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
+    )
+
+
+@pytest.mark.parametrize(
+    ["chips", "current_turn", "expected_column", "expected_score"],
+    [
+        [
+            [
+                (0, ChipType.FIRST),
+                (1, ChipType.SECOND),
+                (0, ChipType.FIRST),
+                (1, ChipType.SECOND),
+                (0, ChipType.FIRST),
+                (2, ChipType.SECOND),
+            ],
+            _FIRST_PLAYER_ID,
+            0,
+            WIN_SCORE - 7,
+        ],
+        [
+            [
+                (2, ChipType.FIRST),
+                (2, ChipType.SECOND),
+                (3, ChipType.FIRST),
+                (3, ChipType.SECOND),
+            ],
+            _FIRST_PLAYER_ID,
+            1,
+            WIN_SCORE - 7,
+        ],
+    ],
+)
+def test_forced_win(
+    chips: list[tuple[int, ChipType]],
+    current_turn: UserId,
+    expected_column: int,
+    expected_score: int,
+):
+    game = _game_factory(chips=chips, current_turn=current_turn)
+
+    evaluation = EvaluatePosition()(
+        game=game,
+        time_budget=timedelta(seconds=1),
+    )
+
+    assert evaluation.column == expected_column
+    assert evaluation.score == expected_score
+
+
+def test_threat_is_blocked():
+    game = _game_factory(
+        chips=[
+            (0, ChipType.FIRST),
+            (1, ChipType.SECOND),
+            (0, ChipType.FIRST),
+            (5, ChipType.SECOND),
+            (0, ChipType.FIRST),
+        ],
+        current_turn=_SECOND_PLAYER_ID,
+    )
+
+    evaluation = EvaluatePosition()(
+        game=game,
+        time_budget=timedelta(milliseconds=50),
+    )
+
+    assert evaluation.column == 0
+
+
+def test_search_is_stopped_when_time_budget_runs_out():
+    game = _game_factory(chips=[])
+
+    evaluation = EvaluatePosition()(game=game, time_budget=timedelta())
+
+    assert 0 <= evaluation.column < BOARD_COLUMNS
+    assert 1 <= evaluation.depth < BOARD_ROWS * BOARD_COLUMNS
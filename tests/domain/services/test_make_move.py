@@ -2,6 +2,8 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
+import random
+
 import pytest
 from datetime import datetime, timedelta, timezone
 from typing import Final
@@ -12,18 +14,30 @@ from connect_four.domain import (
     GameStatus,
     ChipType,
     MoveRejectionReason,
+    MoveResultCode,
     CommunicatonType,
+    BOARD_COLUMNS,
+    BOARD_ROWS,
     GameId,
     GameStateId,
     UserId,
     PlayerState,
+    Bitboard,
+    BitboardBatch,
+    EMPTY_POSITION_HASH,
+    position_hash_factory,
+    MoveLog,
     ChipLocation,
     Game,
     Draw,
     Win,
+    LossByTime,
+    MoveAccepted,
     MoveRejected,
     MakeMove,
+    ReplayMoveLog,
 )
+from connect_four.infrastructure import VirtualClock
 
 
 _FIRST_PLAYER_ID: Final = UserId(uuid7())
@@ -124,15 +138,18 @@ def test_draw():
     game = Game(
         id=GameId(uuid7()),
         state_id=GameStateId(uuid7()),
+        state_version=0,
         status=GameStatus.IN_PROGRESS,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
         board=board,
         last_move_made_at=datetime.now(timezone.utc),
         created_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
     )
 
-    move_result = MakeMove()(
+    move_result = MakeMove(VirtualClock())(
         game=game,
         current_player_id=_FIRST_PLAYER_ID,
         column=5,
@@ -144,7 +161,13 @@ def test_draw():
 
 
 @pytest.mark.parametrize(
-    ["board", "column", "expected_chip_location"],
+    [
+        "board",
+        "column",
+        "expected_chip_location",
+        "move_count",
+        "column_heights",
+    ],
     [
         [
             #  x = ChipType.FIRST
@@ -176,6 +199,8 @@ def test_draw():
             ],
             3,
             ChipLocation(column=3, row=6),
+            7,
+            [4, 2, 1, 0, 0, 0],
         ],
         [
             #  x = ChipType.FIRST
@@ -213,6 +238,8 @@ def test_draw():
             ],
             0,
             ChipLocation(column=0, row=2),
+            5,
+            [4, 1, 0, 0, 0, 0],
         ],
         [
             #  x = ChipType.FIRST
@@ -265,6 +292,8 @@ def test_draw():
             ],
             4,
             ChipLocation(column=4, row=2),
+            17,
+            [2, 2, 3, 4, 4, 2],
         ],
     ],
 )
@@ -272,6 +301,8 @@ def test_win(
     board: list[list[ChipType | None]],
     column: int,
     expected_chip_location: ChipLocation,
+    move_count: int,
+    column_heights: list[int],
 ):
     players = {
         _FIRST_PLAYER_ID: PlayerState(
@@ -288,15 +319,20 @@ def test_win(
     game = Game(
         id=GameId(uuid7()),
         state_id=GameStateId(uuid7()),
+        state_version=0,
         status=GameStatus.IN_PROGRESS,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
         board=board,
         last_move_made_at=datetime.now(timezone.utc),
         created_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
     )
+    assert game.move_count == move_count
+    assert game.column_heights == column_heights
 
-    move_result = MakeMove()(
+    move_result = MakeMove(VirtualClock())(
         game=game,
         current_player_id=_FIRST_PLAYER_ID,
         column=column,
@@ -308,7 +344,7 @@ def test_win(
 
 
 @pytest.mark.parametrize(
-    ["board", "column"],
+    ["board", "column", "move_count", "column_heights"],
     [
         [
             #  x = ChipType.FIRST
@@ -344,6 +380,8 @@ def test_win(
                 + [None] * 3,
             ],
             6,
+            3,
+            [1, 1, 1, 0, 0, 0],
         ],
         [
             #  x = ChipType.FIRST
@@ -379,12 +417,16 @@ def test_win(
                 + [None] * 3,
             ],
             0,
+            9,
+            [7, 1, 1, 0, 0, 0],
         ],
     ],
 )
 def test_illegal_move(
     board: list[list[ChipType | None]],
     column: int,
+    move_count: int,
+    column_heights: list[int],
 ):
     players = {
         _FIRST_PLAYER_ID: PlayerState(
@@ -402,15 +444,20 @@ def test_illegal_move(
     game = Game(
         id=GameId(uuid7()),
         state_id=GameStateId(uuid7()),
+        state_version=0,
         status=GameStatus.IN_PROGRESS,
         players=players,
         current_turn=_FIRST_PLAYER_ID,
         board=board,
         last_move_made_at=datetime.now(timezone.utc),
         created_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
     )
+    assert game.move_count == move_count
+    assert game.column_heights == column_heights
 
-    move_result = MakeMove()(
+    move_result = MakeMove(VirtualClock())(
         game=game,
         current_player_id=_FIRST_PLAYER_ID,
         column=column,
@@ -418,3 +465,236 @@ def test_illegal_move(
     expected_move_result = MoveRejected(MoveRejectionReason.ILLEGAL_MOVE)
 
     assert move_result == expected_move_result
+
+
+def test_board_is_kept_in_sync_with_bitboard():
+    players = {
+        _FIRST_PLAYER_ID: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        _SECOND_PLAYER_ID: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+    }
+    game = Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=GameStatus.NOT_STARTED,
+        players=players,
+        current_turn=_FIRST_PLAYER_ID,
+        board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+        last_move_made_at=None,
+        created_at=datetime.now(timezone.utc),
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=MoveLog(
+            initial_time_left={
+                ChipType.FIRST: timedelta(minutes=1),
+                ChipType.SECOND: timedelta(minutes=1),
+            },
+            columns=bytearray(),
+            time_spent=bytearray(),
+        ),
+    )
+    initial_state_id = game.state_id
+    clock = VirtualClock()
+    make_move = MakeMove(clock)
+
+    for current_player_id, column in (
+        (_FIRST_PLAYER_ID, 2),
+        (_SECOND_PLAYER_ID, 2),
+        (_FIRST_PLAYER_ID, 3),
+        (_SECOND_PLAYER_ID, 0),
+    ):
+        clock.advance(timedelta(seconds=1, microseconds=1500))
+        move_result = make_move(
+            game=game,
+            current_player_id=current_player_id,
+            column=column,
+        )
+        assert isinstance(move_result, MoveAccepted)
+
+    assert game.board[BOARD_ROWS - 1] == [
+        ChipType.SECOND,
+        None,
+        ChipType.FIRST,
+        ChipType.FIRST,
+        None,
+        None,
+    ]
+    assert game.board[BOARD_ROWS - 2][2] == ChipType.SECOND
+    assert game.board == game.bitboard.to_board()
+
+    assert game.move_count == 4
+    assert game.column_heights == [1, 0, 2, 1, 0, 0]
+    assert game.state_version == 4
+    assert game.state_id != initial_state_id
+    assert game.position_hash == position_hash_factory(game.bitboard)
+
+    assert game.move_log
+    assert game.move_log.columns == bytearray([2, 2, 3, 0])
+    assert game.players[_FIRST_PLAYER_ID].time_left == timedelta(
+        seconds=58,
+        milliseconds=999,
+    )
+    assert ReplayMoveLog()(game) == game
+
+
+def test_negative_column_is_illegal_move():
+    players = {
+        _FIRST_PLAYER_ID: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        _SECOND_PLAYER_ID: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+    }
+    game = Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=GameStatus.NOT_STARTED,
+        players=players,
+        current_turn=_FIRST_PLAYER_ID,
+        board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+        last_move_made_at=None,
+        created_at=datetime.now(timezone.utc),
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=None,
+    )
+
+    move_result = MakeMove(VirtualClock())(
+        game=game,
+        current_player_id=_FIRST_PLAYER_ID,
+        column=-1,
+    )
+    expected_move_result = MoveRejected(MoveRejectionReason.ILLEGAL_MOVE)
+
+    assert move_result == expected_move_result
+
+
+def test_time_is_taken_from_clock():
+    clock = VirtualClock()
+    players = {
+        _FIRST_PLAYER_ID: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        _SECOND_PLAYER_ID: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+    }
+    game = Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=GameStatus.NOT_STARTED,
+        players=players,
+        current_turn=_FIRST_PLAYER_ID,
+        board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+        last_move_made_at=None,
+        created_at=clock.now(),
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=None,
+    )
+    make_move = MakeMove(clock)
+
+    make_move(game=game, current_player_id=_FIRST_PLAYER_ID, column=0)
+    assert game.last_move_made_at == clock.now()
+
+    clock.advance(timedelta(seconds=20))
+    make_move(game=game, current_player_id=_SECOND_PLAYER_ID, column=0)
+    assert players[_SECOND_PLAYER_ID].time_left == timedelta(seconds=40)
+
+    clock.advance(timedelta(minutes=2))
+    move_result = make_move(
+        game=game,
+        current_player_id=_FIRST_PLAYER_ID,
+        column=0,
+    )
+    assert isinstance(move_result, LossByTime)
+    assert players[_FIRST_PLAYER_ID].time_left == timedelta(seconds=0)
+
+
+def test_make_many_matches_make_move():
+    game_count = 50
+    games = []
+    for _ in range(game_count):
+        players = {
+            _FIRST_PLAYER_ID: PlayerState(
+                chip_type=ChipType.FIRST,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+            _SECOND_PLAYER_ID: PlayerState(
+                chip_type=ChipType.SECOND,
+                time_left=timedelta(minutes=1),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+        }
+        game = Game(
+            id=GameId(uuid7()),
+            state_id=GameStateId(uuid7()),
+            state_version=0,
+            status=GameStatus.NOT_STARTED,
+            players=players,
+            current_turn=_FIRST_PLAYER_ID,
+            board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+            last_move_made_at=None,
+            created_at=datetime.now(timezone.utc),
+            position_hash=EMPTY_POSITION_HASH,
+            move_log=None,
+        )
+        games.append(game)
+
+    positions = BitboardBatch.empty(game_count)
+    make_move = MakeMove(VirtualClock())
+    random_ = random.Random(0)
+
+    for _ in range(BOARD_ROWS * BOARD_COLUMNS + 5):
+        columns = [
+            random_.randrange(-1, BOARD_COLUMNS + 1) for _ in range(game_count)
+        ]
+        result_codes = make_move.make_many(
+            positions=positions,
+            columns=columns,
+        )
+
+        for game, column, result_code in zip(
+            games,
+            columns,
+            result_codes,
+            strict=True,
+        ):
+            if game.status == GameStatus.ENDED:
+                assert result_code == MoveResultCode.REJECTED
+                continue
+
+            move_result = make_move(
+                game=game,
+                current_player_id=game.current_turn,
+                column=column,
+            )
+            if isinstance(move_result, Win):
+                assert result_code == MoveResultCode.WIN
+            elif isinstance(move_result, Draw):
+                assert result_code == MoveResultCode.DRAW
+            elif isinstance(move_result, MoveRejected):
+                assert result_code == MoveResultCode.REJECTED
+            else:
+                assert result_code == MoveResultCode.ACCEPTED
+
+    assert positions == BitboardBatch.from_bitboards(
+        game.bitboard for game in games
+    )
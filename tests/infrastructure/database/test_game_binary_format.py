@@ -0,0 +1,74 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+import json
+from datetime import timedelta
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    CommunicatonType,
+    GameId,
+    UserId,
+    Game,
+    CreateGame,
+    MakeMove,
+    Player,
+)
+from connect_four.infrastructure import (
+    VirtualClock,
+    common_retort_factory,
+)
+from connect_four.infrastructure.database.game_binary_format import (
+    BINARY_FORMAT_VERSION,
+    dump_game_binary,
+    load_game_binary,
+)
+
+
+def _game_factory() -> Game:
+    clock = VirtualClock()
+    game = CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.OTHER,
+        ),
+        created_at=clock.now(),
+    )
+    make_move = MakeMove(clock)
+    for column in (3, 3, 2, 4, 2, 0):
+        clock.advance(timedelta(seconds=3, microseconds=17))
+        make_move(
+            game=game,
+            current_player_id=game.current_turn,
+            column=column,
+        )
+
+    return game
+
+
+def test_binary_format_round_trip():
+    game = _game_factory()
+
+    game_as_bytes = dump_game_binary(game)
+    assert game_as_bytes[0] == BINARY_FORMAT_VERSION
+    assert load_game_binary(game_as_bytes) == game
+
+    game.move_log = None
+    assert load_game_binary(dump_game_binary(game)) == game
+
+
+def test_binary_format_is_smaller_than_json():
+    game = _game_factory()
+    common_retort = common_retort_factory()
+
+    game_as_json = json.dumps(common_retort.dump(game, Game)).encode()
+    assert len(dump_game_binary(game)) * 5 < len(game_as_json)
@@ -2,6 +2,7 @@
 # All rights reserved.
 # Licensed under the Personal Use License (see LICENSE).
 
+import json
 from typing import AsyncGenerator, Final
 from datetime import datetime, timedelta, timezone
 
@@ -19,16 +20,26 @@ from connect_four.domain import (
     BOARD_ROWS,
     BOARD_COLUMNS,
     PlayerState,
+    EMPTY_POSITION_HASH,
+    Bitboard,
+    position_hash_factory,
+    MoveLog,
     Game,
 )
 from connect_four.application import SortGamesBy
+from connect_four.infrastructure.database.game_binary_format import (
+    dump_game_binary,
+)
 from connect_four.infrastructure import (
     RedisConfig,
     redis_factory,
     redis_pipeline_factory,
     common_retort_factory,
+    codec_factory,
+    json_backend_factory,
     LockManagerConfig,
     LockManager,
+    acquire_and_read_script_factory,
     GameMapperConfig,
     GameMapper,
     RedisTransactionManager,
@@ -51,18 +62,67 @@ async def redis_pipeline(redis: Redis) -> AsyncGenerator[Pipeline, None]:
         yield redis_pipeline
 
 
-async def test_game_mapper(redis: Redis, redis_pipeline: Pipeline):
+def _new_game_factory(
+    player_ids: tuple[UserId, UserId] = (_PLAYER_1_ID, _PLAYER_2_ID),
+    created_at: datetime | None = None,
+) -> Game:
+    players = {
+        player_ids[0]: PlayerState(
+            chip_type=ChipType.FIRST,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        player_ids[1]: PlayerState(
+            chip_type=ChipType.SECOND,
+            time_left=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+    }
+    return Game(
+        id=GameId(uuid7()),
+        state_id=GameStateId(uuid7()),
+        state_version=0,
+        status=GameStatus.NOT_STARTED,
+        players=players,
+        current_turn=player_ids[0],
+        board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
+        last_move_made_at=None,
+        created_at=created_at or datetime.now(timezone.utc),
+        position_hash=EMPTY_POSITION_HASH,
+        move_log=MoveLog(
+            initial_time_left={
+                ChipType.FIRST: timedelta(minutes=1),
+                ChipType.SECOND: timedelta(minutes=1),
+            },
+            columns=bytearray(),
+            time_spent=bytearray(),
+        ),
+    )
+
+
+@pytest.mark.parametrize("hash_layout", [False, True])
+async def test_game_mapper(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+    hash_layout: bool,
+):
     lock_manager_config = LockManagerConfig(timedelta(minutes=1))
     lock_manager = LockManager(
         redis=redis,
         config=lock_manager_config,
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
     )
 
-    game_mapper_config = GameMapperConfig(timedelta(days=1))
+    game_mapper_config = GameMapperConfig(
+        game_expires_in=timedelta(days=1),
+        read_legacy_keys=True,
+        hash_layout=hash_layout,
+    )
     game_mapper = GameMapper(
         redis=redis,
         redis_pipeline=redis_pipeline,
-        common_retort=common_retort_factory(),
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
         lock_manager=lock_manager,
         config=game_mapper_config,
     )
@@ -75,30 +135,9 @@ async def test_game_mapper(redis: Redis, redis_pipeline: Pipeline):
     game = await game_mapper.by_id(GameId(uuid7()))
     assert game is None
 
-    game_id = GameId(uuid7())
-    players = {
-        _PLAYER_1_ID: PlayerState(
-            chip_type=ChipType.FIRST,
-            time_left=timedelta(minutes=1),
-            communication_type=CommunicatonType.CENTRIFUGO,
-        ),
-        _PLAYER_2_ID: PlayerState(
-            chip_type=ChipType.SECOND,
-            time_left=timedelta(minutes=1),
-            communication_type=CommunicatonType.CENTRIFUGO,
-        ),
-    }
-
-    new_game = Game(
-        id=game_id,
-        state_id=GameStateId(uuid7()),
-        status=GameStatus.NOT_STARTED,
-        players=players,
-        current_turn=_PLAYER_1_ID,
-        board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
-        last_move_made_at=None,
-        created_at=datetime.now(timezone.utc),
-    )
+    player_ids = (UserId(uuid7()), UserId(uuid7()))
+    new_game = _new_game_factory(player_ids)
+    game_id = new_game.id
     await game_mapper.save(new_game)
     await transaction_manager.commit()
 
@@ -117,8 +156,465 @@ async def test_game_mapper(redis: Redis, redis_pipeline: Pipeline):
     assert game_from_database == updated_game
 
     games = await game_mapper.list_by_player_ids(
-        player_ids=(_PLAYER_1_ID, _PLAYER_2_ID),
+        player_ids=player_ids,
         sort_by=SortGamesBy.DESC_CREATED_AT,
         limit=0,
     )
     assert games == [updated_game]
+
+
+@pytest.mark.parametrize("hash_layout", [False, True])
+async def test_game_mapper_reads_legacy_keys(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+    hash_layout: bool,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+    game_mapper = GameMapper(
+        redis=redis,
+        redis_pipeline=redis_pipeline,
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
+        lock_manager=lock_manager,
+        config=GameMapperConfig(
+            game_expires_in=timedelta(days=1),
+            read_legacy_keys=True,
+            hash_layout=hash_layout,
+        ),
+    )
+    transaction_manager = RedisTransactionManager(
+        redis_pipeline=redis_pipeline,
+        lock_manager=lock_manager,
+    )
+
+    game_id = GameId(uuid7())
+    game_state_id = GameStateId(uuid7())
+    created_at = datetime(2024, 10, 1, 12, tzinfo=timezone.utc)
+    last_move_made_at = created_at + timedelta(seconds=10)
+
+    # Game as it was stored before `state_version`, move tracking,
+    # position hashes and move logs were added.
+    legacy_game_as_dict = {
+        "id": str(game_id),
+        "state_id": str(game_state_id),
+        "status": "in_progress",
+        "players": {
+            str(_PLAYER_1_ID): {
+                "chip_type": "first",
+                "time_left": 55.0,
+                "communication_type": "centrifugo",
+            },
+            str(_PLAYER_2_ID): {
+                "chip_type": "second",
+                "time_left": 55.5,
+                "communication_type": "other",
+            },
+        },
+        "current_turn": str(_PLAYER_1_ID),
+        "board": [
+            *([None] * BOARD_COLUMNS for _ in range(BOARD_ROWS - 2)),
+            [None, None, "second", None, None, None],
+            [None, "second", "first", "first", None, None],
+        ],
+        "last_move_made_at": last_move_made_at.isoformat(),
+        "created_at": created_at.isoformat(),
+    }
+    sorted_player_ids = sorted((_PLAYER_1_ID, _PLAYER_2_ID))
+    legacy_game_key = (
+        f"games:id:{game_id.hex}:player_ids:"
+        f"{sorted_player_ids[0].hex}:{sorted_player_ids[1].hex}"
+    )
+    await redis.set(legacy_game_key, json.dumps(legacy_game_as_dict))
+
+    board: list[list[ChipType | None]] = [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)
+    ]
+    board[BOARD_ROWS - 2][2] = ChipType.SECOND
+    board[BOARD_ROWS - 1][1:4] = [
+        ChipType.SECOND,
+        ChipType.FIRST,
+        ChipType.FIRST,
+    ]
+    game = Game(
+        id=game_id,
+        state_id=game_state_id,
+        state_version=0,
+        status=GameStatus.IN_PROGRESS,
+        players={
+            _PLAYER_1_ID: PlayerState(
+                chip_type=ChipType.FIRST,
+                time_left=timedelta(seconds=55),
+                communication_type=CommunicatonType.CENTRIFUGO,
+            ),
+            _PLAYER_2_ID: PlayerState(
+                chip_type=ChipType.SECOND,
+                time_left=timedelta(seconds=55.5),
+                communication_type=CommunicatonType.OTHER,
+            ),
+        },
+        current_turn=_PLAYER_1_ID,
+        board=board,
+        last_move_made_at=last_move_made_at,
+        created_at=created_at,
+        position_hash=position_hash_factory(Bitboard.from_board(board)),
+        move_log=None,
+    )
+
+    game_from_database = await game_mapper.by_id(game.id, acquire=True)
+    assert game_from_database == game
+    assert game_from_database.move_count == 4
+    assert game_from_database.column_heights == [0, 1, 2, 1, 0, 0]
+
+    await game_mapper.update(game)
+    await transaction_manager.commit()
+
+    assert not await redis.exists(legacy_game_key)
+    if hash_layout:
+        assert await redis.exists(f"games:{game.id.hex}:fields")
+    else:
+        assert await redis.exists(f"games:{game.id.hex}")
+
+    games = await game_mapper.list_by_player_ids(
+        player_ids=(_PLAYER_1_ID, _PLAYER_2_ID),
+    )
+    assert game in games
+
+
+async def test_game_mapper_lists_legacy_games_if_index_is_short(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+    game_mapper = GameMapper(
+        redis=redis,
+        redis_pipeline=redis_pipeline,
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
+        lock_manager=lock_manager,
+        config=GameMapperConfig(
+            game_expires_in=timedelta(days=1),
+            read_legacy_keys=True,
+            hash_layout=False,
+        ),
+    )
+    transaction_manager = RedisTransactionManager(
+        redis_pipeline=redis_pipeline,
+        lock_manager=lock_manager,
+    )
+
+    player_ids = (UserId(uuid7()), UserId(uuid7()))
+    now = datetime.now(timezone.utc)
+
+    indexed_game = _new_game_factory(player_ids=player_ids, created_at=now)
+    await game_mapper.save(indexed_game)
+    await transaction_manager.commit()
+
+    legacy_game = _new_game_factory(
+        player_ids=player_ids,
+        created_at=now - timedelta(minutes=1),
+    )
+    sorted_player_ids = sorted(player_ids)
+    legacy_game_key = (
+        f"games:id:{legacy_game.id.hex}:player_ids:"
+        f"{sorted_player_ids[0].hex}:{sorted_player_ids[1].hex}"
+    )
+    await redis.set(legacy_game_key, dump_game_binary(legacy_game))
+
+    games = await game_mapper.list_by_player_ids(
+        player_ids=player_ids,
+        sort_by=SortGamesBy.DESC_CREATED_AT,
+        limit=1,
+    )
+    assert games == [indexed_game]
+
+    games = await game_mapper.list_by_player_ids(
+        player_ids=player_ids,
+        sort_by=SortGamesBy.DESC_CREATED_AT,
+        limit=2,
+    )
+    assert games == [indexed_game, legacy_game]
+
+
+@pytest.mark.parametrize("hash_layout", [False, True])
+async def test_game_mapper_lists_newest_games(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+    hash_layout: bool,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+    game_mapper = GameMapper(
+        redis=redis,
+        redis_pipeline=redis_pipeline,
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
+        lock_manager=lock_manager,
+        config=GameMapperConfig(
+            game_expires_in=timedelta(days=1),
+            read_legacy_keys=False,
+            hash_layout=hash_layout,
+        ),
+    )
+    transaction_manager = RedisTransactionManager(
+        redis_pipeline=redis_pipeline,
+        lock_manager=lock_manager,
+    )
+
+    player_ids = (UserId(uuid7()), UserId(uuid7()))
+    created_at = datetime.now(timezone.utc)
+    games = [
+        _new_game_factory(
+            player_ids=player_ids,
+            created_at=created_at + timedelta(minutes=minutes),
+        )
+        for minutes in range(4)
+    ]
+    for game in games:
+        await game_mapper.save(game)
+    await transaction_manager.commit()
+
+    newest_games = await game_mapper.list_by_player_ids(
+        player_ids=player_ids,
+        sort_by=SortGamesBy.DESC_CREATED_AT,
+        limit=2,
+    )
+    assert newest_games == [games[3], games[2]]
+
+    await redis.delete(
+        f"games:{games[3].id.hex}",
+        f"games:{games[3].id.hex}:fields",
+    )
+
+    newest_games = await game_mapper.list_by_player_ids(
+        player_ids=player_ids,
+        sort_by=SortGamesBy.DESC_CREATED_AT,
+        limit=2,
+    )
+    assert newest_games == [games[2], games[1]]
+
+    all_games = await game_mapper.list_by_player_ids(player_ids=player_ids)
+    assert all_games == games[:3]
+
+
+@pytest.mark.parametrize("hash_layout", [False, True])
+async def test_game_mapper_by_ids(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+    hash_layout: bool,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+    game_mapper = GameMapper(
+        redis=redis,
+        redis_pipeline=redis_pipeline,
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
+        lock_manager=lock_manager,
+        config=GameMapperConfig(
+            game_expires_in=timedelta(days=1),
+            read_legacy_keys=True,
+            hash_layout=hash_layout,
+        ),
+    )
+    transaction_manager = RedisTransactionManager(
+        redis_pipeline=redis_pipeline,
+        lock_manager=lock_manager,
+    )
+
+    games = [_new_game_factory() for _ in range(3)]
+    for game in games:
+        await game_mapper.save(game)
+    await transaction_manager.commit()
+
+    legacy_games = [_new_game_factory() for _ in range(2)]
+    for legacy_game in legacy_games:
+        sorted_player_ids = sorted(legacy_game.players)
+        legacy_game_key = (
+            f"games:id:{legacy_game.id.hex}:player_ids:"
+            f"{sorted_player_ids[0].hex}:{sorted_player_ids[1].hex}"
+        )
+        await redis.set(legacy_game_key, dump_game_binary(legacy_game))
+
+    games_from_database = await game_mapper.by_ids(
+        [
+            games[2].id,
+            legacy_games[1].id,
+            GameId(uuid7()),
+            games[0].id,
+            legacy_games[0].id,
+        ],
+    )
+    assert games_from_database == [
+        games[2],
+        legacy_games[1],
+        games[0],
+        legacy_games[0],
+    ]
+
+    missing_game_ids = [GameId(uuid7()) for _ in range(1000)]
+    games_from_database = await game_mapper.by_ids(
+        [*missing_game_ids, games[1].id],
+    )
+    assert games_from_database == [games[1]]
+
+
+async def test_game_mapper_updates_changed_fields(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+    transaction_manager = RedisTransactionManager(
+        redis_pipeline=redis_pipeline,
+        lock_manager=lock_manager,
+    )
+
+    def game_mapper_factory(*, hash_layout: bool) -> GameMapper:
+        return GameMapper(
+            redis=redis,
+            redis_pipeline=redis_pipeline,
+            codec=codec_factory(common_retort_factory()),
+            json_backend=json_backend_factory(),
+            lock_manager=lock_manager,
+            config=GameMapperConfig(
+                game_expires_in=timedelta(days=1),
+                read_legacy_keys=False,
+                hash_layout=hash_layout,
+            ),
+        )
+
+    game = _new_game_factory()
+    game_key = f"games:{game.id.hex}"
+    game_fields_key = f"games:{game.id.hex}:fields"
+
+    await game_mapper_factory(hash_layout=False).save(game)
+    await transaction_manager.commit()
+
+    game_mapper = game_mapper_factory(hash_layout=True)
+    game_from_database = await game_mapper.by_id(game.id, acquire=True)
+    assert game_from_database == game
+
+    await game_mapper.update(game)
+    await transaction_manager.commit()
+
+    assert not await redis.exists(game_key)
+    assert await redis.exists(game_fields_key)
+
+    game_mapper = game_mapper_factory(hash_layout=True)
+    game_from_database = await game_mapper.by_id(game.id, acquire=True)
+    assert game_from_database == game
+
+    # Field the update must not write, since the game's creation
+    # time is not changed.
+    fields = await redis.hgetall(game_fields_key)  # type: ignore
+    await redis.hset(  # type: ignore
+        game_fields_key,
+        mapping={"created_at": b"unchanged"},
+    )
+
+    game.players[_PLAYER_1_ID].time_left = timedelta(seconds=30)
+    await game_mapper.update(game)
+    await transaction_manager.commit()
+
+    updated_fields = await redis.hgetall(game_fields_key)  # type: ignore
+    assert updated_fields[b"created_at"] == b"unchanged"
+    assert updated_fields[b"player:0"] != fields[b"player:0"]
+
+    await redis.hset(  # type: ignore
+        game_fields_key,
+        mapping={"created_at": fields[b"created_at"]},
+    )
+
+    game_mapper = game_mapper_factory(hash_layout=True)
+    game_from_database = await game_mapper.by_id(game.id)
+    assert game_from_database == game
+
+    # Hash is still read once the layout is switched back, and the
+    # game is moved to a binary document on its next update.
+    game_mapper = game_mapper_factory(hash_layout=False)
+    game_from_database = await game_mapper.by_id(game.id, acquire=True)
+    assert game_from_database == game
+
+    await game_mapper.update(game)
+    await transaction_manager.commit()
+
+    assert await redis.exists(game_key)
+    assert not await redis.exists(game_fields_key)
+
+    game_mapper = game_mapper_factory(hash_layout=False)
+    games_from_database = await game_mapper.by_ids([game.id])
+    assert games_from_database == [game]
+
+
+@pytest.mark.parametrize("hash_layout", [False, True])
+async def test_game_mapper_rejects_stale_updates(
+    redis: Redis,
+    redis_pipeline: Pipeline,
+    hash_layout: bool,
+):
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(minutes=1)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+
+    def game_mapper_factory(redis_pipeline: Pipeline) -> GameMapper:
+        return GameMapper(
+            redis=redis,
+            redis_pipeline=redis_pipeline,
+            codec=codec_factory(common_retort_factory()),
+            json_backend=json_backend_factory(),
+            lock_manager=lock_manager,
+            config=GameMapperConfig(
+                game_expires_in=timedelta(days=1),
+                read_legacy_keys=False,
+                hash_layout=hash_layout,
+            ),
+        )
+
+    game = _new_game_factory()
+    await game_mapper_factory(redis_pipeline).save(game)
+    await redis_pipeline.execute()
+
+    stale_game_mapper = game_mapper_factory(redis_pipeline)
+    stale_game = await stale_game_mapper.by_id(game.id)
+    assert stale_game
+
+    async with redis.pipeline() as other_redis_pipeline:
+        game_mapper = game_mapper_factory(other_redis_pipeline)
+        game_from_database = await game_mapper.by_id(game.id)
+        assert game_from_database
+
+        game_from_database.advance_state()
+        await game_mapper.update(game_from_database)
+        await other_redis_pipeline.execute()
+
+    stale_game.advance_state()
+    stale_game.players[_PLAYER_1_ID].time_left = timedelta(seconds=30)
+    await stale_game_mapper.update(stale_game)
+    with pytest.raises(Exception, match="state version has changed"):
+        await redis_pipeline.execute()
+
+    game_mapper = game_mapper_factory(redis_pipeline)
+    game_from_database = await game_mapper.by_id(game.id)
+    assert game_from_database
+    assert game_from_database.players[_PLAYER_1_ID].time_left == timedelta(
+        minutes=1,
+    )
@@ -0,0 +1,100 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import timedelta
+
+import pytest
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    BOARD_ROWS,
+    BOARD_COLUMNS,
+    ChipType,
+    CommunicatonType,
+    GameId,
+    UserId,
+    Bitboard,
+    CreateGame,
+    Player,
+    position_hash_factory,
+)
+from connect_four.infrastructure import (
+    VirtualClock,
+    common_retort_factory,
+    codec_factory,
+)
+from connect_four.infrastructure.database.game_upgrades import (
+    upgrade_legacy_game_as_dict,
+)
+from connect_four.infrastructure.database.game_binary_format import (
+    dump_game_binary,
+    load_game_binary,
+)
+
+
+def test_upgrade_legacy_game():
+    player_ids = (str(uuid7()), str(uuid7()))
+    board: list[list[str | None]] = [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)
+    ]
+    board[-1][3] = ChipType.FIRST
+    board[-2][3] = ChipType.SECOND
+    board[-1][2] = ChipType.FIRST
+
+    game_as_dict = {
+        "id": str(uuid7()),
+        "state_id": str(uuid7()),
+        "status": "in_progress",
+        "players": {
+            player_ids[0]: {
+                "chip_type": "first",
+                "time_left": 50.0,
+                "communication_type": "centrifugo",
+            },
+            player_ids[1]: {
+                "chip_type": "second",
+                "time_left": 55.0,
+                "communication_type": "centrifugo",
+            },
+        },
+        "current_turn": player_ids[1],
+        "board": board,
+        "last_move_made_at": "2024-01-01T00:00:15+00:00",
+        "created_at": "2024-01-01T00:00:00+00:00",
+    }
+
+    game = codec_factory(common_retort_factory()).load_game(
+        upgrade_legacy_game_as_dict(game_as_dict),
+    )
+
+    assert game.state_version == 0
+    assert game.move_count == 3
+    assert game.column_heights[:4] == [0, 0, 1, 2]
+    assert game.position_hash == position_hash_factory(
+        Bitboard.from_board(game.board),
+    )
+    assert game.move_log is None
+
+
+def test_load_binary_game_of_unknown_version():
+    clock = VirtualClock()
+    game = CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        created_at=clock.now(),
+    )
+    game_as_bytes = bytearray(dump_game_binary(game))
+    game_as_bytes[0] = 0xFF
+
+    with pytest.raises(Exception, match="unknown version 255"):
+        load_game_binary(bytes(game_as_bytes))
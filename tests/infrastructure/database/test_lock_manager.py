@@ -0,0 +1,59 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from typing import AsyncGenerator
+from datetime import timedelta
+
+import pytest
+from redis.asyncio.client import Redis
+from uuid_extensions import uuid7
+
+from connect_four.infrastructure import (
+    RedisConfig,
+    redis_factory,
+    LockManagerConfig,
+    LockManager,
+    acquire_and_read_script_factory,
+)
+
+
+@pytest.fixture(scope="function")
+async def redis(redis_config: RedisConfig) -> AsyncGenerator[Redis, None]:
+    async for redis in redis_factory(redis_config):
+        yield redis
+
+
+async def test_lock_manager_acquire_and_read(redis: Redis) -> None:
+    lock_id = uuid7().hex
+    key = f"lock_manager_tests:{lock_id}"
+    hash_key = f"lock_manager_tests:{lock_id}:fields"
+
+    await redis.set(key, b"value")
+    await redis.hset(hash_key, mapping={"field": b"value"})  # type: ignore
+
+    lock_manager = LockManager(
+        redis=redis,
+        config=LockManagerConfig(timedelta(seconds=3)),
+        acquire_and_read_script=acquire_and_read_script_factory(redis),
+    )
+
+    value, hash_ = await lock_manager.acquire_and_read(
+        lock_id,
+        key=key,
+        hash_key=hash_key,
+    )
+    assert value == b"value"
+    assert hash_ == {b"field": b"value"}
+    assert await redis.exists(f"locks:{lock_id}")
+
+    value, hash_ = await lock_manager.acquire_and_read(
+        lock_id,
+        key=f"{key}:missing",
+        hash_key=f"{hash_key}:missing",
+    )
+    assert value is None
+    assert hash_ == {}
+
+    await lock_manager.release_all()
+    assert not await redis.exists(f"locks:{lock_id}")
@@ -3,7 +3,8 @@
 # Licensed under the Personal Use License (see LICENSE).
 
 from datetime import timedelta
-from typing import AsyncGenerator, Final
+import json
+from typing import AsyncGenerator, Final, cast
 
 import pytest
 from nats.js import JetStreamContext
@@ -32,9 +33,12 @@ from connect_four.application import (
 from connect_four.infrastructure import (
     OperationId,
     common_retort_factory,
+    codec_factory,
+    json_backend_factory,
     NATSConfig,
     nats_client_factory,
     nats_jetstream_factory,
+    EventPublisherConfig,
     NATSEventPublisher,
 )
 
@@ -56,6 +60,7 @@ async def nats_jetstream(
     [
         GameCreatedEvent(
             game_id=GameId(uuid7()),
+            game_state_version=0,
             lobby_id=LobbyId(uuid7()),
             board=[[None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)],
             players={
@@ -74,6 +79,7 @@ async def nats_jetstream(
         ),
         MoveAcceptedEvent(
             game_id=GameId(uuid7()),
+            game_state_version=0,
             chip_location=ChipLocation(column=5, row=6),
             players={
                 _FIRST_PLAYER_ID: PlayerState(
@@ -91,6 +97,7 @@ async def nats_jetstream(
         ),
         MoveRejectedEvent(
             game_id=GameId(uuid7()),
+            game_state_version=0,
             reason=MoveRejectionReason.ILLEGAL_MOVE,
             players={
                 _FIRST_PLAYER_ID: PlayerState(
@@ -108,6 +115,7 @@ async def nats_jetstream(
         ),
         GameEndedEvent(
             game_id=GameId(uuid7()),
+            game_state_version=0,
             chip_location=ChipLocation(column=0, row=0),
             players={
                 _FIRST_PLAYER_ID: PlayerState(
@@ -132,7 +140,76 @@ async def test_nats_event_publisher(
 ):
     event_publisher = NATSEventPublisher(
         jetstream=nats_jetstream,
-        common_retort=common_retort_factory(),
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
         operation_id=OperationId(uuid7()),
+        config=EventPublisherConfig(compact_board=False),
     )
     await event_publisher.publish(event)
+
+
+class _FakeJetStream:
+    __slots__ = ("messages",)
+
+    def __init__(self) -> None:
+        self.messages: list[tuple[str, bytes, dict[str, str] | None]] = []
+
+    async def publish(
+        self,
+        *,
+        subject: str,
+        payload: bytes,
+        stream: str,
+        headers: dict[str, str] | None,
+    ) -> None:
+        self.messages.append((subject, payload, headers))
+
+
+async def test_nats_event_publisher_with_compact_board():
+    board: list[list[ChipType | None]] = [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS)
+    ]
+    board[-1][0] = ChipType.FIRST
+    board[-1][1] = ChipType.SECOND
+
+    jetstream = _FakeJetStream()
+    event_publisher = NATSEventPublisher(
+        jetstream=cast(JetStreamContext, jetstream),
+        codec=codec_factory(common_retort_factory()),
+        json_backend=json_backend_factory(),
+        operation_id=OperationId(uuid7()),
+        config=EventPublisherConfig(compact_board=True),
+    )
+    await event_publisher.publish(
+        GameCreatedEvent(
+            game_id=GameId(uuid7()),
+            game_state_version=0,
+            lobby_id=LobbyId(uuid7()),
+            board=board,
+            players={},
+            current_turn=_FIRST_PLAYER_ID,
+        ),
+    )
+
+    subject, payload, headers = jetstream.messages[0]
+    event_as_dict = json.loads(payload)
+
+    assert subject == "gaems12.connect_four.game.created"
+    assert headers is None
+    assert "compact_board" not in event_as_dict
+    assert event_as_dict["board"] == [
+        [None] * BOARD_COLUMNS for _ in range(BOARD_ROWS - 1)
+    ] + [["first", "second"] + [None] * (BOARD_COLUMNS - 2)]
+
+    subject, payload, headers = jetstream.messages[1]
+    compact_event_as_dict = json.loads(payload)
+
+    assert subject == "gaems12.connect_four.game.created.v2"
+    assert headers == {"Board-Encoding": "compact"}
+    assert "board" not in compact_event_as_dict
+    assert compact_event_as_dict["compact_board"] == (
+        "0" * BOARD_COLUMNS * (BOARD_ROWS - 1)
+        + "12"
+        + "0" * (BOARD_COLUMNS - 2)
+    )
+    assert compact_event_as_dict["game_id"] == event_as_dict["game_id"]
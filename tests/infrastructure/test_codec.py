@@ -0,0 +1,125 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import datetime, timedelta, timezone
+
+from uuid_extensions import uuid7
+
+from connect_four.domain import (
+    CommunicatonType,
+    GameId,
+    LobbyId,
+    GameStateId,
+    UserId,
+    ChipLocation,
+    Game,
+    CreateGame,
+    MakeMove,
+    Player,
+)
+from connect_four.application import (
+    MoveAcceptedEvent,
+    CreateGameCommand,
+    TryToLoseByTimeCommand,
+)
+from connect_four.infrastructure import (
+    VirtualClock,
+    common_retort_factory,
+    codec_factory,
+)
+
+
+def test_codec_matches_common_retort():
+    clock = VirtualClock()
+    game = CreateGame()(
+        game_id=GameId(uuid7()),
+        first_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player=Player(
+            id=UserId(uuid7()),
+            time=timedelta(minutes=1),
+            communication_type=CommunicatonType.OTHER,
+        ),
+        created_at=clock.now(),
+    )
+    make_move = MakeMove(clock)
+    for column in (2, 3, 2):
+        clock.advance(timedelta(seconds=3))
+        make_move(
+            game=game,
+            current_player_id=game.current_turn,
+            column=column,
+        )
+
+    common_retort = common_retort_factory()
+    codec = codec_factory(common_retort)
+
+    game_as_dict = common_retort.dump(game, Game)
+    assert codec.load_game(game_as_dict) == game
+
+    event = MoveAcceptedEvent(
+        game_id=game.id,
+        game_state_version=game.state_version,
+        chip_location=ChipLocation(column=2, row=5),
+        players=game.players,
+        current_turn=game.current_turn,
+    )
+    assert codec.dump_event(event) == common_retort.dump(event)
+
+    command = TryToLoseByTimeCommand(
+        game_id=game.id,
+        game_state_id=GameStateId(uuid7()),
+    )
+    command_as_dict = common_retort.dump(command)
+    assert (
+        codec.load_command(command_as_dict, TryToLoseByTimeCommand) == command
+    )
+
+
+def test_codec_loads_command_published_by_faststream():
+    codec = codec_factory(common_retort_factory())
+
+    game_id = GameId(uuid7())
+    lobby_id = LobbyId(uuid7())
+    first_player_id = UserId(uuid7())
+    second_player_id = UserId(uuid7())
+
+    # FastStream publishers serialize `timedelta` as ISO 8601
+    # duration and add operation id to every message.
+    command_as_dict = {
+        "game_id": game_id.hex,
+        "lobby_id": lobby_id.hex,
+        "first_player": {
+            "id": first_player_id.hex,
+            "time": "PT3M",
+            "communication_type": "centrifugo",
+        },
+        "second_player": {
+            "id": second_player_id.hex,
+            "time": 90.5,
+            "communication_type": "other",
+        },
+        "created_at": "2024-10-01T12:00:00Z",
+        "operation_id": uuid7().hex,
+    }
+    command = codec.load_command(command_as_dict, CreateGameCommand)
+
+    assert command == CreateGameCommand(
+        game_id=game_id,
+        lobby_id=lobby_id,
+        first_player=Player(
+            id=first_player_id,
+            time=timedelta(minutes=3),
+            communication_type=CommunicatonType.CENTRIFUGO,
+        ),
+        second_player=Player(
+            id=second_player_id,
+            time=timedelta(seconds=90.5),
+            communication_type=CommunicatonType.OTHER,
+        ),
+        created_at=datetime(2024, 10, 1, 12, tzinfo=timezone.utc),
+    )
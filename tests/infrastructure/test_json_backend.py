@@ -0,0 +1,55 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from importlib.util import find_spec
+
+import pytest
+
+from connect_four.infrastructure import (
+    JSONBackend,
+    StdlibJSONBackend,
+    OrjsonJSONBackend,
+    json_backend_factory,
+)
+
+
+_DATA = {
+    "id": "0192a7c6-1f4e-7c1a-9b3d-6f1e2d3c4b5a",
+    "board": [[None, "first"], ["second", None]],
+    "time_left": 59.5,
+    "position_hash": (1 << 64) - 1,
+    "move_log": None,
+    "ended": True,
+}
+
+
+def test_json_backend_factory():
+    json_backend = json_backend_factory()
+
+    if find_spec("orjson"):
+        assert isinstance(json_backend, OrjsonJSONBackend)
+    else:
+        assert isinstance(json_backend, StdlibJSONBackend)
+
+
+@pytest.mark.parametrize(
+    "json_backend",
+    [
+        StdlibJSONBackend(),
+        pytest.param(
+            OrjsonJSONBackend() if find_spec("orjson") else None,
+            marks=pytest.mark.skipif(
+                not find_spec("orjson"),
+                reason="orjson is not installed",
+            ),
+        ),
+    ],
+)
+def test_json_backend_round_trip(json_backend: JSONBackend):
+    data_as_bytes = json_backend.dumps(_DATA)
+
+    assert isinstance(data_as_bytes, bytes)
+    assert json_backend.loads(data_as_bytes) == _DATA
+    assert json_backend.loads(data_as_bytes.decode()) == _DATA
+    assert StdlibJSONBackend().loads(data_as_bytes) == _DATA
@@ -0,0 +1,62 @@
+# Copyright (c) 2024, Egor Romanov.
+# All rights reserved.
+# Licensed under the Personal Use License (see LICENSE).
+
+from datetime import timedelta
+from pathlib import Path
+
+from connect_four.domain import (
+    ChipType,
+    BOARD_COLUMNS,
+    Bitboard,
+    EMPTY_POSITION_HASH,
+    position_hash_factory,
+)
+from connect_four.infrastructure import (
+    OpeningBook,
+    generate_opening_book,
+)
+
+
+def test_opening_book(tmp_path: Path):
+    path = tmp_path / "opening_book"
+
+    position_count = generate_opening_book(
+        path=path,
+        plies=3,
+        time_budget=timedelta(milliseconds=1),
+        workers=1,
+    )
+    assert position_count == 1 + BOARD_COLUMNS + BOARD_COLUMNS**2
+
+    opening_book = OpeningBook(path)
+    try:
+        assert opening_book.plies == 3
+        assert opening_book.lookup(EMPTY_POSITION_HASH)
+
+        for first_column in range(BOARD_COLUMNS):
+            for second_column in range(BOARD_COLUMNS):
+                bitboard = Bitboard.empty()
+                bitboard.drop_chip(
+                    column=first_column,
+                    chip_type=ChipType.FIRST,
+                )
+                bitboard.drop_chip(
+                    column=second_column,
+                    chip_type=ChipType.SECOND,
+                )
+                evaluation = opening_book.lookup(
+                    position_hash_factory(bitboard),
+                )
+
+                assert evaluation
+                assert 0 <= evaluation.column < BOARD_COLUMNS
+
+                bitboard.drop_chip(column=0, chip_type=ChipType.FIRST)
+                evaluation = opening_book.lookup(
+                    position_hash_factory(bitboard),
+                )
+
+                assert evaluation is None
+    finally:
+        opening_book.close()
@@ -22,7 +22,11 @@ async def test_ioc_container(
         url="fake_url",
         api_key="fake_api_key",
     )
-    game_mapper_config = GameMapperConfig(timedelta(hours=1))
+    game_mapper_config = GameMapperConfig(
+        game_expires_in=timedelta(hours=1),
+        read_legacy_keys=True,
+        hash_layout=False,
+    )
     lock_manager_config = LockManagerConfig(timedelta(seconds=3))
 
     context = {
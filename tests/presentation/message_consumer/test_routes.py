@@ -17,7 +17,11 @@ from connect_four.application import (
     EndGameProcessor,
     MakeMoveProcessor,
 )
-from connect_four.infrastructure import NATSConfig
+from connect_four.infrastructure import (
+    NATSConfig,
+    common_retort_factory,
+    codec_factory,
+)
 from connect_four.presentation.message_consumer import (
     create_game,
     end_game,
@@ -36,6 +40,8 @@ def broker(nats_config: NATSConfig) -> NatsBroker:
 def ioc_container() -> AsyncContainer:
     provider = Provider()
 
+    provider.provide(common_retort_factory, scope=Scope.APP)
+    provider.provide(codec_factory, scope=Scope.APP)
     provider.provide(
         lambda: AsyncMock(),
         scope=Scope.REQUEST,